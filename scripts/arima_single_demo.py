@@ -6,142 +6,209 @@ using a rolling one-step ARIMA(1,1,1) model.
 
 This experiment serves as a methodological illustration
 and not as a predictive benchmarking study.
+
+statsmodels, scikit-learn and matplotlib are imported by the steps
+that use them, so importing this module (e.g. from scripts/dse.py) is
+cheap.
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+import argparse
 import os
 import warnings
-
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tools.sm_exceptions import ConvergenceWarning
-from sklearn.metrics import mean_squared_error, mean_absolute_error
 from math import sqrt
 
-
-# ==================================================
-# Suppress Convergence Warnings Only
-# ==================================================
-warnings.simplefilter("ignore", ConvergenceWarning)
+import numpy as np
 
 
 # ==================================================
 # Configuration
 # ==================================================
 TICKER = "SQURPHARMA"
-DATA_PATH = f"data_sample/Unadjusted/{TICKER}.csv"   # adjust if needed
+DATA_DIR = "data_sample/Unadjusted"   # adjust if needed (CSV fallback)
 FIGURE_DIR = "figures"
 
 TRAIN_RATIO = 0.8
 ARIMA_ORDER = (1, 1, 1)
 
-os.makedirs(FIGURE_DIR, exist_ok=True)
+# Full MLE refit every REFIT_EVERY test steps (warm-started); the steps
+# in between only update the state-space filter with the new observation
+REFIT_EVERY = 20
+
+# Lines are min/max-decimated to one bin per PDF point of axes width
+# ("lttb", or None to draw every point)
+DECIMATION = "minmax"
+DPI = 300
 
 
 # ==================================================
 # Load and Prepare Data
 # ==================================================
-data = pd.read_csv(DATA_PATH)
+def load_log_prices(ticker=TICKER):
+    """Log Close prices of ``ticker`` (financial standard)."""
+    from dse_eod.features import shared_features
+    from dse_eod.store import load_ticker
 
-# Strict date parsing (YYYY-MM-DD)
-data["Date"] = pd.to_datetime(data["Date"], format="%Y-%m-%d")
+    # Feature cache when built (scripts/build_features.py)
+    features = shared_features(refresh=True)
+    if features is not None and ticker in features:
+        log_series = features.series(ticker, "log_close")
+    else:
+        # Columnar store when built, otherwise the per-ticker CSV
+        # (strict YYYY-MM-DD parsing); sorted and indexed by Date
+        data = load_ticker(ticker, csv_dir=DATA_DIR)
+        log_series = np.log(data["Close"].astype(float).dropna())
 
-data = data.sort_values("Date")
-data.set_index("Date", inplace=True)
+    print(f"Ticker: {ticker}")
+    print(f"Total observations: {len(log_series)}")
 
-series = data["Close"].astype(float).dropna()
+    if len(log_series) < 200:
+        raise ValueError("Insufficient observations for ARIMA illustration.")
 
-print(f"Ticker: {TICKER}")
-print(f"Total observations: {len(series)}")
+    return log_series
 
-if len(series) < 200:
-    raise ValueError("Insufficient observations for ARIMA illustration.")
 
+def train_test_split(log_series):
+    split_index = int(len(log_series) * TRAIN_RATIO)
 
-# ==================================================
-# Log Transformation (Financial Standard)
-# ==================================================
-log_series = np.log(series)
+    train = log_series.iloc[:split_index]
+    test = log_series.iloc[split_index:]
+
+    print(f"Training observations: {len(train)}")
+    print(f"Testing observations: {len(test)}")
+    return train, test
 
 
 # ==================================================
-# Train / Test Split
+# Evaluation Metrics (Reported but Not Emphasized)
 # ==================================================
-split_index = int(len(log_series) * TRAIN_RATIO)
+def metrics(actual, forecast):
+    from sklearn.metrics import mean_squared_error, mean_absolute_error
+
+    return (sqrt(mean_squared_error(actual, forecast)),
+            mean_absolute_error(actual, forecast))
+
+
+def compare_exact(train, test, test_exp, forecast_exp, rmse, mae, stats):
+    """Exact-refit comparison: speedup and metric drift."""
+    import pandas as pd
+
+    from dse_eod.forecast import exact_rolling_one_step
+
+    exact_log, exact_stats = exact_rolling_one_step(train, test, ARIMA_ORDER)
+    exact_exp = np.exp(pd.Series(exact_log, index=test.index))
 
-train = log_series.iloc[:split_index]
-test = log_series.iloc[split_index:]
+    rmse_exact, mae_exact = metrics(test_exp, exact_exp)
 
-print(f"Training observations: {len(train)}")
-print(f"Testing observations: {len(test)}")
+    print(f"Exact refit: {exact_stats['fits']} fits "
+          f"({exact_stats['seconds']:.1f} s)")
+    print(f"Speedup: {exact_stats['seconds'] / stats['seconds']:.1f}x")
+    print(f"RMSE drift: {rmse - rmse_exact:+.6f}")
+    print(f"MAE drift: {mae - mae_exact:+.6f}")
+    print(f"Max |forecast difference|: "
+          f"{np.max(np.abs(forecast_exp - exact_exp)):.6f}")
 
 
 # ==================================================
-# Rolling One-Step Forecast
+# Visualization
 # ==================================================
-history = train.tolist()
-predictions = []
+def plot_forecast(train_exp, test_exp, forecast_exp, ticker=TICKER):
+    import matplotlib.pyplot as plt
 
-for t in range(len(test)):
-    model = ARIMA(history, order=ARIMA_ORDER)
-    model_fit = model.fit()
+    from dse_eod.plotting import plot_series
 
-    yhat = model_fit.forecast(steps=1)[0]
-    predictions.append(yhat)
+    fig, ax = plt.subplots(figsize=(12, 6))
 
-    history.append(test.iloc[t])
+    ax.set_title(f"Rolling ARIMA(1,1,1) Forecast Illustration ({ticker})")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Close Price")
 
-# Convert predictions back to pandas series
-forecast_log = pd.Series(predictions, index=test.index)
+    # Lay out first: decimation bins follow the final axes width
+    fig.tight_layout()
 
-# Convert back from log space
-train_exp = np.exp(train)
-test_exp = np.exp(test)
-forecast_exp = np.exp(forecast_log)
+    # Training data
+    plot_series(ax, train_exp.index, train_exp,
+                method=DECIMATION,
+                linewidth=1,
+                label="Training Data")
 
+    # Testing data (thicker, slightly transparent)
+    plot_series(ax, test_exp.index, test_exp,
+                method=DECIMATION,
+                linewidth=2.2,
+                alpha=0.6,
+                label="Testing Data")
 
-# ==================================================
-# Evaluation Metrics (Reported but Not Emphasized)
-# ==================================================
-rmse = sqrt(mean_squared_error(test_exp, forecast_exp))
-mae = mean_absolute_error(test_exp, forecast_exp)
+    # Forecast (slightly thinner than test)
+    plot_series(ax, forecast_exp.index, forecast_exp,
+                method=DECIMATION,
+                linewidth=1.3,
+                label="Rolling ARIMA Forecast")
 
-print(f"RMSE: {rmse:.4f}")
-print(f"MAE: {mae:.4f}")
+    ax.legend()
+    fig.tight_layout()
 
+    fig.savefig(f"{FIGURE_DIR}/A1_arima_example.png", dpi=DPI)
+    fig.savefig(f"{FIGURE_DIR}/A1_arima_example.pdf")
 
-# ==================================================
-# Visualization
-# ==================================================
-fig, ax = plt.subplots(figsize=(12, 6))
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling ARIMA demonstration.")
+    parser.add_argument("--refit-every", type=int, default=REFIT_EVERY,
+                        help="Test steps between refits (0: never refit).")
+    parser.add_argument("--exact", action="store_true",
+                        help="Cold refit at every step (original scheme).")
+    parser.add_argument("--compare", action="store_true",
+                        help="Also run the exact scheme and report speedup "
+                             "and metric drift.")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    from dse_eod.forecast import exact_rolling_one_step, rolling_one_step
+    from statsmodels.tools.sm_exceptions import ConvergenceWarning
+
+    # Suppress convergence warnings only
+    warnings.simplefilter("ignore", ConvergenceWarning)
+
+    os.makedirs(FIGURE_DIR, exist_ok=True)
+
+    train, test = train_test_split(load_log_prices())
+
+    # ==================================================
+    # Rolling One-Step Forecast
+    # ==================================================
+    if args.exact:
+        predictions, stats = exact_rolling_one_step(train, test, ARIMA_ORDER)
+    else:
+        predictions, stats = rolling_one_step(
+            train, test, ARIMA_ORDER, refit_every=args.refit_every
+        )
+
+    print(f"Model fits: {stats['fits']}, filter updates: {stats['updates']} "
+          f"({stats['seconds']:.1f} s)")
+
+    # Convert predictions back to pandas series
+    forecast_log = pd.Series(predictions, index=test.index)
 
-# Training data
-ax.plot(train_exp.index, train_exp,
-        linewidth=1,
-        label="Training Data")
+    # Convert back from log space
+    train_exp = np.exp(train)
+    test_exp = np.exp(test)
+    forecast_exp = np.exp(forecast_log)
 
-# Testing data (thicker, slightly transparent)
-ax.plot(test_exp.index, test_exp,
-        linewidth=2.2,
-        alpha=0.6,
-        label="Testing Data")
+    rmse, mae = metrics(test_exp, forecast_exp)
 
-# Forecast (slightly thinner than test)
-ax.plot(forecast_exp.index, forecast_exp,
-        linewidth=1.3,
-        label="Rolling ARIMA Forecast")
+    print(f"RMSE: {rmse:.4f}")
+    print(f"MAE: {mae:.4f}")
 
-ax.set_title(f"Rolling ARIMA(1,1,1) Forecast Illustration ({TICKER})")
-ax.set_xlabel("Date")
-ax.set_ylabel("Close Price")
+    if args.compare and not args.exact:
+        compare_exact(train, test, test_exp, forecast_exp, rmse, mae, stats)
 
-ax.legend()
-fig.tight_layout()
+    plot_forecast(train_exp, test_exp, forecast_exp)
 
-fig.savefig(f"{FIGURE_DIR}/A1_arima_example.png", dpi=300)
-fig.savefig(f"{FIGURE_DIR}/A1_arima_example.pdf")
+    print("Rolling ARIMA demonstration figure generated successfully.")
 
-plt.close(fig)
 
-print("Rolling ARIMA demonstration figure generated successfully.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Benchmark — Metadata Pipeline and Experiments
+
+Generates synthetic AmarStock-shaped inputs (dse_eod/synthetic.py) at
+one or more scales and runs every stage script on them in a scratch
+directory, one subprocess per stage, recording:
+
+- wall-clock and CPU seconds
+- peak resident memory (RSS) of the stage process
+
+Scales are TICKERSxDAYS[xMISSING], e.g. 500x4865x0.05 (days are
+calendar days from the dataset start). Results are written as JSON;
+with --baseline the run is compared stage by stage against an earlier
+result file and the exit status is 1 if any stage got slower or larger
+than --tolerance allows.
+
+Examples:
+    python scripts/benchmarks/bench_pipeline.py
+    python scripts/benchmarks/bench_pipeline.py --scale 2000x4865x0.1 --stages build_availability_matrix
+    python scripts/benchmarks/bench_pipeline.py --baseline results/benchmarks/before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from dse_eod.synthetic import generate_dumps  # noqa: E402
+
+
+# ==================================================
+# Configuration
+# ==================================================
+
+DEFAULT_SCALES = ["100x1000x0.05", "500x4865x0.05"]
+
+RESULT_DIR = "results/benchmarks"
+
+# (name, script under scripts/, arguments); run in this order
+STAGES = [
+    ("build_availability_matrix", "build_availability_matrix.py",
+     ["--start-date", "{start}", "--end-date", "{end}"]),
+    ("generate_company_metadata", "generate_company_metadata.py", []),
+    ("generate_date_coverage", "generate_date_coverage.py", []),
+    ("generate_trading_segments", "generate_trading_segments.py", []),
+    ("reconcile_versions", "reconcile_versions.py", []),
+    ("validate_ohlcv", "validate_ohlcv.py", []),
+    ("coverage_vs_naive", "experiments/coverage_vs_naive.py", ["--no-cache"]),
+    ("cross_instrument_arima", "experiments/cross_instrument_arima.py",
+     ["--no-cache", "--workers", "1"]),
+    ("walk_forward_arima", "experiments/walk_forward_arima.py",
+     ["--no-cache", "--workers", "1"]),
+]
+
+STAGE_NAMES = [name for name, _, _ in STAGES]
+
+METRICS = ("seconds", "peak_rss_mb")
+
+
+def parse_scale(text) -> dict:
+    parts = text.lower().split("x")
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(
+            f"Scale {text!r} is not TICKERSxDAYS[xMISSING]."
+        )
+    return {
+        "tickers": int(parts[0]),
+        "days": int(parts[1]),
+        "missing": float(parts[2]) if len(parts) == 3 else 0.05,
+    }
+
+
+def scale_key(scale) -> str:
+    return f"{scale['tickers']}x{scale['days']}x{scale['missing']:g}"
+
+
+# ==================================================
+# Measurement
+# ==================================================
+
+def run_stage(script, arguments, workdir, log):
+    """Run one stage script; wall/CPU seconds and peak RSS of its process."""
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, script)] + arguments
+
+    t0 = time.perf_counter()
+    process = subprocess.Popen(command, cwd=workdir, stdout=log,
+                               stderr=subprocess.STDOUT)
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - t0
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    rss_bytes = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+    return {
+        "seconds": round(seconds, 4),
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 4),
+        "peak_rss_mb": round(rss_bytes / 2**20, 1),
+        "returncode": process.returncode,
+    }
+
+
+def input_sizes(workdir) -> dict:
+    return {
+        name: os.path.getsize(os.path.join(workdir, name))
+        for name in ("Adjusted-AmarStock.csv", "UnAdjusted-AmarStock.csv")
+    }
+
+
+def benchmark_scale(scale, stages, workdir, seed=0, repeat=1):
+    """Generate inputs for ``scale`` and time ``stages`` on them."""
+    t0 = time.perf_counter()
+    calendar = generate_dumps(workdir, scale["tickers"], scale["days"],
+                              scale["missing"], seed=seed)
+    generated = time.perf_counter() - t0
+
+    result = {
+        "scale": dict(scale, key=scale_key(scale)),
+        "inputs": dict(calendar, bytes=input_sizes(workdir),
+                       generate_seconds=round(generated, 4)),
+        "stages": [],
+    }
+
+    with open(os.path.join(workdir, "stages.log"), "w") as log:
+        for name, script, arguments in STAGES:
+            if name not in stages:
+                continue
+            arguments = [a.format(**calendar) for a in arguments]
+
+            runs = [run_stage(script, arguments, workdir, log)
+                    for _ in range(repeat)]
+            best = min(runs, key=lambda r: r["seconds"])
+            best["peak_rss_mb"] = max(r["peak_rss_mb"] for r in runs)
+            result["stages"].append(dict(stage=name, repeat=repeat, **best))
+
+            print(f"  {name:<28} {best['seconds']:>9.2f} s "
+                  f"{best['peak_rss_mb']:>9.1f} MB"
+                  + ("" if best["returncode"] == 0
+                     else f"  (exit {best['returncode']})"))
+
+            if best["returncode"] != 0:
+                print(f"  stage failed; see {log.name}. Skipping the rest.")
+                break
+
+    return result
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# ==================================================
+# Comparison
+# ==================================================
+
+def compare(results, baseline, tolerance):
+    """Print stage ratios against ``baseline``; return the regressions."""
+    before = {
+        (run["scale"]["key"], stage["stage"]): stage
+        for run in baseline["runs"] for stage in run["stages"]
+    }
+
+    regressions = []
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'} "
+          f"(tolerance {tolerance:.2f}x):")
+    for run in results["runs"]:
+        for stage in run["stages"]:
+            old = before.get((run["scale"]["key"], stage["stage"]))
+            if old is None:
+                continue
+            ratios = {m: stage[m] / old[m] if old[m] else float("inf")
+                      for m in METRICS}
+            flag = any(r > tolerance for r in ratios.values())
+            if flag:
+                regressions.append((run["scale"]["key"], stage["stage"], ratios))
+            print(f"  {run['scale']['key']:<16} {stage['stage']:<28} "
+                  f"time {ratios['seconds']:5.2f}x  "
+                  f"memory {ratios['peak_rss_mb']:5.2f}x"
+                  + ("  REGRESSION" if flag else ""))
+    return regressions
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", action="append", type=parse_scale,
+                        help="TICKERSxDAYS[xMISSING] (repeatable; default: "
+                             f"{' '.join(DEFAULT_SCALES)}).")
+    parser.add_argument("--stages", nargs="+", choices=STAGE_NAMES,
+                        default=STAGE_NAMES)
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per stage; the fastest is kept.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help=f"Result JSON (default: {RESULT_DIR}/"
+                             "pipeline-<timestamp>.json).")
+    parser.add_argument("--baseline", default=None,
+                        help="Earlier result JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="Allowed time/memory ratio against --baseline.")
+    parser.add_argument("--keep", action="store_true",
+                        help="Keep the scratch directories.")
+    args = parser.parse_args()
+
+    scales = args.scale or [parse_scale(s) for s in DEFAULT_SCALES]
+
+    results = dict(environment(), runs=[])
+
+    for scale in scales:
+        workdir = tempfile.mkdtemp(prefix=f"dse-bench-{scale_key(scale)}-")
+        print(f"Scale {scale_key(scale)} ({workdir})")
+        try:
+            results["runs"].append(
+                benchmark_scale(scale, args.stages, workdir, args.seed, args.repeat)
+            )
+        finally:
+            if not args.keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        RESULT_DIR,
+        f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(1)
@@ -1,94 +1,74 @@
-import pandas as pd
+import argparse
 import os
 
-if __name__ == "__main__":
-
-    # Ensure output directory exists
-    os.makedirs("metadata", exist_ok=True)
-
-    # -----------------------------
-    # 1. Load data [It is expected that you have the main CSV files stored in the same folder as this code is running]
-    # -----------------------------
-    combine1 = pd.read_csv("UnAdjusted-AmarStock.csv")
-    combine2 = pd.read_csv("Adjusted-AmarStock.csv")
-
-    # -----------------------------
-    # 2. Normalize dates
-    # -----------------------------
-    combine1["Date"] = pd.to_datetime(combine1["Date"]).dt.normalize()
-    combine2["Date"] = pd.to_datetime(combine2["Date"]).dt.normalize()
-
-    # -----------------------------
-    # 3. Extract trading codes
-    # -----------------------------
-    tradingCodes1 = combine1["Ticker"].unique()
-    tradingCodes2 = combine2["Ticker"].unique()
-
-    all_codes = sorted(set(tradingCodes1) | set(tradingCodes2))
-
-    # -----------------------------
-    # 4. Generate full calendar
-    # -----------------------------
-    start_date = "2012-10-01"
-    end_date   = "2026-01-25"
+from dse_eod.availability import (
+    DATASET_START,
+    DATASET_END,
+    MATRIX_PATH,
+    MATRIX_CSV_PATH,
+)
+from dse_eod.ingest import CHUNK_SIZE, DATE_FORMAT
+from dse_eod.pipeline import build_availability
+from dse_eod.profiling import stage
 
-    all_dates = pd.date_range(start=start_date, end=end_date, freq="D")
 
-    # -----------------------------
-    # 5. Initialize availability matrix
-    # -----------------------------
-    all_options = pd.DataFrame(
-        0,
-        index=all_dates,
-        columns=all_codes,
-        dtype="uint8"
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the per-(date, ticker) availability matrix."
     )
+    parser.add_argument("--start-date", default=DATASET_START)
+    parser.add_argument("--end-date", default=DATASET_END)
+    parser.add_argument("--output", default=MATRIX_PATH,
+                        help="Compact availability store (.npz).")
+    parser.add_argument("--export-csv", nargs="?", const=MATRIX_CSV_PATH,
+                        default=None, metavar="PATH",
+                        help="Also write the dense 0/1/2/3 CSV "
+                             f"(default path: {MATRIX_CSV_PATH}).")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE,
+                        help="Source rows read per chunk.")
+    parser.add_argument("--date-format", default=DATE_FORMAT,
+                        help="Date format of the source CSVs.")
+    args = parser.parse_args(argv)
 
-    all_options.index.name = "Date"
+    # Ensure output directory exists
+    os.makedirs("metadata", exist_ok=True)
 
     # -----------------------------
-    # 6. Mark adjusted availability (+1)
-    # -----------------------------
-    adj_pairs = (
-        combine2[["Date", "Ticker"]]
-        .drop_duplicates()
-        .set_index(["Date", "Ticker"])
-        .index
+    # 1. Load data [It is expected that you have the main CSV files stored in the same folder as this code is running]
+    #    (streamed in chunks: Date and Ticker only)
+    # 2. Encode availability
+    #    adjusted (+1), unadjusted (+2) over the full calendar
+    # -----------------------------
+    matrix = build_availability(
+        unadjusted_path="UnAdjusted-AmarStock.csv",
+        adjusted_path="Adjusted-AmarStock.csv",
+        start=args.start_date,
+        end=args.end_date,
+        chunksize=args.chunksize,
+        date_format=args.date_format
     )
 
-    stacked = all_options.stack()
-    stacked.loc[adj_pairs] += 1
-
     # -----------------------------
-    # 7. Mark unadjusted availability (+2)
+    # 3. Sanity checks
     # -----------------------------
-    unadj_pairs = (
-        combine1[["Date", "Ticker"]]
-        .drop_duplicates()
-        .set_index(["Date", "Ticker"])
-        .index
-    )
+    print("Value counts (must be 0,1,2,3 only):")
+    print(matrix.value_counts())
 
-    stacked.loc[unadj_pairs] += 2
+    print("\nNumber of instruments:")
+    print(matrix.n_tickers)
 
     # -----------------------------
-    # 8. Restore DataFrame shape
+    # 4. Save output
     # -----------------------------
-    all_options = stacked.unstack().reset_index()
+    with stage("save", output=args.output, rows=matrix.nnz):
+        matrix.save(args.output)
+    print(f"\nAvailability store saved to: {args.output}")
 
-    # -----------------------------
-    # 9. Sanity checks
-    # -----------------------------
-    print("Value counts (must be 0,1,2,3 only):")
-    print(all_options.iloc[:, 1:].stack().value_counts())
+    if args.export_csv:
+        with stage("save", output=args.export_csv, rows=matrix.nnz):
+            matrix.to_csv(args.export_csv)
+        print(f"Dense availability matrix saved to: {args.export_csv}")
 
-    print("\nNumber of instruments:")
-    print(len(all_codes))
 
-    # -----------------------------
-    # 10. Save output
-    # -----------------------------
-    all_options.to_csv(
-        "metadata/availability_matrix.csv",
-        index=False
-    )
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Build the Columnar EoD Store
+
+Converts per-ticker CSV folders (data_sample/<Universe>/) or the
+AmarStock dumps into typed Parquet datasets under data_store/,
+partitioned by ticker. Requires pyarrow.
+
+Examples:
+    python scripts/build_columnar_store.py
+    python scripts/build_columnar_store.py --universe Adjusted --from-dump Adjusted-AmarStock.csv
+"""
+
+import argparse
+import os
+
+from dse_eod import store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert EoD CSV files into the columnar store."
+    )
+    parser.add_argument("--universe", choices=list(store.UNIVERSES) + ["all"],
+                        default="all")
+    parser.add_argument("--csv-dir", default=None,
+                        help="Folder of <TICKER>.csv files for --universe "
+                             "(default: data_sample/<Universe>).")
+    parser.add_argument("--from-dump", default=None, metavar="PATH",
+                        help="Read the --universe AmarStock dump instead of "
+                             "a CSV folder.")
+    parser.add_argument("--store-dir", default=store.STORE_DIR)
+    parser.add_argument("--float32", action="store_true",
+                        help="Store prices as float32 (smaller, lossy).")
+    args = parser.parse_args(argv)
+
+    # One source cannot be both universes
+    if args.universe == "all":
+        for flag, value in (("--from-dump", args.from_dump),
+                            ("--csv-dir", args.csv_dir)):
+            if value:
+                parser.error(f"{flag} needs --universe Adjusted or Unadjusted.")
+
+    universes = store.UNIVERSES if args.universe == "all" else [args.universe]
+    price_dtype = "float32" if args.float32 else "float64"
+
+    for universe in universes:
+        if args.from_dump:
+            rows = store.convert_dump(
+                args.from_dump, universe, args.store_dir, price_dtype
+            )
+        else:
+            csv_dir = args.csv_dir or store.CSV_DIRS[universe]
+            if not os.path.isdir(csv_dir):
+                print(f"{universe}: {csv_dir} not found, skipped.")
+                continue
+            rows = store.convert_csv_dir(
+                universe, csv_dir, args.store_dir, price_dtype
+            )
+
+        print(f"{universe}: {rows} rows -> "
+              f"{store.store_path(universe, args.store_dir)}")
+
+
+if __name__ == "__main__":
+    main()
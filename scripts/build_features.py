@@ -0,0 +1,61 @@
+"""
+Build the Feature Cache
+
+Precomputes log prices, log returns, rolling volatility and volume
+means for every ticker of one universe from its price panel (see
+dse_eod/features.py) into data_store/features/<Universe>/. Nothing is
+recomputed when the panel and its source data are unchanged; --force
+rebuilds anyway.
+
+Build the panel first (scripts/build_panel.py).
+"""
+
+import argparse
+import os
+
+from dse_eod import features, panel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Precompute per-ticker price features."
+    )
+    parser.add_argument("--universe", choices=list(panel.UNIVERSE_FLAGS),
+                        default="Unadjusted")
+    parser.add_argument("--windows", nargs="+", type=int,
+                        default=list(features.WINDOWS),
+                        help="Rolling windows in panel rows.")
+    parser.add_argument("--panel-dir", default=panel.PANEL_DIR)
+    parser.add_argument("--features-dir", default=features.FEATURES_DIR)
+    parser.add_argument("--csv-dir", default=None,
+                        help="Per-ticker CSV folder the panel was built from.")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild even when the cache is current.")
+    args = parser.parse_args(argv)
+
+    if args.force:
+        state = os.path.join(
+            features.features_path(args.universe, args.features_dir), "state.json"
+        )
+        if os.path.exists(state):
+            os.remove(state)
+
+    cache = features.open_features(
+        universe=args.universe,
+        panel_dir=args.panel_dir,
+        features_dir=args.features_dir,
+        windows=tuple(args.windows),
+        csv_dir=args.csv_dir,
+    )
+    if cache is None:
+        raise SystemExit(
+            f"No {args.universe} panel under {args.panel_dir}; "
+            "run scripts/build_panel.py first."
+        )
+
+    print(f"Features ready: {', '.join(cache.names)} for "
+          f"{len(cache.tickers)} tickers -> {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
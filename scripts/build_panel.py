@@ -0,0 +1,63 @@
+"""
+Build the Memory-Mapped Price Panel
+
+Writes dates x tickers Close/Volume matrices for one universe under
+data_store/panel/<Universe>/ (see dse_eod/panel.py). The calendar,
+ticker universe and validity mask come from metadata/availability.npz
+when it exists. Rows are trading sessions unless ``--calendar days``.
+
+Reads the columnar store when built, otherwise data_sample/<Universe>/.
+"""
+
+import argparse
+import os
+
+from dse_eod.availability import MATRIX_PATH, AvailabilityMatrix
+from dse_eod import panel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the memory-mapped price panel."
+    )
+    parser.add_argument("--universe", choices=list(panel.UNIVERSE_FLAGS),
+                        default="Unadjusted")
+    parser.add_argument("--fields", nargs="+", default=list(panel.FIELDS))
+    parser.add_argument("--float32", action="store_true",
+                        help="Store values as float32 (half the size).")
+    parser.add_argument("--matrix", default=MATRIX_PATH,
+                        help="Availability store for calendar and mask.")
+    parser.add_argument("--csv-dir", default=None,
+                        help="Per-ticker CSV fallback folder.")
+    parser.add_argument("--panel-dir", default=panel.PANEL_DIR)
+    parser.add_argument("--calendar", choices=panel.CALENDARS, default="sessions",
+                        help="Row per trading session or per calendar day.")
+    args = parser.parse_args(argv)
+
+    matrix = (
+        AvailabilityMatrix.load(args.matrix)
+        if os.path.exists(args.matrix) else None
+    )
+    if matrix is None:
+        print(f"{args.matrix} not found: calendar and mask from the data.")
+
+    built = panel.build_panel(
+        universe=args.universe,
+        fields=args.fields,
+        matrix=matrix,
+        panel_dir=args.panel_dir,
+        dtype="float32" if args.float32 else "float64",
+        csv_dir=args.csv_dir,
+        calendar=args.calendar
+    )
+
+    n_dates, n_tickers = built.shape
+    print(f"Panel built: {n_dates} dates x {n_tickers} tickers "
+          f"({', '.join(built.fields)}) -> {built.path}")
+    if built.header["dropped_rows"]:
+        print(f"{built.header['dropped_rows']} rows outside the "
+              f"{args.calendar} calendar were dropped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+DSE EoD Command Line
+
+Single entry point for the metadata scripts and experiments:
+
+    python scripts/dse.py tickers --type Equity
+    python scripts/dse.py query on 2019-03-12
+    python scripts/dse.py pipeline --chunksize 1000000
+    python scripts/dse.py cross-instrument --all --backend numpy
+
+Each command imports only what it needs (see dse_eod/cli.py).
+"""
+
+from dse_eod.cli import main
+
+
+if __name__ == "__main__":
+    main()
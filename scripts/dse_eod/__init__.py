@@ -0,0 +1,6 @@
+"""
+Shared building blocks for the Dhaka Stock Exchange EoD dataset scripts.
+
+Modules are imported explicitly (e.g. ``from dse_eod import availability``)
+so that each script only pays for the dependencies it actually uses.
+"""
@@ -0,0 +1,331 @@
+"""
+Batched ARMA(1,1) Estimation (pure NumPy)
+
+Fits ARIMA(1,0,1) with a constant and ARIMA(1,1,1) without one to many
+series at once, each series being a row of a 2-D array. Series of
+different lengths are left-aligned and padded with NaN.
+
+Estimation:
+
+- parameters by conditional sum of squares (CSS), minimised with
+  Levenberg-Marquardt steps taken for all series simultaneously
+- the exact Gaussian log-likelihood at those parameters from the
+  Kalman filter (ARMA(1,1) in Harvey form has a scalar innovation
+  variance recursion), with sigma2 concentrated out
+- forecasts from the final filter state, and one-step-ahead
+  predictions over later data with the parameters held fixed
+  (``one_step_predictions``)
+
+The parameterisation follows ``statsmodels.tsa.arima.model.ARIMA``
+(regression on a constant with ARMA errors; MA sign +theta), and AIC /
+BIC count parameters the same way, so results can be checked against
+it with ``statsmodels_reference``. CSS and exact MLE estimates differ
+slightly in finite samples.
+"""
+
+import numpy as np
+
+
+MAX_ROOT = 0.995  # keeps phi / theta inside the stationary/invertible region
+
+
+def pack(series_list):
+    """Left-align 1-D series into a NaN-padded 2-D array."""
+    arrays = [np.asarray(s, dtype=float) for s in series_list]
+    lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+
+    Y = np.full((len(arrays), lengths.max(initial=0)), np.nan)
+    for i, a in enumerate(arrays):
+        Y[i, :len(a)] = a
+    return Y, lengths
+
+
+def _lengths(Y, lengths):
+    if lengths is not None:
+        return np.asarray(lengths, dtype=np.int64)
+
+    valid = ~np.isnan(Y)
+    lengths = valid.sum(axis=1)
+    if (valid != (np.arange(Y.shape[1]) < lengths[:, None])).any():
+        raise ValueError("Missing values are only allowed as trailing padding.")
+    return lengths
+
+
+class ArmaBatchResult:
+    """Estimates for a batch of series (one entry per row)."""
+
+    def __init__(self, order, const, phi, theta, sigma2, llf, nobs,
+                 n_eff, converged, iterations, state):
+        self.order = order
+        self.const = const
+        self.phi = phi
+        self.theta = theta
+        self.sigma2 = sigma2
+        self.llf = llf
+        self.nobs = nobs
+        self.converged = converged
+        self.iterations = iterations
+        self._state = state
+
+        k = 3 + (order[1] == 0)  # [const,] ar.L1, ma.L1, sigma2
+        self.k_params = k
+        self.aic = -2 * llf + 2 * k
+        self.bic = -2 * llf + k * np.log(n_eff)
+
+    @property
+    def param_names(self):
+        names = ["ar.L1", "ma.L1", "sigma2"]
+        return ["const"] + names if self.order[1] == 0 else names
+
+    @property
+    def params(self) -> np.ndarray:
+        """(n_series, k) array in ``param_names`` order."""
+        cols = [self.phi, self.theta, self.sigma2]
+        if self.order[1] == 0:
+            cols = [self.const] + cols
+        return np.column_stack(cols)
+
+    def forecast(self, steps) -> np.ndarray:
+        """(n_series, steps) out-of-sample forecasts."""
+        next_u, level = self._state
+        powers = self.phi[:, None] ** np.arange(steps)[None, :]
+        u = next_u[:, None] * powers
+
+        if self.order[1] == 0:
+            return self.const[:, None] + u
+        return level[:, None] + np.cumsum(u, axis=1)
+
+
+def _css_pass(U, mask, mu, phi, theta, include_mean):
+    """
+    Residuals, SSE and Gauss-Newton normal equations for all series.
+
+    Recursion (t >= 1, e_0 = 0):
+        e_t = (u_t - mu) - phi (u_{t-1} - mu) - theta e_{t-1}
+    with the three derivatives following the same first-order filter.
+    """
+    n, T = U.shape
+    X = U - mu[:, None]
+
+    # Inputs of the joint filter S_t = base_t - theta * S_{t-1},
+    # S = [e, de/dmu, de/dphi, de/dtheta]; de/dtheta also gets -e_{t-1}
+    base = np.zeros((T, n, 4))
+    base[1:, :, 0] = (X[:, 1:] - phi[:, None] * X[:, :-1]).T
+    if include_mean:
+        base[1:, :, 1] = -(1.0 - phi)
+    base[1:, :, 2] = -X[:, :-1].T
+
+    S = np.zeros((T, n, 4))
+    th = theta[:, None]
+    for t in range(1, T):
+        S[t] = base[t] - th * S[t - 1]
+        S[t, :, 3] -= S[t - 1, :, 0]
+
+    S *= mask.T[:, :, None]
+    e = S[:, :, 0]
+    J = S[:, :, 1:]
+
+    sse = np.einsum("tn,tn->n", e, e)
+    JtJ = np.einsum("tnk,tnl->nkl", J, J)
+    Jte = np.einsum("tnk,tn->nk", J, e)
+
+    if not include_mean:
+        JtJ[:, 0, :] = 0.0
+        JtJ[:, :, 0] = 0.0
+        JtJ[:, 0, 0] = 1.0
+        Jte[:, 0] = 0.0
+
+    return sse, JtJ, Jte
+
+
+def _kalman(U, lengths, mu, phi, theta):
+    """
+    Exact log-likelihood (sigma2 concentrated) and the one-step-ahead
+    prediction of u after each series' last observation.
+
+    For ARMA(1,1) in Harvey form only the (0, 0) element of the state
+    covariance changes, so the filter reduces to scalar recursions:
+        v_t = u_t - a_t,  F_{t+1} = 1 + theta^2 (1 - 1 / F_t),
+        a_{t+1} = phi u_t + theta v_t / F_t
+    """
+    n, T = U.shape
+    X = U - mu[:, None]
+
+    a = np.zeros(n)
+    F = (1 + 2 * phi * theta + theta ** 2) / (1 - phi ** 2)
+    sum_v2f = np.zeros(n)
+    sum_logf = np.zeros(n)
+
+    for t in range(T):
+        active = t < lengths
+        x = np.where(active, X[:, t], 0.0)
+        v = x - a
+
+        sum_v2f += np.where(active, v * v / F, 0.0)
+        sum_logf += np.where(active, np.log(F), 0.0)
+
+        a = np.where(active, phi * x + theta * v / F, a)
+        F = np.where(active, 1 + theta ** 2 * (1 - 1 / F), F)
+
+    sigma2 = sum_v2f / lengths
+    llf = (
+        -0.5 * lengths * (np.log(2 * np.pi) + np.log(sigma2) + 1)
+        - 0.5 * sum_logf
+    )
+    return llf, sigma2, a
+
+
+def one_step_predictions(Y, lengths, order, params) -> np.ndarray:
+    """
+    One-step-ahead predictions of every observation of ``Y`` with the
+    parameters held fixed (the ``_kalman`` filter run over each row):
+    what a model fitted once would have predicted, one step at a time,
+    over data it was not fitted on.
+
+    ``params`` is (n_series, k) in ``ArmaBatchResult.param_names`` order.
+    Padding, and the first observation of a differenced series, are NaN.
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    lengths = _lengths(Y, lengths)
+    params = np.atleast_2d(np.asarray(params, dtype=float))
+
+    if order[1] == 0:
+        U, mu = Y, params[:, 0]
+        phi, theta = params[:, 1], params[:, 2]
+    else:
+        U, mu = np.diff(Y, axis=1), np.zeros(len(Y))
+        phi, theta = params[:, 0], params[:, 1]
+        lengths = lengths - 1
+
+    n, T = U.shape
+    X = U - mu[:, None]
+
+    a = np.zeros(n)
+    F = (1 + 2 * phi * theta + theta ** 2) / (1 - phi ** 2)
+    predicted = np.full((n, T), np.nan)
+
+    for t in range(T):
+        active = t < lengths
+        predicted[:, t] = np.where(active, mu + a, np.nan)
+
+        x = np.where(active, X[:, t], 0.0)
+        v = x - a
+        a = np.where(active, phi * x + theta * v / F, a)
+        F = np.where(active, 1 + theta ** 2 * (1 - 1 / F), F)
+
+    if order[1] == 0:
+        return predicted
+
+    # Levels: previous observation plus the predicted difference
+    levels = np.full(Y.shape, np.nan)
+    levels[:, 1:] = Y[:, :-1] + predicted
+    return levels
+
+
+def fit_arma11(Y, lengths=None, order=(1, 0, 1), max_iter=100, tol=1e-10):
+    """
+    Fit ARIMA ``order`` ((1, 0, 1) or (1, 1, 1)) to every row of ``Y``.
+
+    ``Y`` is (n_series, T); shorter series are left-aligned and padded
+    with NaN (or give ``lengths`` explicitly).
+    """
+    if tuple(order) not in ((1, 0, 1), (1, 1, 1)):
+        raise ValueError(f"Unsupported order {order}; use (1,0,1) or (1,1,1).")
+
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    lengths = _lengths(Y, lengths)
+    nobs = lengths.copy()
+
+    include_mean = order[1] == 0
+    if include_mean:
+        U = Y
+        level = None
+    else:
+        U = np.diff(Y, axis=1)
+        level = Y[np.arange(len(Y)), lengths - 1]
+        lengths = lengths - 1
+
+    n, T = U.shape
+    if (lengths < 3).any():
+        raise ValueError("Every series needs at least 3 usable observations.")
+
+    mask = np.arange(T)[None, :] < lengths[:, None]
+    U = np.where(mask, U, 0.0)
+
+    # Start: sample mean, lag-1 autocorrelation as AR, no MA
+    mu = U.sum(axis=1) / lengths if include_mean else np.zeros(n)
+    X = np.where(mask, U - mu[:, None], 0.0)
+    r1 = (X[:, 1:] * X[:, :-1]).sum(axis=1) / np.maximum((X * X).sum(axis=1), 1e-300)
+    phi = np.clip(r1, -0.5, 0.5)
+    theta = np.zeros(n)
+
+    mask_css = mask.copy()
+    mask_css[:, 0] = False  # e_0 is conditioned on, not estimated
+
+    sse, JtJ, Jte = _css_pass(U, mask_css, mu, phi, theta, include_mean)
+    damping = np.full(n, 1e-3)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=np.int64)
+
+    for _ in range(max_iter):
+        todo = ~converged
+        if not todo.any():
+            break
+
+        diag = np.einsum("nkk->nk", JtJ)
+        A = JtJ + (damping[:, None] * np.maximum(diag, 1e-12))[:, :, None] * np.eye(3)
+        step = -np.linalg.solve(A, Jte[:, :, None])[:, :, 0]
+        step[converged] = 0.0
+
+        mu_c = mu + step[:, 0]
+        phi_c = np.clip(phi + step[:, 1], -MAX_ROOT, MAX_ROOT)
+        theta_c = np.clip(theta + step[:, 2], -MAX_ROOT, MAX_ROOT)
+
+        sse_c, JtJ_c, Jte_c = _css_pass(U, mask_css, mu_c, phi_c, theta_c, include_mean)
+
+        better = todo & (sse_c <= sse)
+        gain = np.where(better, (sse - sse_c) / np.maximum(sse, 1e-300), 0.0)
+
+        mu = np.where(better, mu_c, mu)
+        phi = np.where(better, phi_c, phi)
+        theta = np.where(better, theta_c, theta)
+        sse = np.where(better, sse_c, sse)
+        JtJ = np.where(better[:, None, None], JtJ_c, JtJ)
+        Jte = np.where(better[:, None], Jte_c, Jte)
+
+        damping = np.where(better, damping / 10, damping * 10)
+        iterations += todo
+        converged |= (better & (gain < tol)) | (damping > 1e10)
+
+    llf, sigma2, next_u = _kalman(U, lengths, mu, phi, theta)
+
+    return ArmaBatchResult(
+        order=tuple(order),
+        const=mu,
+        phi=phi,
+        theta=theta,
+        sigma2=sigma2,
+        llf=llf,
+        nobs=nobs,
+        n_eff=lengths,
+        converged=converged,
+        iterations=iterations,
+        state=(next_u, level)
+    )
+
+
+def statsmodels_reference(series, order, steps=0):
+    """
+    The same quantities from ``statsmodels`` ARIMA for one series, for
+    cross-checking: dict with params, aic, bic, llf and forecasts.
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    fit = ARIMA(np.asarray(series, dtype=float), order=order).fit()
+    return {
+        "params": np.asarray(fit.params),
+        "aic": fit.aic,
+        "bic": fit.bic,
+        "llf": fit.llf,
+        "forecast": np.asarray(fit.forecast(steps)) if steps else np.empty(0),
+    }
@@ -0,0 +1,440 @@
+"""
+Availability Matrix Engine
+
+Stores, for every (ticker, calendar day) pair, which versions of the
+EoD data exist:
+
+0 - not available
+1 - adjusted only
+2 - unadjusted only
+3 - both versions
+
+Only observed pairs are kept. They are held in CSR layout (one row per
+ticker, sorted day offsets from the calendar start), so memory scales
+with the number of observed rows instead of days x tickers. The dense
+0/1/2/3 CSV is still available as an export.
+
+pandas is only imported by the frame and CSV helpers, so loading the
+compact store and querying it stay numpy-only.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import os
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from dse_eod.profiling import stage
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ==================================================
+# Configuration
+# ==================================================
+DATASET_START = "2012-10-01"
+DATASET_END = "2026-01-25"
+
+MATRIX_PATH = "metadata/availability.npz"
+MATRIX_CSV_PATH = "metadata/availability_matrix.csv"
+
+ADJUSTED = 1
+UNADJUSTED = 2
+BOTH = ADJUSTED | UNADJUSTED
+
+FORMAT_VERSION = 1
+
+ONE_DAY = np.timedelta64(1, "D")
+
+
+def to_day(value) -> np.datetime64:
+    """Convert a date-like value to ``datetime64[D]``."""
+    if isinstance(value, datetime.datetime):
+        return np.datetime64(value.date(), "D")
+    if isinstance(value, datetime.date):
+        return np.datetime64(value, "D")
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    if isinstance(value, str) and len(value) == 10 and value[4] == value[7] == "-":
+        return np.datetime64(value, "D")  # YYYY-MM-DD
+
+    import pandas as pd
+    return np.datetime64(pd.Timestamp(value).normalize().date(), "D")
+
+
+class AvailabilityMatrix:
+    """
+    Sparse availability matrix over a contiguous daily calendar.
+
+    Attributes
+    ----------
+    tickers : ndarray of str, sorted
+    start : datetime64[D], first calendar day
+    n_days : number of calendar days
+    indptr : int64 array of length ``len(tickers) + 1``
+    days : int32 day offsets, sorted within each ticker
+    codes : uint8 availability codes (1, 2 or 3)
+    """
+
+    def __init__(self, tickers, start, n_days, indptr, days, codes):
+        self.tickers = np.asarray(tickers, dtype=str)
+        self.start = np.datetime64(start, "D")
+        self.n_days = int(n_days)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.days = np.asarray(days, dtype=np.int32)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self._fingerprint = None
+
+    # --------------------------------------------------
+    # Shape and calendar
+    # --------------------------------------------------
+    @property
+    def n_tickers(self) -> int:
+        return len(self.tickers)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.codes)
+
+    @property
+    def end(self) -> np.datetime64:
+        return self.start + (self.n_days - 1) * ONE_DAY
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self.start + np.arange(self.n_days) * ONE_DAY
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Content hash of the matrix. ``save`` stores it with the arrays,
+        so a loaded matrix is not hashed again.
+        """
+        if self._fingerprint is None:
+            h = hashlib.sha256()
+            h.update(f"{self.start}|{self.n_days}|".encode())
+            h.update("\0".join(self.tickers).encode())
+            for array in (self.indptr, self.days, self.codes):
+                h.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def ticker_index(self) -> np.ndarray:
+        """Ticker position of every stored entry (the COO row array)."""
+        return np.repeat(
+            np.arange(self.n_tickers, dtype=np.int32),
+            np.diff(self.indptr)
+        )
+
+    def __repr__(self):
+        return (
+            f"AvailabilityMatrix(tickers={self.n_tickers}, "
+            f"days={self.n_days}, start={self.start}, nnz={self.nnz})"
+        )
+
+    # --------------------------------------------------
+    # Construction
+    # --------------------------------------------------
+    @classmethod
+    def from_codes(cls, ticker_idx, day_idx, flags, tickers, start, n_days):
+        """
+        Build from integer-coded observations.
+
+        ``ticker_idx`` indexes into the sorted ``tickers`` array, ``day_idx``
+        is the offset from ``start`` and ``flags`` is ADJUSTED/UNADJUSTED
+        (or an already combined code). Duplicate pairs are merged with a
+        bitwise OR, so repeated rows never produce codes above 3.
+        """
+        ticker_idx = np.asarray(ticker_idx, dtype=np.int64)
+        day_idx = np.asarray(day_idx, dtype=np.int64)
+        flags = np.asarray(flags, dtype=np.uint8)
+
+        outside = (day_idx < 0) | (day_idx >= n_days)
+        if outside.any():
+            raise ValueError(
+                f"{int(outside.sum())} observations fall outside the "
+                f"calendar starting {np.datetime64(start, 'D')} "
+                f"({n_days} days)."
+            )
+
+        keys = ticker_idx * n_days + day_idx
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        flags = flags[order]
+
+        if len(keys):
+            first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            codes = np.bitwise_or.reduceat(flags, first)
+            keys = keys[first]
+        else:
+            codes = flags
+
+        counts = np.bincount(keys // n_days, minlength=len(tickers))
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+
+        return cls(tickers, start, n_days, indptr, keys % n_days, codes)
+
+    @classmethod
+    def from_frames(cls, adjusted, unadjusted,
+                    start=DATASET_START, end=DATASET_END):
+        """
+        Build from the Adjusted and Unadjusted frames.
+
+        Both frames need normalized ``Date`` and ``Ticker`` columns; any
+        other columns are ignored.
+        """
+        start = to_day(start)
+        n_days = int((to_day(end) - start) // ONE_DAY) + 1
+
+        tickers = np.union1d(
+            adjusted["Ticker"].astype(str).unique(),
+            unadjusted["Ticker"].astype(str).unique()
+        )
+
+        ticker_parts, day_parts, flag_parts = [], [], []
+
+        for frame, flag in ((adjusted, ADJUSTED), (unadjusted, UNADJUSTED)):
+            ticker_parts.append(
+                np.searchsorted(tickers, frame["Ticker"].astype(str).to_numpy())
+            )
+            day_parts.append(
+                (frame["Date"].to_numpy().astype("datetime64[D]") - start)
+                // ONE_DAY
+            )
+            flag_parts.append(np.full(len(frame), flag, dtype=np.uint8))
+
+        return cls.from_codes(
+            np.concatenate(ticker_parts),
+            np.concatenate(day_parts),
+            np.concatenate(flag_parts),
+            tickers, start, n_days
+        )
+
+    @classmethod
+    def from_dense(cls, dates, tickers, values):
+        """Build from a dense (days x tickers) code array."""
+        dates = np.asarray(dates).astype("datetime64[D]")
+        values = np.asarray(values, dtype=np.uint8)
+
+        start = dates[0]
+        day_idx = (dates - start) // ONE_DAY
+
+        # Transposing gives ticker-major order, which is the CSR order
+        present_t, present_d = np.nonzero(values.T)
+
+        return cls.from_codes(
+            present_t, day_idx[present_d], values[present_d, present_t],
+            tickers, start, int(day_idx[-1]) + 1
+        )
+
+    def append(self, other):
+        """
+        Append a matrix whose calendar starts after this one ends.
+
+        The calendar is extended to ``other.end`` and the ticker universe
+        becomes the union of both. Stored entries are moved with vectorized
+        scatters (no re-sort), so the work is a linear copy of the
+        existing arrays plus the new rows.
+        """
+        if other.start <= self.end:
+            raise ValueError(
+                f"Cannot append data starting {other.start}: "
+                f"matrix already covers up to {self.end}."
+            )
+
+        tickers = np.union1d(self.tickers, other.tickers)
+        shift = int((other.start - self.start) // ONE_DAY)
+        n_days = shift + other.n_days
+
+        old_pos = np.searchsorted(tickers, self.tickers)
+        new_pos = np.searchsorted(tickers, other.tickers)
+
+        old_counts = np.zeros(len(tickers), dtype=np.int64)
+        old_counts[old_pos] = np.diff(self.indptr)
+        new_counts = np.zeros(len(tickers), dtype=np.int64)
+        new_counts[new_pos] = np.diff(other.indptr)
+
+        indptr = np.concatenate([[0], np.cumsum(old_counts + new_counts)])
+        days = np.empty(indptr[-1], dtype=np.int32)
+        codes = np.empty(indptr[-1], dtype=np.uint8)
+
+        # Existing entries keep their order at the front of each row
+        row = self.ticker_index()
+        target = (
+            indptr[old_pos[row]]
+            + np.arange(self.nnz) - self.indptr[row]
+        )
+        days[target] = self.days
+        codes[target] = self.codes
+
+        # New entries follow them (all new days are later)
+        row = other.ticker_index()
+        tick = new_pos[row]
+        target = (
+            indptr[tick] + old_counts[tick]
+            + np.arange(other.nnz) - other.indptr[row]
+        )
+        days[target] = other.days + shift
+        codes[target] = other.codes
+
+        return AvailabilityMatrix(
+            tickers, self.start, n_days, indptr, days, codes
+        )
+
+    def tail(self, first_day):
+        """
+        The entries on or after calendar offset ``first_day``, as a matrix
+        over the same tickers whose calendar starts on that day. Each
+        ticker's row is cut by binary search, so the work is proportional
+        to the entries kept.
+        """
+        first_day = min(max(int(first_day), 0), self.n_days)
+        lo = np.array([
+            a + np.searchsorted(self.days[a:b], first_day)
+            for a, b in zip(self.indptr[:-1], self.indptr[1:])
+        ], dtype=np.int64)
+        counts = self.indptr[1:] - lo
+
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        take = np.repeat(lo - indptr[:-1], counts) + np.arange(indptr[-1])
+
+        return AvailabilityMatrix(
+            self.tickers, self.start + first_day * ONE_DAY,
+            self.n_days - first_day, indptr,
+            self.days[take] - first_day, self.codes[take]
+        )
+
+    # --------------------------------------------------
+    # Views
+    # --------------------------------------------------
+    def ticker_slice(self, ticker):
+        """Return (day offsets, codes) stored for one ticker."""
+        i = int(np.searchsorted(self.tickers, ticker))
+        if i == self.n_tickers or self.tickers[i] != ticker:
+            raise KeyError(ticker)
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.days[lo:hi], self.codes[lo:hi]
+
+    def to_dense(self) -> np.ndarray:
+        """Dense (days x tickers) uint8 code array."""
+        dense = np.zeros((self.n_days, self.n_tickers), dtype=np.uint8)
+        dense[self.days, self.ticker_index()] = self.codes
+        return dense
+
+    def to_frame(self) -> pd.DataFrame:
+        """Dense frame with a ``Date`` column followed by one column per ticker."""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.to_dense(), columns=self.tickers)
+        frame.insert(0, "Date", pd.to_datetime(self.dates))
+        return frame
+
+    def value_counts(self) -> pd.Series:
+        """Counts of each code (0-3) over the full dense matrix."""
+        import pandas as pd
+
+        counts = np.bincount(self.codes, minlength=4)
+        counts[0] = self.n_days * self.n_tickers - self.nnz
+        return pd.Series(counts, index=range(4), name="count")
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+    def save(self, path=MATRIX_PATH):
+        """Write the compact ``.npz`` store."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            format_version=FORMAT_VERSION,
+            tickers=self.tickers,
+            start=str(self.start),
+            n_days=self.n_days,
+            indptr=self.indptr,
+            days=self.days,
+            codes=self.codes,
+            fingerprint=self.fingerprint
+        )
+
+    def to_csv(self, path=MATRIX_CSV_PATH):
+        """Write the dense 0/1/2/3 CSV export."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        frame = self.to_frame()
+        frame["Date"] = frame["Date"].dt.date
+        frame.to_csv(path, index=False)
+
+    @classmethod
+    def read_csv(cls, path=MATRIX_CSV_PATH):
+        """Read a dense CSV export (ISO or day-first dates)."""
+        import pandas as pd
+
+        frame = pd.read_csv(path)
+        dates = parse_matrix_dates(frame["Date"])
+        return cls.from_dense(
+            dates.to_numpy(), frame.columns[1:], frame.iloc[:, 1:].to_numpy()
+        )
+
+    @classmethod
+    def load(cls, path=MATRIX_PATH):
+        """Load a compact store, or a dense CSV if ``path`` ends in ``.csv``."""
+        if str(path).endswith(".csv"):
+            return cls.read_csv(path)
+
+        with np.load(path, allow_pickle=False) as store:
+            version = int(store["format_version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported availability store version {version}."
+                )
+            matrix = cls(
+                store["tickers"],
+                str(store["start"]),
+                int(store["n_days"]),
+                store["indptr"],
+                store["days"],
+                store["codes"]
+            )
+            if "fingerprint" in store.files:  # stores saved before it was kept
+                matrix._fingerprint = str(store["fingerprint"])
+            return matrix
+
+
+def parse_matrix_dates(values) -> pd.Series:
+    """
+    Parse the ``Date`` column of a matrix CSV.
+
+    Exports written by this module are ISO dates; copies that went
+    through a spreadsheet are day-first with mixed year width
+    (DD-MM-YYYY / DD-MM-YY).
+    """
+    import pandas as pd
+
+    dates = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+    if dates.isna().any():
+        dates = pd.to_datetime(values, dayfirst=True, format="mixed")
+    return dates
+
+
+def load_availability(path=None) -> AvailabilityMatrix:
+    """
+    Load the availability matrix.
+
+    Without an explicit path the compact store is preferred and the
+    dense CSV export is used as a fallback. FileNotFoundError (with a
+    one-line message pointing at the pipeline) when neither exists.
+    """
+    missing = path or f"{MATRIX_PATH} (or {MATRIX_CSV_PATH})"
+    if path is None:
+        path = MATRIX_PATH if os.path.exists(MATRIX_PATH) else MATRIX_CSV_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"No availability matrix at {missing}; "
+            "run `python scripts/dse.py pipeline` first."
+        )
+    with stage("load", source=path) as record:
+        matrix = AvailabilityMatrix.load(path)
+        record.rows = matrix.nnz
+    return matrix
@@ -0,0 +1,103 @@
+"""
+Incremental Build Tasks
+
+A task declares the files it reads and writes. After a successful run
+the content hash of every input is recorded in a JSON state file; the
+task is stale again only when an input's hash changes or an output is
+missing. File size and mtime are recorded as well, so unchanged files
+are not re-hashed.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+
+
+STATE_VERSION = 1
+
+
+@dataclass
+class Task:
+    name: str
+    inputs: list
+    outputs: list
+    params: dict = field(default_factory=dict)
+
+
+def file_digest(path, chunk_size=1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_state(path) -> dict:
+    """Recorded input signatures per task ({} if there is no state)."""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get("format_version") != STATE_VERSION:
+        return {}
+    return state.get("tasks", {})
+
+
+def write_state(tasks_state, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"format_version": STATE_VERSION, "tasks": tasks_state},
+                  f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def input_signature(paths, previous=None) -> dict:
+    """
+    {path: {size, mtime, sha256}} for the current inputs. The hash is
+    reused from ``previous`` when size and mtime are unchanged.
+    """
+    previous = previous or {}
+    signature = {}
+
+    for path in paths:
+        st = os.stat(path)
+        old = previous.get(path)
+        if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime_ns:
+            digest = old["sha256"]
+        else:
+            digest = file_digest(path)
+        signature[path] = {
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "sha256": digest,
+        }
+    return signature
+
+
+def _hashes(signature):
+    return {path: entry["sha256"] for path, entry in signature.items()}
+
+
+def is_stale(task, tasks_state) -> bool:
+    """True when ``task`` must run: new inputs, changed params or missing outputs."""
+    if not all(os.path.exists(path) for path in task.outputs):
+        return True
+
+    recorded = tasks_state.get(task.name)
+    if recorded is None or recorded.get("params") != task.params:
+        return True
+
+    current = input_signature(task.inputs, recorded["inputs"])
+    return _hashes(current) != _hashes(recorded["inputs"])
+
+
+def record(task, tasks_state):
+    """Mark ``task`` as built from its current inputs."""
+    previous = tasks_state.get(task.name, {}).get("inputs")
+    tasks_state[task.name] = {
+        "inputs": input_signature(task.inputs, previous),
+        "params": task.params,
+    }
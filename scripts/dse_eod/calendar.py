@@ -0,0 +1,179 @@
+"""
+DSE Trading Calendar
+
+The exchange trades Sunday to Thursday; Friday and Saturday are the
+weekend. Holidays are not published with the data, so they are
+inferred: a weekday on which no instrument has any availability is a
+holiday. Every day with data is a trading session, including the
+occasional make-up session held on a Saturday.
+
+``TradingCalendar`` keeps the sessions as sorted int32 offsets from the
+first calendar day and converts between dates and session numbers with
+vectorized arithmetic and binary search, so series and matrices can be
+laid out over sessions (about 70% of the calendar days) instead of
+every day.
+"""
+
+import numpy as np
+
+from dse_eod.availability import ONE_DAY, to_day
+
+
+DAY_NAMES = np.array([
+    "Monday", "Tuesday", "Wednesday", "Thursday",
+    "Friday", "Saturday", "Sunday"
+])
+
+WEEKEND_DAYS = ["Friday", "Saturday"]  # DSE weekend
+WEEKEND_WEEKDAYS = np.flatnonzero(np.isin(DAY_NAMES, WEEKEND_DAYS))
+
+HOW = ("exact", "next", "previous")
+
+
+def _days(dates) -> np.ndarray:
+    """Epoch day numbers of date-like values (scalar or array)."""
+    return np.asarray(dates).astype("datetime64[D]").astype(np.int64)
+
+
+def weekday_index(dates) -> np.ndarray:
+    """Monday=0 ... Sunday=6 for an array of ``datetime64`` dates."""
+    return (_days(dates) + 3) % 7  # 1970-01-01 was a Thursday
+
+
+def is_weekend(dates) -> np.ndarray:
+    return np.isin(weekday_index(dates), WEEKEND_WEEKDAYS)
+
+
+class TradingCalendar:
+    """
+    Trading sessions over a contiguous daily calendar.
+
+    Attributes
+    ----------
+    start : datetime64[D], first calendar day
+    n_days : number of calendar days
+    sessions : int32 offsets (from ``start``) of the sessions, sorted
+    """
+
+    def __init__(self, start, n_days, sessions):
+        self.start = np.datetime64(start, "D")
+        self.n_days = int(n_days)
+        self.sessions = np.asarray(sessions, dtype=np.int32)
+        self._session_of_day = None
+
+    @classmethod
+    def from_counts(cls, start, counts):
+        """Sessions from per-calendar-day observation counts."""
+        counts = np.asarray(counts)
+        return cls(start, len(counts), np.flatnonzero(counts > 0))
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Sessions of an AvailabilityMatrix (days with any data)."""
+        return cls.from_counts(
+            matrix.start, np.bincount(matrix.days, minlength=matrix.n_days)
+        )
+
+    @classmethod
+    def from_dates(cls, dates, start=None, end=None):
+        """Sessions from observed dates (any order, repeats allowed)."""
+        days = _days(dates).ravel()
+        if (start is None or end is None) and not len(days):
+            raise ValueError("No dates to infer the calendar bounds from.")
+        start = np.datetime64(int(days.min()), "D") if start is None else to_day(start)
+        end = np.datetime64(int(days.max()), "D") if end is None else to_day(end)
+
+        n_days = int((end - start) // ONE_DAY) + 1
+        offsets = days - start.astype(np.int64)
+        offsets = offsets[(offsets >= 0) & (offsets < n_days)]
+        counts = np.bincount(offsets, minlength=n_days)
+        return cls.from_counts(start, counts)
+
+    def __repr__(self):
+        return (
+            f"TradingCalendar(start={self.start}, end={self.end}, "
+            f"sessions={self.n_sessions})"
+        )
+
+    # --------------------------------------------------
+    # Axes
+    # --------------------------------------------------
+    def __len__(self):
+        return len(self.sessions)
+
+    @property
+    def n_sessions(self) -> int:
+        return len(self.sessions)
+
+    @property
+    def end(self) -> np.datetime64:
+        return self.start + (self.n_days - 1) * ONE_DAY
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Session dates (datetime64[D])."""
+        return self.start + self.sessions.astype(np.int64) * ONE_DAY
+
+    @property
+    def holidays(self) -> np.ndarray:
+        """Inferred holidays: weekdays without a session."""
+        calendar = self.start + np.arange(self.n_days) * ONE_DAY
+        closed = ~is_weekend(calendar)
+        closed[self.sessions] = False
+        return calendar[closed]
+
+    @property
+    def session_of_day(self) -> np.ndarray:
+        """Session number of every calendar offset (-1: no session)."""
+        if self._session_of_day is None:
+            lookup = np.full(self.n_days, -1, dtype=np.int32)
+            lookup[self.sessions] = np.arange(self.n_sessions, dtype=np.int32)
+            self._session_of_day = lookup
+        return self._session_of_day
+
+    # --------------------------------------------------
+    # Conversion
+    # --------------------------------------------------
+    def offsets(self, dates) -> np.ndarray:
+        """Calendar offsets of ``dates`` from ``start``."""
+        return _days(dates) - self.start.astype(np.int64)
+
+    def to_session(self, dates, how="exact") -> np.ndarray:
+        """
+        Session numbers of ``dates``. Dates that are not sessions map
+        to -1 with ``how="exact"``, or to the next / previous session
+        (-1 past either end).
+        """
+        offsets = self.offsets(dates)
+
+        if how == "exact":
+            inside = (offsets >= 0) & (offsets < self.n_days)
+            return np.where(
+                inside,
+                self.session_of_day[np.clip(offsets, 0, self.n_days - 1)],
+                -1
+            )
+
+        if how == "next":
+            idx = np.searchsorted(self.sessions, offsets, side="left")
+            return np.where(idx < self.n_sessions, idx, -1)
+        if how == "previous":
+            return np.searchsorted(self.sessions, offsets, side="right") - 1
+
+        raise ValueError(f"Unknown how {how!r}; choose from {HOW}.")
+
+    def to_date(self, sessions) -> np.ndarray:
+        """Dates of session numbers."""
+        return self.start + self.sessions[np.asarray(sessions)].astype(np.int64) * ONE_DAY
+
+    def session_range(self, start=None, end=None):
+        """(lo, hi) session numbers covering ``start``..``end`` (inclusive)."""
+        lo = 0 if start is None else int(self.to_session(start, "next"))
+        hi = self.n_sessions if end is None else int(
+            self.to_session(end, "previous")) + 1
+        if lo < 0:
+            lo = self.n_sessions
+        return lo, max(lo, hi)
+
+    def is_session(self, dates) -> np.ndarray:
+        return self.to_session(dates) >= 0
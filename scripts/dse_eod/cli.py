@@ -0,0 +1,101 @@
+"""
+Command-Line Dispatcher
+
+``python scripts/dse.py <command> [options]`` runs one of the scripts
+through its ``main(argv)``. The command table is static: the script
+module, and with it pandas, statsmodels, scikit-learn or matplotlib,
+is imported only for the command that runs, so metadata queries start
+without loading the heavy dependencies.
+
+``tickers`` is served here directly from the availability store.
+"""
+
+import argparse
+import importlib
+import sys
+
+
+# command -> (module under scripts/, summary)
+COMMANDS = {
+    "tickers": (None, "List tickers in the availability store."),
+    "query": ("query_availability", "Query instrument availability."),
+    "build-matrix": ("build_availability_matrix",
+                     "Build the availability matrix from the dumps."),
+    "company": ("generate_company_metadata", "Generate per-ticker metadata."),
+    "coverage": ("generate_date_coverage", "Generate per-date coverage."),
+    "segments": ("generate_trading_segments",
+                 "Detect per-ticker trading segments and gaps."),
+    "reconcile": ("reconcile_versions",
+                  "Reconcile Adjusted and Unadjusted prices."),
+    "validate": ("validate_ohlcv", "Check OHLCV rows for integrity violations."),
+    "pipeline": ("run_metadata_pipeline", "Build every metadata artifact."),
+    "update": ("update_metadata", "Append new trading days."),
+    "store": ("build_columnar_store", "Build the columnar Parquet store."),
+    "panel": ("build_panel", "Build the memory-mapped price panel."),
+    "features": ("build_features", "Precompute per-ticker price features."),
+    "figures": ("generate_figures", "Render the descriptive figures."),
+    "arima-demo": ("arima_single_demo", "Rolling ARIMA demonstration (A1)."),
+    "cross-instrument": ("experiments.cross_instrument_arima",
+                         "Cross-instrument ARIMA robustness study."),
+    "coverage-vs-naive": ("experiments.coverage_vs_naive",
+                          "Coverage-aware vs naive modeling comparison."),
+    "walk-forward": ("experiments.walk_forward_arima",
+                     "Walk-forward ARIMA backtest."),
+}
+
+
+def list_tickers(argv=None):
+    from dse_eod.availability import load_availability
+    from dse_eod.company import infer_instrument_types
+
+    parser = argparse.ArgumentParser(description=COMMANDS["tickers"][1])
+    parser.add_argument("--matrix", default=None,
+                        help="Availability store or dense CSV "
+                             "(default: compact store, CSV fallback).")
+    parser.add_argument("--type", default=None, metavar="INSTRUMENT_TYPE",
+                        help="Only this instrument type (e.g. Equity).")
+    parser.add_argument("--types", action="store_true",
+                        help="Print the instrument type next to each ticker.")
+    args = parser.parse_args(argv)
+
+    try:
+        tickers = load_availability(args.matrix).tickers
+    except FileNotFoundError as exc:
+        raise SystemExit(exc)
+    types = infer_instrument_types(tickers)
+
+    if args.type:
+        keep = types == args.type
+        tickers, types = tickers[keep], types[keep]
+
+    for ticker, inst_type in zip(tickers, types):
+        print(f"{ticker}\t{inst_type}" if args.types else ticker)
+
+
+def usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = ["usage: dse <command> [options]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {summary}"
+              for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "Run 'dse <command> --help' for the options of a command."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        sys.exit(f"dse: unknown command {name!r}\n\n{usage()}")
+
+    # argparse takes the program name from argv[0]
+    sys.argv = [f"dse {name}"] + rest
+
+    module = COMMANDS[name][0]
+    if module is None:
+        return list_tickers(rest)
+    return importlib.import_module(module).main(rest)
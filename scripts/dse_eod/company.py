@@ -0,0 +1,116 @@
+"""
+Per-Ticker (Company) Metadata
+
+Listing window, version availability counts and coverage ratio for
+every instrument, computed in one pass over the stored availability
+codes instead of one pass per ticker column.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from dse_eod.availability import ADJUSTED, UNADJUSTED, BOTH
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+COLUMNS = [
+    "Ticker",
+    "Instrument_Type",
+    "First_Date",
+    "Last_Date",
+    "Calendar_Days",
+    "Days_Adjusted",
+    "Days_Unadjusted",
+    "Days_Both",
+    "Coverage_Ratio",
+]
+
+
+def infer_instrument_type(ticker: str) -> str:
+    t = ticker.upper()
+
+    if t.startswith("00"):
+        return "Index"
+    if t.startswith("TB"):
+        return "TreasuryBill"
+    if "SUKUK" in t:
+        return "Sukuk"
+    if "BOND" in t:
+        return "Bond"
+    if "MF" in t:
+        return "MutualFund"
+    return "Equity"
+
+
+def infer_instrument_types(tickers) -> np.ndarray:
+    """Vectorized ``infer_instrument_type`` (same rules, same precedence)."""
+    t = np.char.upper(np.asarray(tickers, dtype=str))
+
+    return np.select(
+        [
+            np.char.startswith(t, "00"),
+            np.char.startswith(t, "TB"),
+            np.char.find(t, "SUKUK") >= 0,
+            np.char.find(t, "BOND") >= 0,
+            np.char.find(t, "MF") >= 0,
+        ],
+        ["Index", "TreasuryBill", "Sukuk", "Bond", "MutualFund"],
+        default="Equity"
+    )
+
+
+def company_metadata(matrix) -> pd.DataFrame:
+    """
+    Per-ticker metadata for an ``AvailabilityMatrix``.
+
+    Tickers without any observation are omitted. Day offsets are sorted
+    within each ticker, so the first and last stored entries give the
+    listing window directly.
+    """
+    n_tickers = matrix.n_tickers
+    ticker_idx = matrix.ticker_index()
+    codes = matrix.codes
+
+    present = np.diff(matrix.indptr) > 0
+    lo = matrix.indptr[:-1][present]
+    hi = matrix.indptr[1:][present] - 1
+
+    first_day = matrix.days[lo].astype(np.int64)
+    last_day = matrix.days[hi].astype(np.int64)
+    calendar_days = last_day - first_day + 1
+
+    days_adjusted = np.bincount(
+        ticker_idx[(codes & ADJUSTED) > 0], minlength=n_tickers
+    )[present]
+    days_unadjusted = np.bincount(
+        ticker_idx[(codes & UNADJUSTED) > 0], minlength=n_tickers
+    )[present]
+    days_both = np.bincount(
+        ticker_idx[codes == BOTH], minlength=n_tickers
+    )[present]
+
+    tickers = matrix.tickers[present]
+    one_day = np.timedelta64(1, "D")
+
+    import pandas as pd
+
+    return pd.DataFrame({
+        "Ticker": tickers,
+        "Instrument_Type": infer_instrument_types(tickers),
+        "First_Date": np.datetime_as_string(
+            matrix.start + first_day * one_day, unit="D"
+        ),
+        "Last_Date": np.datetime_as_string(
+            matrix.start + last_day * one_day, unit="D"
+        ),
+        "Calendar_Days": calendar_days,
+        "Days_Adjusted": days_adjusted,
+        "Days_Unadjusted": days_unadjusted,
+        "Days_Both": days_both,
+        "Coverage_Ratio": np.round(days_both / calendar_days, 4),
+    }, columns=COLUMNS)
@@ -0,0 +1,368 @@
+"""
+Per-Date Coverage
+
+Computes, for every calendar day, how many instruments are available
+in each version of the data, together with the DSE weekend flag.
+
+Two implementations are kept:
+
+- ``date_coverage``: columnar; all dates at once from the stored codes
+- ``date_coverage_rowwise``: the original per-row loop, kept as the
+  reference for benchmarks and output comparisons
+
+``coverage_tables`` also rolls the same per-day counts, split by
+Instrument_Type, up into weekly, monthly and yearly coverage cubes
+(metadata/coverage_<resolution>.csv) so dashboards and figures can
+read a few hundred rows instead of scanning the daily table. Weeks
+follow the DSE trading week (Sunday to Saturday) and are labelled by
+their first day, months and years likewise.
+
+``append_cubes`` recomputes only the periods touched by newly appended
+days.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.availability import ADJUSTED, BOTH, ONE_DAY, UNADJUSTED, to_day
+from dse_eod.calendar import (  # noqa: F401 (DAY_NAMES etc. re-exported)
+    DAY_NAMES,
+    WEEKEND_DAYS,
+    is_weekend,
+    weekday_index,
+)
+from dse_eod.company import infer_instrument_types
+
+
+CUBE_PATH = "metadata/coverage_{}.csv"  # formatted with the resolution
+RESOLUTIONS = ("weekly", "monthly", "yearly")
+ALL_TYPES = "All"
+
+
+COLUMNS = [
+    "Date",
+    "DayOfWeek",
+    "IsWeekend",
+    "Available_Any",
+    "Available_Unadjusted",
+    "Available_Adjusted",
+    "Available_Both",
+    "Coverage_Ratio_Full",
+]
+
+CUBE_COLUMNS = [
+    "Period",
+    "Instrument_Type",
+    "Instruments",
+    "Calendar_Days",
+    "Trading_Days",
+    "Active_Any",
+    "Active_Both",
+    "Available_Any",
+    "Available_Unadjusted",
+    "Available_Adjusted",
+    "Available_Both",
+    "Coverage_Ratio_Full",
+]
+
+# Rows of ``coverage_counts``
+AVAILABLE = ["Available_Any", "Available_Unadjusted",
+             "Available_Adjusted", "Available_Both"]
+
+
+def coverage_counts(matrix, groups=None, n_groups=1) -> np.ndarray:
+    """
+    Available instruments per (group, day) in each version, as an int64
+    array of shape (4, n_groups, n_days) ordered like ``AVAILABLE``.
+    ``groups`` gives the group of every ticker (default: one group).
+    """
+    days = matrix.days.astype(np.int64)
+    codes = matrix.codes
+    n_days = matrix.n_days
+
+    if groups is not None:
+        groups = np.asarray(groups, dtype=np.int64)
+        days = days + groups[matrix.ticker_index()] * n_days
+
+    size = n_groups * n_days
+    return np.stack([
+        np.bincount(days, minlength=size),
+        np.bincount(days[(codes & UNADJUSTED) > 0], minlength=size),
+        np.bincount(days[(codes & ADJUSTED) > 0], minlength=size),
+        np.bincount(days[codes == BOTH], minlength=size),
+    ]).reshape(4, n_groups, n_days)
+
+
+def date_coverage(matrix, total_instruments=None, counts=None) -> pd.DataFrame:
+    """
+    Per-date coverage for an ``AvailabilityMatrix``, computed columnar.
+
+    ``total_instruments`` defaults to the matrix universe; pass the full
+    dataset universe when ``matrix`` only holds a slice of it.
+    ``counts`` reuses a ``coverage_counts`` result (any grouping).
+    """
+    n_days = matrix.n_days
+
+    if total_instruments is None:
+        total_instruments = matrix.n_tickers  # full dataset universe (constant)
+
+    if counts is None:
+        counts = coverage_counts(matrix)
+    (available_any, available_unadjusted,
+     available_adjusted, available_both) = counts.sum(axis=1)
+
+    if total_instruments > 0:
+        coverage_ratio_full = np.round(available_both / total_instruments, 4)
+    else:
+        coverage_ratio_full = np.zeros(n_days, dtype=np.int64)
+
+    dates = matrix.dates
+
+    return pd.DataFrame({
+        "Date": np.datetime_as_string(dates, unit="D"),
+        "DayOfWeek": DAY_NAMES[weekday_index(dates)],
+        "IsWeekend": is_weekend(dates),
+        "Available_Any": available_any,
+        "Available_Unadjusted": available_unadjusted,
+        "Available_Adjusted": available_adjusted,
+        "Available_Both": available_both,
+        "Coverage_Ratio_Full": coverage_ratio_full,
+    }, columns=COLUMNS)
+
+
+# ==================================================
+# Coverage Cubes
+# ==================================================
+def period_starts(dates, resolution) -> np.ndarray:
+    """First day (datetime64[D]) of the period containing each date."""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    if resolution == "weekly":
+        day = dates.astype(np.int64)
+        return (day - (day + 4) % 7).astype("datetime64[D]")  # 1970-01-04 was a Sunday
+    if resolution == "monthly":
+        return dates.astype("datetime64[M]").astype("datetime64[D]")
+    if resolution == "yearly":
+        return dates.astype("datetime64[Y]").astype("datetime64[D]")
+    raise ValueError(f"Unknown resolution {resolution!r}; use one of {RESOLUTIONS}.")
+
+
+def _active(matrix, groups, period, n_groups, n_periods, mask=None) -> np.ndarray:
+    """Distinct tickers per (group, period) among the (masked) entries."""
+    ticker = matrix.ticker_index().astype(np.int64)
+    entry_period = period[matrix.days]
+    if mask is not None:
+        ticker, entry_period = ticker[mask], entry_period[mask]
+
+    # Days are sorted within each ticker, so each ticker's periods are too
+    key = ticker * n_periods + entry_period
+    first = np.r_[True, key[1:] != key[:-1]][:len(key)]
+    return np.bincount(
+        groups[ticker[first]] * n_periods + entry_period[first],
+        minlength=n_groups * n_periods
+    ).reshape(n_groups, n_periods)
+
+
+def coverage_cubes(matrix, counts=None, types=None) -> dict:
+    """
+    Weekly, monthly and yearly coverage by Instrument_Type (CUBE_COLUMNS),
+    keyed by resolution, with an "All" row per period.
+
+    Available_* are instrument-days summed over the period, Active_*
+    distinct instruments seen in it, Trading_Days the days with any
+    instrument of the type, and Coverage_Ratio_Full the period mean of
+    the daily ratio (Available_Both / Instruments).
+    """
+    if matrix.n_days == 0:
+        return {r: pd.DataFrame(columns=CUBE_COLUMNS) for r in RESOLUTIONS}
+
+    if types is None:
+        types = infer_instrument_types(matrix.tickers)
+    names, groups = np.unique(types, return_inverse=True)
+    groups = groups.astype(np.int64)
+    if counts is None:
+        counts = coverage_counts(matrix, groups, len(names))
+
+    # Group 0 is the whole universe
+    names = np.r_[[ALL_TYPES], names]
+    groups = groups + 1
+    counts = np.concatenate([counts.sum(axis=1, keepdims=True), counts], axis=1)
+    n_groups = len(names)
+    instruments = np.bincount(groups, minlength=n_groups)
+    instruments[0] = matrix.n_tickers
+
+    cubes = {}
+    for resolution in RESOLUTIONS:
+        starts = period_starts(matrix.dates, resolution)
+        bounds = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+        period = np.cumsum(np.r_[False, starts[1:] != starts[:-1]])
+        n_periods = len(bounds)
+
+        summed = np.add.reduceat(counts, bounds, axis=2)
+        trading = np.add.reduceat(counts[0] > 0, bounds, axis=1)
+        calendar_days = np.diff(np.r_[bounds, matrix.n_days])
+
+        active = [
+            _active(matrix, groups, period, n_groups, n_periods, mask)
+            for mask in (None, matrix.codes == BOTH)
+        ]
+        for a in active:
+            a[0] = a[1:].sum(axis=0)  # types partition the universe
+
+        universe = np.repeat(instruments, n_periods).reshape(n_groups, n_periods)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = summed[3] / (universe * calendar_days)
+        ratio = np.where(universe > 0, np.round(ratio, 4), 0.0)
+
+        table = pd.DataFrame({
+            "Period": np.tile(np.datetime_as_string(starts[bounds], unit="D"),
+                              n_groups),
+            "Instrument_Type": np.repeat(names, n_periods),
+            "Instruments": universe.ravel(),
+            "Calendar_Days": np.tile(calendar_days, n_groups),
+            "Trading_Days": trading.ravel(),
+            "Active_Any": active[0].ravel(),
+            "Active_Both": active[1].ravel(),
+            **{column: summed[i].ravel() for i, column in enumerate(AVAILABLE)},
+            "Coverage_Ratio_Full": ratio.ravel(),
+        }, columns=CUBE_COLUMNS)
+
+        # Period-major, "All" first within each period
+        order = np.argsort(np.tile(np.arange(n_periods), n_groups), kind="stable")
+        cubes[resolution] = table.iloc[order].reset_index(drop=True)
+
+    return cubes
+
+
+def append_cubes(cubes, matrix, first_day) -> dict:
+    """
+    ``cubes`` (as read back from CUBE_PATH) brought up to date with
+    ``matrix`` after the days from ``first_day`` on were appended.
+
+    Only the periods containing those days are recomputed, from the
+    entries since the earliest of them began (at most the current year).
+    Earlier rows are kept; when the universe grew, their Instruments and
+    Coverage_Ratio_Full are rescaled and zero rows are added for new
+    instrument types.
+    """
+    begins = {r: period_starts([to_day(first_day)], r)[0] for r in RESOLUTIONS}
+    since = max(min(begins.values()), matrix.start)
+    fresh = coverage_cubes(matrix.tail((since - matrix.start) // ONE_DAY),
+                           types=infer_instrument_types(matrix.tickers))
+
+    updated = {}
+    for resolution in RESOLUTIONS:
+        new_rows = fresh[resolution]
+        begin = np.datetime_as_string(begins[resolution], unit="D")
+        new_rows = new_rows[new_rows["Period"] >= begin]
+
+        old_rows = cubes[resolution]
+        old_rows = old_rows[old_rows["Period"].astype(str) < begin]
+        if len(old_rows):
+            old_rows = _rescale_cube(old_rows, new_rows)
+
+        updated[resolution] = pd.concat([old_rows, new_rows], ignore_index=True)
+    return updated
+
+
+def _rescale_cube(rows, current) -> pd.DataFrame:
+    """
+    Earlier cube ``rows`` over the instrument types and universe sizes of
+    ``current`` (rows of the same cube for later periods).
+    """
+    universe = current.drop_duplicates("Instrument_Type").set_index(
+        "Instrument_Type")["Instruments"]
+    stored = rows["Instrument_Type"].drop_duplicates()
+    if universe.index.equals(pd.Index(stored)) and (
+            rows["Instruments"].to_numpy()
+            == universe.reindex(rows["Instrument_Type"]).to_numpy()).all():
+        return rows
+
+    # Every period gets a row per type, "All" first as in coverage_cubes
+    periods = rows["Period"].drop_duplicates()
+    grid = pd.MultiIndex.from_product([periods, universe.index],
+                                      names=["Period", "Instrument_Type"])
+    rows = rows.set_index(["Period", "Instrument_Type"]).reindex(grid)
+
+    calendar_days = rows["Calendar_Days"].groupby(level="Period").transform("max")
+    rows = rows.fillna(0).astype({c: np.int64 for c in CUBE_COLUMNS[2:-1]})
+    rows["Calendar_Days"] = calendar_days.astype(np.int64)
+    rows["Instruments"] = universe.reindex(
+        rows.index.get_level_values("Instrument_Type")).to_numpy()
+
+    instruments = rows["Instruments"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = rows["Available_Both"] / (instruments * rows["Calendar_Days"])
+    rows["Coverage_Ratio_Full"] = np.where(instruments > 0, np.round(ratio, 4), 0.0)
+    return rows.reset_index()[CUBE_COLUMNS]
+
+
+def coverage_tables(matrix, total_instruments=None):
+    """
+    Per-date coverage and the coverage cubes, from one grouped pass over
+    the stored codes.
+    """
+    types = infer_instrument_types(matrix.tickers)
+    names, groups = np.unique(types, return_inverse=True)
+    counts = coverage_counts(matrix, groups, len(names))
+
+    return (
+        date_coverage(matrix, total_instruments, counts=counts),
+        coverage_cubes(matrix, counts=counts, types=types),
+    )
+
+
+def read_cube(resolution, instrument_type=None, path=CUBE_PATH) -> pd.DataFrame:
+    """
+    Load one coverage cube (``path`` is formatted with the resolution),
+    optionally only the rows of ``instrument_type``.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution {resolution!r}; use one of {RESOLUTIONS}.")
+
+    cube = pd.read_csv(path.format(resolution), parse_dates=["Period"])
+    if instrument_type is not None:
+        cube = cube[cube["Instrument_Type"] == instrument_type].reset_index(drop=True)
+    return cube
+
+
+# ==================================================
+# Reference Implementation
+# ==================================================
+def date_coverage_rowwise(df) -> pd.DataFrame:
+    """
+    Reference implementation: one pass per row of the dense matrix frame
+    (``Date`` column followed by one column per ticker).
+    """
+    tickers = df.columns[1:]  # exclude Date
+    total_instruments = len(tickers)  # full dataset universe (constant)
+
+    records = []
+
+    for _, row in df.iterrows():
+        values = row[tickers]
+
+        available_any = (values > 0).sum()
+        available_unadjusted = values.isin([2, 3]).sum()
+        available_adjusted = values.isin([1, 3]).sum()
+        available_both = (values == 3).sum()
+
+        coverage_ratio_full = (
+            available_both / total_instruments
+            if total_instruments > 0 else 0
+        )
+
+        day_name = row["Date"].strftime("%A")
+        is_weekend = day_name in WEEKEND_DAYS
+
+        records.append({
+            "Date": row["Date"].date(),
+            "DayOfWeek": day_name,
+            "IsWeekend": is_weekend,
+            "Available_Any": int(available_any),
+            "Available_Unadjusted": int(available_unadjusted),
+            "Available_Adjusted": int(available_adjusted),
+            "Available_Both": int(available_both),
+            "Coverage_Ratio_Full": round(coverage_ratio_full, 4)
+        })
+
+    return pd.DataFrame(records)
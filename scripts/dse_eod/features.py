@@ -0,0 +1,360 @@
+"""
+Precomputed Price Features
+
+Derives per-ticker features for a whole universe from the memory-mapped
+price panel (dse_eod.panel) in one pass over its columns, and keeps
+them on disk next to it:
+
+    data_store/features/<Universe>/features.json
+    data_store/features/<Universe>/<feature>.f8     (dates x tickers)
+    data_store/features/<Universe>/summary.csv      (one row per ticker)
+
+Features (rows are the panel's; NaN where the ticker has no price):
+
+- log_close:        log Close
+- log_return:       log Close minus the log Close of the ticker's
+                    previous observed row (what ``np.log(prices).diff()``
+                    gives on the observed prices)
+- volatility_<w>:   standard deviation of the log returns over the last
+                    ``w`` rows (at least w/2 returns)
+- volume_mean_<w>:  mean Volume over the last ``w`` rows
+
+The cache is a build task (dse_eod.build): its inputs are the panel
+files and the files the panel was built from (store or CSV, see
+``store.source_files``). ``open_features`` rebuilds it when any of
+them, the feature version or the windows changed, and rebuilds the
+panel first (same layout) when the source data changed.
+
+Experiments read log prices and returns from here when a cache exists
+(``shared_features``) and compute them from the prices otherwise.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from dse_eod import build, store
+from dse_eod.availability import MATRIX_PATH, AvailabilityMatrix
+from dse_eod.panel import PANEL_DIR, Panel, build_panel, panel_path
+from dse_eod.profiling import stage
+
+
+# ==================================================
+# Configuration
+# ==================================================
+FEATURES_DIR = "data_store/features"
+
+# Bump when the definition of a feature changes
+FEATURES_VERSION = 1
+
+WINDOWS = (20,)
+
+SUMMARY_COLUMNS = [
+    "Ticker",
+    "Observations",
+    "First_Date",
+    "Last_Date",
+    "Return_Mean",
+    "Return_STD",
+    "Volume_Total",
+    "Volume_Mean",
+    "Zero_Volume_Rows",
+]
+
+
+def features_path(universe, features_dir=FEATURES_DIR) -> str:
+    return os.path.join(features_dir, universe)
+
+
+def feature_names(windows=WINDOWS) -> list:
+    names = ["log_close", "log_return"]
+    names += [f"volatility_{w}" for w in windows]
+    names += [f"volume_mean_{w}" for w in windows]
+    return names
+
+
+# ==================================================
+# Computation
+# ==================================================
+def _previous_observed(valid) -> np.ndarray:
+    """Row of the previous observed value per cell (-1 if none)."""
+    rows = np.where(valid, np.arange(len(valid))[:, None], -1)
+    latest = np.maximum.accumulate(rows, axis=0)
+    previous = np.full(valid.shape, -1, dtype=np.int64)
+    previous[1:] = latest[:-1]
+    return previous
+
+
+def compute_features(close, volume, valid, windows=WINDOWS) -> dict:
+    """Feature blocks (rows x tickers) for blocks of the panel."""
+    log_close = np.where(valid, np.log(np.where(valid, close, 1.0)), np.nan)
+
+    previous = _previous_observed(valid)
+    has_previous = valid & (previous >= 0)
+    log_return = np.full(close.shape, np.nan)
+    rows, cols = np.nonzero(has_previous)
+    log_return[rows, cols] = log_close[rows, cols] - log_close[previous[rows, cols], cols]
+
+    volume = np.where(valid, volume, np.nan)
+    returns = pd.DataFrame(log_return)
+    volumes = pd.DataFrame(volume)
+
+    features = {"log_close": log_close, "log_return": log_return}
+    for w in windows:
+        features[f"volatility_{w}"] = (
+            returns.rolling(w, min_periods=max(2, w // 2)).std().to_numpy()
+        )
+    for w in windows:
+        features[f"volume_mean_{w}"] = (
+            volumes.rolling(w, min_periods=1).mean().to_numpy()
+        )
+    return features
+
+
+def summarize_block(tickers, dates, log_return, volume, valid) -> pd.DataFrame:
+    """Per-ticker summary rows (SUMMARY_COLUMNS) of one block."""
+    observations = valid.sum(axis=0)
+    seen = observations > 0
+    first = np.argmax(valid, axis=0)
+    last = len(valid) - 1 - np.argmax(valid[::-1], axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n_returns = (~np.isnan(log_return)).sum(axis=0)
+        return_mean = np.nansum(log_return, axis=0) / n_returns
+        deviation = np.where(np.isnan(log_return), 0.0, log_return - return_mean)
+        return_std = np.sqrt((deviation ** 2).sum(axis=0) / (n_returns - 1))
+        volume = np.where(valid, volume, np.nan)
+        volume_total = np.nansum(volume, axis=0)
+        volume_mean = volume_total / observations
+
+    return pd.DataFrame({
+        "Ticker": tickers,
+        "Observations": observations,
+        "First_Date": np.where(seen, dates[first], np.datetime64("NaT")),
+        "Last_Date": np.where(seen, dates[last], np.datetime64("NaT")),
+        "Return_Mean": np.where(n_returns > 0, return_mean, np.nan),
+        "Return_STD": np.where(n_returns > 1, return_std, np.nan),
+        "Volume_Total": volume_total,
+        "Volume_Mean": np.where(seen, volume_mean, np.nan),
+        "Zero_Volume_Rows": (valid & (volume == 0)).sum(axis=0),
+    }, columns=SUMMARY_COLUMNS)
+
+
+def build_features(universe="Unadjusted", panel_dir=PANEL_DIR,
+                   features_dir=FEATURES_DIR, windows=WINDOWS,
+                   batch_size=256) -> "Features":
+    """
+    Compute every feature of ``universe`` from its panel. Tickers are
+    processed in column batches written straight into the memmap files.
+    """
+    panel = Panel.open(universe, panel_dir)
+    if not {"Close", "Volume"} <= set(panel.fields):
+        raise ValueError(f"The {universe} panel needs Close and Volume fields.")
+
+    path = features_path(universe, features_dir)
+    os.makedirs(path, exist_ok=True)
+
+    names = feature_names(windows)
+    header = {
+        "format_version": FEATURES_VERSION,
+        "universe": universe,
+        "panel": panel.path,
+        "windows": list(windows),
+        "fields": {name: {"file": f"{name}.f8", "dtype": "<f8"} for name in names},
+        "summary": "summary.csv",
+    }
+
+    planes = {
+        name: np.memmap(os.path.join(path, spec["file"]), dtype=spec["dtype"],
+                        mode="w+", shape=panel.shape, order="F")
+        for name, spec in header["fields"].items()
+    }
+
+    dates = panel.dates
+    summaries = []
+    with stage("reduce", output="features", universe=universe) as record:
+        for lo in range(0, len(panel.tickers), batch_size):
+            hi = min(lo + batch_size, len(panel.tickers))
+            close = np.asarray(panel.field("Close")[:, lo:hi], dtype=float)
+            volume = np.asarray(panel.field("Volume")[:, lo:hi], dtype=float)
+            valid = panel.mask[:, lo:hi].astype(bool) & ~np.isnan(close)
+
+            block = compute_features(close, volume, valid, windows)
+            for name, values in block.items():
+                planes[name][:, lo:hi] = values
+
+            summaries.append(summarize_block(
+                panel.tickers[lo:hi], dates, block["log_return"], volume, valid
+            ))
+        record.rows = panel.shape[0] * panel.shape[1]
+
+    for plane in planes.values():
+        plane.flush()
+    del planes
+
+    summary = (pd.concat(summaries, ignore_index=True) if summaries
+               else pd.DataFrame(columns=SUMMARY_COLUMNS))
+    summary.to_csv(os.path.join(path, header["summary"]), index=False)
+
+    with open(os.path.join(path, "features.json"), "w") as f:
+        json.dump(header, f, indent=2)
+
+    return Features(path)
+
+
+# ==================================================
+# Cache
+# ==================================================
+def _panel_files(panel) -> list:
+    names = ["panel.json", panel.header["mask"]["file"]]
+    names += [spec["file"] for spec in panel.header["fields"].values()]
+    if "sessions" in panel.header:
+        names.append(panel.header["sessions"])
+    return [os.path.join(panel.path, name) for name in names]
+
+
+def _tasks(universe, panel, features_dir, windows, store_dir, csv_dir):
+    path = features_path(universe, features_dir)
+    panel_task = build.Task(
+        name="panel",
+        inputs=store.source_files(universe, store_dir, csv_dir),
+        outputs=_panel_files(panel),
+    )
+    features_task = build.Task(
+        name="features",
+        inputs=_panel_files(panel),
+        outputs=[os.path.join(path, "features.json"),
+                 os.path.join(path, "summary.csv")],
+        params={"version": FEATURES_VERSION, "windows": list(windows)},
+    )
+    return panel_task, features_task
+
+
+def _rebuild_panel(panel, panel_dir, store_dir, csv_dir) -> Panel:
+    """Rebuild ``panel`` from the current sources with its previous layout."""
+    matrix = (AvailabilityMatrix.load(MATRIX_PATH)
+              if os.path.exists(MATRIX_PATH) else None)
+    dtype = next(iter(panel.header["fields"].values()))["dtype"]
+    return build_panel(
+        universe=panel.universe, fields=panel.fields, matrix=matrix,
+        panel_dir=panel_dir, dtype=dtype, store_dir=store_dir,
+        csv_dir=csv_dir, calendar=panel.calendar
+    )
+
+
+def open_features(universe="Unadjusted", panel_dir=PANEL_DIR,
+                  features_dir=FEATURES_DIR, windows=WINDOWS,
+                  store_dir=store.STORE_DIR, csv_dir=None, refresh=True):
+    """
+    The feature cache of ``universe``, or None when no panel has been
+    built. With ``refresh`` a stale cache (or panel) is rebuilt first;
+    worker processes pass ``refresh=False`` and read what is there.
+    """
+    if not os.path.exists(os.path.join(panel_path(universe, panel_dir), "panel.json")):
+        return None
+
+    path = features_path(universe, features_dir)
+    if not refresh:
+        exists = os.path.exists(os.path.join(path, "features.json"))
+        return Features(path) if exists else None
+
+    state_path = os.path.join(path, "state.json")
+    state = build.read_state(state_path)
+    panel = Panel.open(universe, panel_dir)
+    panel_task, features_task = _tasks(
+        universe, panel, features_dir, windows, store_dir, csv_dir
+    )
+
+    # First run: judge the panel by the sources recorded when it was built
+    if "panel" not in state:
+        state["panel"] = {"inputs": panel.sources, "params": panel_task.params}
+    if build.is_stale(panel_task, state):
+        panel = _rebuild_panel(panel, panel_dir, store_dir, csv_dir)
+        panel_task, features_task = _tasks(
+            universe, panel, features_dir, windows, store_dir, csv_dir
+        )
+
+    if build.is_stale(features_task, state):
+        build_features(universe, panel_dir, features_dir, windows)
+
+    build.record(panel_task, state)
+    build.record(features_task, state)
+    build.write_state(state, state_path)
+    return Features(path)
+
+
+_shared = {}
+
+
+def shared_features(universe="Unadjusted", refresh=False):
+    """
+    ``open_features`` once per process and universe (None without a
+    panel). Scripts call it with ``refresh=True`` before starting worker
+    processes, which then read the same cache.
+    """
+    if refresh or universe not in _shared:
+        _shared[universe] = open_features(universe, refresh=refresh)
+    return _shared[universe]
+
+
+class Features:
+    """Read-only view of a built feature cache."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "features.json")) as f:
+            header = json.load(f)
+
+        if header["format_version"] != FEATURES_VERSION:
+            raise ValueError(f"Unsupported features version in {path}.")
+
+        self.path = path
+        self.header = header
+        self.panel = Panel(header["panel"])
+        self._maps = {}
+        self._summary = None
+
+    @property
+    def names(self):
+        return list(self.header["fields"])
+
+    @property
+    def tickers(self):
+        return self.panel.tickers
+
+    def __contains__(self, ticker):
+        i = int(np.searchsorted(self.tickers, ticker))
+        return i < len(self.tickers) and self.tickers[i] == ticker
+
+    def field(self, name) -> np.memmap:
+        """Full (dates x tickers) matrix of feature ``name``."""
+        if name not in self._maps:
+            spec = self.header["fields"][name]
+            self._maps[name] = np.memmap(
+                os.path.join(self.path, spec["file"]), dtype=spec["dtype"],
+                mode="r", shape=self.panel.shape, order="F"
+            )
+        return self._maps[name]
+
+    def series(self, ticker, name="log_return") -> pd.Series:
+        """Feature ``name`` of one ticker on the rows where it is defined."""
+        values = self.field(name)[:, self.panel.ticker_position(ticker)]
+        keep = ~np.isnan(values)
+        return pd.Series(
+            np.array(values[keep]),
+            index=pd.DatetimeIndex(
+                self.panel.dates[keep].astype("datetime64[ns]"), name="Date"
+            ),
+            name=name
+        )
+
+    @property
+    def summary(self) -> pd.DataFrame:
+        """Per-ticker summary (SUMMARY_COLUMNS)."""
+        if self._summary is None:
+            self._summary = pd.read_csv(
+                os.path.join(self.path, self.header["summary"]),
+                parse_dates=["First_Date", "Last_Date"]
+            )
+        return self._summary
@@ -0,0 +1,122 @@
+"""
+On-Disk Fit Cache
+
+Stores the outcome of an ARIMA fit (parameters, AIC/BIC and forecast)
+under a content-addressed key: the SHA-256 of the training series
+bytes, the model order, the forecast horizon, the backend and the
+version of the library doing the fit. Re-running an experiment on
+unchanged data therefore skips the fits, while any change to the
+series, the split or the library produces new keys.
+
+Entries are small JSON files (floats round-trip exactly). A hit
+refreshes the file's mtime, and ``evict`` removes the least recently
+used entries until the cache fits in ``max_bytes``.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+CACHE_DIR = ".cache/fits"
+MAX_BYTES = 256 * 1024 * 1024
+CACHE_VERSION = 1  # bump when a backend's results change without a version change
+
+
+def backend_version(backend) -> str:
+    """Version string of the library behind ``backend``."""
+    if backend == "statsmodels":
+        import statsmodels
+        return f"statsmodels-{statsmodels.__version__}"
+    return f"numpy-{np.__version__}"
+
+
+def fit_key(train, order, steps, backend) -> str:
+    """Content hash identifying one fit."""
+    values = np.ascontiguousarray(np.asarray(train, dtype=np.float64))
+
+    h = hashlib.sha256()
+    h.update(values.tobytes())
+    h.update(json.dumps({
+        "order": [int(o) for o in order],
+        "steps": int(steps),
+        "backend": backend_version(backend),
+        "version": CACHE_VERSION,
+    }, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+class FitCache:
+    """Directory of cached fits, one JSON file per key."""
+
+    def __init__(self, path=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """The cached entry (dict) for ``key``, or None."""
+        path = self._file(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """Store ``entry`` (JSON-serialisable) under ``key``."""
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write-then-rename: parallel workers never see partial files
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def entries(self):
+        """(mtime, size, path) of every cached entry."""
+        found = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((st.st_mtime, st.st_size, path))
+        return found
+
+    def evict(self, max_bytes=None) -> int:
+        """Drop least recently used entries above the size bound."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        found = sorted(self.entries())
+        total = sum(size for _, size, _ in found)
+
+        removed = 0
+        for _, size, path in found:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        return self.evict(max_bytes=0)
@@ -0,0 +1,242 @@
+"""
+Incremental Metadata Updates
+
+Appends new trading days to the artifacts produced by the metadata
+pipeline instead of rebuilding them from the full history:
+
+- the availability store is extended past its watermark
+- only tickers seen in the new rows are updated in company_metadata.csv
+- rows for the new dates are appended to date_coverage_summary.csv
+- the query index gains the by-date entries of the new days only
+- trading_segments.csv only changes from the last segment of the
+  tickers seen in the new rows
+- the coverage cubes are recomputed for the periods holding the new
+  days, from the entries since the earliest of them began (at most the
+  current year)
+
+The compact store and the index are still loaded and written whole:
+each is a single compressed file every reader opens directly, and
+writing it is a linear copy, not a recomputation. Outputs whose inputs
+did not change (no new rows, only a longer calendar) are not rewritten.
+
+Coverage_Ratio_Full is relative to the full universe, so when new
+tickers appear that column is rescaled from Available_Both (one
+vectorized division over the existing rows, no matrix rescan).
+
+Every artifact is first written next to its target (``<name>.partial``)
+and only moved into place once all of them, the watermark included,
+are complete. A failed update leaves the previous artifacts untouched
+and can simply be rerun.
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.availability import AvailabilityMatrix, ONE_DAY, to_day
+from dse_eod.company import company_metadata
+from dse_eod.coverage import (
+    CUBE_PATH,
+    RESOLUTIONS,
+    append_cubes,
+    date_coverage,
+)
+from dse_eod.ingest import (
+    CHUNK_SIZE,
+    DATE_FORMAT,
+    availability_from_pairs,
+    read_pairs,
+)
+from dse_eod.pipeline import (
+    ADJUSTED_SOURCE,
+    COMPANY_METADATA_PATH,
+    DATE_COVERAGE_PATH,
+    STATE_PATH,
+    UNADJUSTED_SOURCE,
+    read_state,
+    write_state,
+)
+from dse_eod.profiling import stage
+from dse_eod.query import INDEX_PATH, AvailabilityIndex
+from dse_eod.segments import SEGMENTS_PATH, append_segments, trading_segments
+
+
+DAY_COLUMNS = ["Days_Adjusted", "Days_Unadjusted", "Days_Both"]
+
+
+def update_company_metadata(company, delta) -> pd.DataFrame:
+    """Merge the metadata of ``delta`` (new days only) into ``company``."""
+    delta_meta = company_metadata(delta).set_index("Ticker")
+    company = company.set_index("Ticker")
+
+    seen = delta_meta.index.isin(company.index)
+    changed = delta_meta.index[seen]
+
+    if len(changed):
+        upd = delta_meta.loc[changed]
+
+        first = pd.to_datetime(company.loc[changed, "First_Date"])
+        last = pd.to_datetime(upd["Last_Date"])
+        calendar_days = (last - first).dt.days + 1
+
+        company.loc[changed, "Last_Date"] = upd["Last_Date"]
+        company.loc[changed, "Calendar_Days"] = calendar_days
+        for column in DAY_COLUMNS:
+            company.loc[changed, column] += upd[column]
+        company.loc[changed, "Coverage_Ratio"] = np.round(
+            company.loc[changed, "Days_Both"] / calendar_days, 4
+        )
+
+    return (
+        pd.concat([company, delta_meta[~seen]])
+        .sort_index()
+        .reset_index()
+    )
+
+
+def update_date_coverage(path, delta, total_instruments, universe_changed,
+                         output=None):
+    """
+    Append coverage rows for the new dates to the summary at ``path``,
+    writing the result to ``output`` (default: in place).
+    """
+    new_rows = date_coverage(delta, total_instruments=total_instruments)
+    output = output or path
+
+    if not universe_changed:
+        if output != path:
+            shutil.copyfile(path, output)
+        new_rows.to_csv(output, mode="a", header=False, index=False)
+        return
+
+    coverage = pd.read_csv(path)
+    coverage["Coverage_Ratio_Full"] = np.round(
+        coverage["Available_Both"] / total_instruments, 4
+    )
+    pd.concat([coverage, new_rows]).to_csv(output, index=False)
+
+
+def partial_path(path) -> str:
+    """Staging sibling of ``path``, keeping the extension (np.savez needs it)."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.partial{ext}"
+
+
+def update(unadjusted_path=UNADJUSTED_SOURCE,
+           adjusted_path=ADJUSTED_SOURCE,
+           end=None,
+           state_path=STATE_PATH,
+           company_path=COMPANY_METADATA_PATH,
+           coverage_path=DATE_COVERAGE_PATH,
+           cube_path=CUBE_PATH,
+           chunksize=CHUNK_SIZE,
+           date_format=DATE_FORMAT,
+           index_path=INDEX_PATH,
+           segments_path=SEGMENTS_PATH) -> dict:
+    """
+    Apply the rows in the two source files that fall after the watermark.
+
+    Rows on or before the watermark are ignored (a full pipeline run is
+    needed to change history). ``end`` extends the calendar past the last
+    new date, e.g. to cover trailing non-trading days. Returns a summary
+    of the update.
+    """
+    state = read_state(state_path)
+    matrix = AvailabilityMatrix.load(state["matrix_path"])
+    watermark = matrix.end
+
+    unadjusted, adjusted = (
+        read_pairs(path, chunksize, date_format, after=watermark)
+        for path in (unadjusted_path, adjusted_path)
+    )
+
+    candidates = [
+        pairs.end for pairs in (unadjusted, adjusted)
+        if pairs.end is not None
+    ]
+    if end is not None:
+        candidates.append(to_day(end))
+    new_end = max(candidates, default=None)
+
+    summary = {
+        "previous_watermark": str(watermark),
+        "ignored_rows": unadjusted.skipped + adjusted.skipped,
+        "new_rows": unadjusted.rows + adjusted.rows,
+    }
+
+    if new_end is None or to_day(new_end) <= watermark:
+        summary["watermark"] = str(watermark)
+        return summary
+
+    delta = availability_from_pairs(
+        adjusted=adjusted,
+        unadjusted=unadjusted,
+        start=watermark + ONE_DAY,
+        end=new_end
+    )
+    merged = matrix.append(delta)
+
+    with stage("reduce", output="availability_index", rows=delta.nnz):
+        try:
+            index = AvailabilityIndex.load(matrix, index_path).append(delta, merged)
+        except (OSError, ValueError, KeyError):
+            index = AvailabilityIndex.from_matrix(merged)
+
+    # -----------------------------
+    # Stage every changed artifact; the watermark (state) goes last
+    # -----------------------------
+    cubes = [cube_path.format(r) for r in RESOLUTIONS]
+    targets = [coverage_path] + cubes
+    if delta.nnz:
+        targets += [company_path, segments_path]
+    targets += [state["matrix_path"], index_path, state_path]
+    staged = {path: partial_path(path) for path in targets}
+
+    try:
+        if delta.nnz:
+            with stage("reduce", output="company_metadata", rows=delta.nnz):
+                company = update_company_metadata(pd.read_csv(company_path), delta)
+                company.to_csv(staged[company_path], index=False)
+
+            with stage("reduce", output="trading_segments", rows=delta.nnz):
+                segments_table = (
+                    append_segments(pd.read_csv(segments_path), delta, index.calendar)
+                    if os.path.exists(segments_path)
+                    else trading_segments(merged, calendar=index.calendar)
+                )
+                segments_table.to_csv(staged[segments_path], index=False)
+
+        with stage("reduce", output="date_coverage", rows=delta.nnz):
+            update_date_coverage(
+                coverage_path, delta, merged.n_tickers,
+                universe_changed=merged.n_tickers != matrix.n_tickers,
+                output=staged[coverage_path]
+            )
+
+        with stage("reduce", output="coverage_cubes", rows=delta.nnz):
+            stored = {r: pd.read_csv(path) for r, path in zip(RESOLUTIONS, cubes)}
+            for resolution, cube in append_cubes(stored, merged, delta.start).items():
+                cube.to_csv(staged[cube_path.format(resolution)], index=False)
+
+        with stage("save", output="availability", rows=merged.nnz):
+            merged.save(staged[state["matrix_path"]])
+            index.save(staged[index_path])
+            write_state(merged, state["matrix_path"], staged[state_path])
+    except BaseException:
+        for path in staged.values():
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    for path in targets:
+        os.replace(staged[path], path)
+
+    summary.update({
+        "watermark": str(merged.end),
+        "new_dates": delta.n_days,
+        "updated_tickers": int((np.diff(delta.indptr) > 0).sum()),
+        "new_tickers": merged.n_tickers - matrix.n_tickers,
+    })
+    return summary
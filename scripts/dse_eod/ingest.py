@@ -0,0 +1,254 @@
+"""
+Streaming Ingest of the AmarStock Dumps
+
+Availability only needs the distinct (Date, Ticker) pairs of each
+dump. ``read_pairs`` streams a dump in fixed-size chunks and keeps
+nothing but those pairs:
+
+- only the Date and Ticker columns are parsed, both as categoricals,
+  so each distinct string is decoded once per chunk
+- dates use a fixed format (ISO 8601 by default) instead of per-value
+  inference
+- tickers are coded to integers as they appear, and every chunk is
+  reduced to unique int64 (ticker, day) keys before being kept
+
+Peak memory is one chunk plus the distinct pairs, whatever the size of
+the dump.
+
+``read_closes`` streams the Close column along with the pairs, for
+the price reconciliation of the two versions (dse_eod.reconcile).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.availability import (
+    ADJUSTED,
+    AvailabilityMatrix,
+    ONE_DAY,
+    UNADJUSTED,
+    to_day,
+)
+from dse_eod.profiling import stage
+
+
+CHUNK_SIZE = 500_000
+DATE_FORMAT = "ISO8601"
+USECOLS = ["Date", "Ticker"]
+DTYPES = {"Date": "category", "Ticker": "category"}
+
+# Merge the per-chunk keys once this many are pending
+MERGE_EVERY = 4_000_000
+
+_DAY_BIAS = 1 << 31  # keeps the day part of a key non-negative
+
+
+def _distinct(keys) -> np.ndarray:
+    """Sorted distinct values (sort + mask; cheaper than np.unique here)."""
+    keys = np.sort(keys)
+    if len(keys):
+        keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+    return keys
+
+
+@dataclass
+class SourcePairs:
+    """Distinct (ticker, day) pairs of one dump."""
+    tickers: np.ndarray     # sorted unique tickers
+    ticker_idx: np.ndarray  # int64 positions into ``tickers``
+    days: np.ndarray        # datetime64[D]
+    rows: int               # rows kept (after the ``after`` filter)
+    skipped: int            # rows on or before ``after``
+
+    @property
+    def end(self):
+        """Last day present (None when empty)."""
+        return self.days.max() if len(self.days) else None
+
+
+def _chunk_days(dates, date_format) -> np.ndarray:
+    """Epoch day numbers of a categorical Date column."""
+    categories = pd.to_datetime(dates.cat.categories, format=date_format)
+    category_days = categories.to_numpy().astype("datetime64[D]").astype(np.int64)
+    return category_days[dates.cat.codes.to_numpy()]
+
+
+def read_pairs(path, chunksize=CHUNK_SIZE, date_format=DATE_FORMAT,
+               after=None) -> SourcePairs:
+    """
+    Distinct (Ticker, Date) pairs of a dump, read in chunks.
+
+    ``after`` (a day) drops rows on or before it; they are counted in
+    ``skipped``. Dates carrying a time of day are truncated to the day.
+    """
+    with stage("parse", source=path, chunksize=chunksize) as record:
+        pairs = _read_pairs(path, chunksize, date_format, after)
+        record.rows = pairs.rows + pairs.skipped
+        record.add(pairs=len(pairs.days))
+    return pairs
+
+
+def _read_pairs(path, chunksize, date_format, after) -> SourcePairs:
+    after = None if after is None else to_day(after).astype(np.int64)
+
+    ticker_ids = {}
+    pending, merged = [], np.empty(0, dtype=np.int64)
+    n_pending = rows = skipped = 0
+
+    reader = pd.read_csv(
+        path,
+        usecols=USECOLS,
+        dtype=DTYPES,
+        na_filter=False,
+        chunksize=chunksize
+    )
+
+    for chunk in reader:
+        days = _chunk_days(chunk["Date"], date_format)
+
+        tickers = chunk["Ticker"]
+        local = tickers.cat.categories.astype(str)
+        to_global = np.array(
+            [ticker_ids.setdefault(t, len(ticker_ids)) for t in local],
+            dtype=np.int64
+        )
+        ids = to_global[tickers.cat.codes.to_numpy()]
+
+        if after is not None:
+            keep = days > after
+            skipped += int((~keep).sum())
+            days, ids = days[keep], ids[keep]
+        rows += len(days)
+
+        pending.append(_distinct((ids << 32) | (days + _DAY_BIAS)))
+        n_pending += len(pending[-1])
+
+        if n_pending >= MERGE_EVERY:
+            merged = _distinct(np.concatenate([merged] + pending))
+            pending, n_pending = [], 0
+
+    keys = _distinct(np.concatenate([merged] + pending))
+    ids = keys >> 32
+    days = (keys & 0xFFFFFFFF) - _DAY_BIAS
+
+    # Only tickers that still have rows after the ``after`` filter
+    names = np.array(list(ticker_ids), dtype=object)
+    used = np.unique(ids)
+    tickers = names[used].astype(str)
+    order = np.argsort(tickers, kind="stable")
+
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[used[order]] = np.arange(len(used))
+
+    return SourcePairs(
+        tickers=tickers[order],
+        ticker_idx=rank[ids],
+        days=days.astype("datetime64[D]"),
+        rows=rows,
+        skipped=skipped
+    )
+
+
+@dataclass
+class SourceCloses:
+    """Close of every (ticker, day) row of one dump, sorted by both."""
+    tickers: np.ndarray     # sorted unique tickers
+    ticker_idx: np.ndarray  # int64 positions into ``tickers``
+    days: np.ndarray        # datetime64[D]
+    close: np.ndarray       # float64 (NaN where empty)
+    duplicates: int         # repeated (ticker, day) rows dropped (first kept)
+    incomplete: int         # rows without a Ticker or Date, dropped
+
+
+def read_closes(path, chunksize=CHUNK_SIZE, date_format=DATE_FORMAT) -> SourceCloses:
+    """Date, Ticker and Close of every row of a dump, read in chunks."""
+    with stage("parse", source=path, chunksize=chunksize, column="Close") as record:
+        closes = _read_closes(path, chunksize, date_format)
+        record.rows = len(closes.close) + closes.duplicates + closes.incomplete
+    return closes
+
+
+def _read_closes(path, chunksize, date_format) -> SourceCloses:
+    ticker_ids = {}
+    id_parts, day_parts, close_parts = [], [], []
+    incomplete = 0
+
+    reader = pd.read_csv(
+        path,
+        usecols=USECOLS + ["Close"],
+        dtype=dict(DTYPES, Close="float64"),
+        chunksize=chunksize
+    )
+
+    for chunk in reader:
+        tickers, dates = chunk["Ticker"], chunk["Date"]
+        codes = tickers.cat.codes.to_numpy()
+
+        # An empty Ticker or Date has code -1, which would index the
+        # last category; such rows cannot be matched across versions
+        complete = (codes >= 0) & (dates.cat.codes.to_numpy() >= 0)
+        incomplete += int((~complete).sum())
+
+        day_parts.append(_chunk_days(dates[complete], date_format))
+
+        local = tickers.cat.categories.astype(str)
+        to_global = np.array(
+            [ticker_ids.setdefault(t, len(ticker_ids)) for t in local],
+            dtype=np.int64
+        )
+        id_parts.append(to_global[codes[complete]])
+        close_parts.append(chunk["Close"].to_numpy()[complete])
+
+    names = np.array(list(ticker_ids), dtype=str)
+    order = np.argsort(names, kind="stable")
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[order] = np.arange(len(names))
+
+    ids = rank[np.concatenate(id_parts or [np.empty(0, dtype=np.int64)])]
+    days = np.concatenate(day_parts or [np.empty(0, dtype=np.int64)])
+    close = np.concatenate(close_parts or [np.empty(0)])
+
+    keys = (ids << 32) | (days + _DAY_BIAS)
+    by_key = np.argsort(keys, kind="stable")
+    keys = keys[by_key]
+    first = np.r_[True, keys[1:] != keys[:-1]] if len(keys) else np.empty(0, bool)
+
+    return SourceCloses(
+        tickers=names[order],
+        ticker_idx=ids[by_key][first],
+        days=days[by_key][first].astype("datetime64[D]"),
+        close=close[by_key][first],
+        duplicates=int((~first).sum()),
+        incomplete=incomplete
+    )
+
+
+def availability_from_pairs(adjusted, unadjusted, start, end) -> AvailabilityMatrix:
+    """Availability matrix over ``start``..``end`` from two SourcePairs."""
+    with stage("build") as record:
+        matrix = _availability_from_pairs(adjusted, unadjusted, start, end)
+        record.rows = matrix.nnz
+    return matrix
+
+
+def _availability_from_pairs(adjusted, unadjusted, start, end) -> AvailabilityMatrix:
+    start = to_day(start)
+    n_days = int((to_day(end) - start) // ONE_DAY) + 1
+
+    tickers = np.union1d(adjusted.tickers, unadjusted.tickers)
+
+    ticker_parts, day_parts, flag_parts = [], [], []
+    for pairs, flag in ((adjusted, ADJUSTED), (unadjusted, UNADJUSTED)):
+        remap = np.searchsorted(tickers, pairs.tickers)
+        ticker_parts.append(remap[pairs.ticker_idx])
+        day_parts.append((pairs.days - start) // ONE_DAY)
+        flag_parts.append(np.full(len(pairs.days), flag, dtype=np.uint8))
+
+    return AvailabilityMatrix.from_codes(
+        np.concatenate(ticker_parts),
+        np.concatenate(day_parts),
+        np.concatenate(flag_parts),
+        tickers, start, n_days
+    )
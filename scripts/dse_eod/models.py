@@ -0,0 +1,204 @@
+"""
+ARIMA Fitting Backends
+
+Common interface used by the experiments to fit an ARIMA model on a
+training series and forecast the test horizon:
+
+- "statsmodels": ``statsmodels.tsa.arima.model.ARIMA`` (exact MLE)
+- "numpy":       the batched ARMA(1,1) estimator in ``dse_eod.arma``
+                 (orders (1,0,1) and (1,1,1) only)
+
+Passing a ``dse_eod.fit_cache.FitCache`` returns cached results for
+fits that were already done on the same series, order and horizon.
+
+``predict_one_step`` / ``predict_one_step_many`` run a fitted model
+over later observations with its parameters held fixed (one filter
+pass, no refit), for one-step-ahead evaluation without per-step fits.
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+from dse_eod.fit_cache import fit_key
+from dse_eod.profiling import stage
+
+
+BACKENDS = ("statsmodels", "numpy")
+
+
+@dataclass
+class FitSummary:
+    params: dict
+    aic: float
+    bic: float
+    forecast: np.ndarray
+    backend: str
+
+    def to_entry(self) -> dict:
+        return {
+            "params": self.params,
+            "aic": self.aic,
+            "bic": self.bic,
+            "forecast": self.forecast.tolist(),
+            "backend": self.backend,
+        }
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(
+            params=entry["params"],
+            aic=entry["aic"],
+            bic=entry["bic"],
+            forecast=np.asarray(entry["forecast"], dtype=float),
+            backend=entry["backend"]
+        )
+
+
+def _arima():
+    """
+    statsmodels' ARIMA, imported on first use (the import alone takes
+    seconds, which numpy-backend runs should not pay).
+
+    statsmodels installs "always" filters for its warnings on import;
+    the filters set before it (e.g. the experiments' filterwarnings())
+    are put back in front so they still take precedence.
+    """
+    before = list(warnings.filters)
+    from statsmodels.tsa.arima.model import ARIMA
+
+    if len(warnings.filters) == len(before):
+        return ARIMA  # imported already
+    for action, message, category, module, lineno in reversed(before):
+        warnings.filterwarnings(
+            action,
+            getattr(message, "pattern", message) or "",
+            category,
+            getattr(module, "pattern", module) or "",
+            lineno
+        )
+    return ARIMA
+
+
+def _fit_statsmodels(train, order, steps):
+    ARIMA = _arima()
+    with stage("fit", backend="statsmodels", rows=len(train)):
+        model_fit = ARIMA(train, order=order).fit()
+    with stage("forecast", backend="statsmodels", rows=int(steps)):
+        forecast = model_fit.forecast(steps=steps) if steps else []
+
+    return FitSummary(
+        params={k: float(v) for k, v in
+                zip(model_fit.param_names, np.asarray(model_fit.params))},
+        aic=float(model_fit.aic),
+        bic=float(model_fit.bic),
+        forecast=np.asarray(forecast, dtype=float),
+        backend="statsmodels"
+    )
+
+
+def _fit_numpy(trains, order, steps):
+    from dse_eod.arma import fit_arma11, pack
+
+    Y, lengths = pack(trains)
+    with stage("fit", backend="numpy", rows=int(lengths.sum()), series=len(trains)):
+        result = fit_arma11(Y, lengths, order=order)
+    with stage("forecast", backend="numpy", rows=int(steps.sum())):
+        forecasts = result.forecast(int(steps.max(initial=0)))
+    params = result.params
+
+    return [
+        FitSummary(
+            params=dict(zip(result.param_names, map(float, params[i]))),
+            aic=float(result.aic[i]),
+            bic=float(result.bic[i]),
+            forecast=forecasts[i, :steps[i]],
+            backend="numpy"
+        )
+        for i in range(len(trains))
+    ]
+
+
+def fit_arima_many(trains, order, steps, cache=None):
+    """
+    Fit every training series in one batch with the NumPy backend.
+    ``steps`` is one horizon for all series or one per series; with a
+    ``cache``, only the series without a cached result are fitted.
+    """
+    trains = [np.asarray(t, dtype=float) for t in trains]
+    steps = np.broadcast_to(np.asarray(steps, dtype=np.int64), (len(trains),))
+
+    fits = [None] * len(trains)
+    keys = [None] * len(trains)
+    if cache is not None:
+        for i, train in enumerate(trains):
+            keys[i] = fit_key(train, order, steps[i], "numpy")
+            entry = cache.get(keys[i])
+            if entry is not None:
+                fits[i] = FitSummary.from_entry(entry)
+
+    todo = [i for i, fit in enumerate(fits) if fit is None]
+    if todo:
+        new = _fit_numpy([trains[i] for i in todo], order, steps[todo])
+        for i, fit in zip(todo, new):
+            fits[i] = fit
+            if cache is not None:
+                cache.put(keys[i], fit.to_entry())
+
+    return fits
+
+
+def fit_arima(train, order, steps, backend="statsmodels", cache=None):
+    """Fit one training series and forecast ``steps`` ahead."""
+    if backend == "numpy":
+        return fit_arima_many([train], order, steps, cache=cache)[0]
+    if backend != "statsmodels":
+        raise ValueError(f"Unknown backend {backend!r}; choose from {BACKENDS}.")
+
+    if cache is None:
+        return _fit_statsmodels(train, order, steps)
+
+    key = fit_key(train, order, steps, backend)
+    entry = cache.get(key)
+    if entry is not None:
+        return FitSummary.from_entry(entry)
+
+    fit = _fit_statsmodels(train, order, steps)
+    cache.put(key, fit.to_entry())
+    return fit
+
+
+def predict_one_step_many(trains, tests, order, fits):
+    """
+    One-step-ahead forecasts of each ``test`` following its ``train``,
+    with the parameters of ``fits`` (NumPy backend) held fixed: one
+    batched filter pass over all series.
+    """
+    from dse_eod.arma import one_step_predictions, pack
+
+    Y, lengths = pack([np.r_[np.asarray(train, dtype=float),
+                             np.asarray(test, dtype=float)]
+                       for train, test in zip(trains, tests)])
+    params = np.array([list(fit.params.values()) for fit in fits], dtype=float)
+
+    with stage("forecast", backend="numpy", rows=int(sum(map(len, tests)))):
+        predicted = one_step_predictions(Y, lengths, order, params)
+
+    return [predicted[i, len(train):len(train) + len(test)]
+            for i, (train, test) in enumerate(zip(trains, tests))]
+
+
+def predict_one_step(train, test, order, fit):
+    """One-step-ahead forecasts of ``test`` with ``fit``'s parameters fixed."""
+    if fit.backend == "numpy":
+        return predict_one_step_many([train], [test], order, [fit])[0]
+
+    ARIMA = _arima()
+    y = np.r_[np.asarray(train, dtype=float), np.asarray(test, dtype=float)]
+    with stage("forecast", backend="statsmodels", rows=len(test)):
+        filtered = ARIMA(y, order=order).filter(
+            np.array(list(fit.params.values()), dtype=float)
+        )
+        predicted = filtered.predict(start=len(train), end=len(y) - 1)
+    return np.asarray(predicted, dtype=float)
@@ -0,0 +1,294 @@
+"""
+Memory-Mapped Price Panel
+
+Lays out Close/Volume for a whole universe as dates x tickers float
+matrices in raw NumPy memmap files, plus a validity mask derived from
+the availability codes and a small JSON header:
+
+    data_store/panel/<Universe>/panel.json
+    data_store/panel/<Universe>/Close.f8
+    data_store/panel/<Universe>/Volume.f8
+    data_store/panel/<Universe>/mask.u1
+    data_store/panel/<Universe>/sessions.i4
+    data_store/panel/<Universe>/sources.json
+
+Rows are the sessions of the DSE trading calendar (dse_eod.calendar)
+by default, so weekends and holidays take no space; ``sessions.i4``
+holds the day offset of every row. A panel built with
+``calendar="days"`` keeps one row per calendar day instead.
+``sources.json`` records the size and hash of every file the panel was
+read from (``store.source_files``), so staleness can be judged later.
+
+Matrices are stored column-major (Fortran order), so one ticker's
+history is a contiguous slice. Opening the panel maps the files without
+reading them; slicing a ticker or a date window returns a view and only
+touches the pages it needs.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.availability import ADJUSTED, UNADJUSTED, ONE_DAY, to_day
+from dse_eod.calendar import TradingCalendar
+from dse_eod import build, store
+
+
+# ==================================================
+# Configuration
+# ==================================================
+PANEL_DIR = "data_store/panel"
+
+FIELDS = ("Close", "Volume")
+
+UNIVERSE_FLAGS = {
+    "Adjusted": ADJUSTED,
+    "Unadjusted": UNADJUSTED,
+}
+
+CALENDARS = ("sessions", "days")
+
+# 2: session rows (sessions.i4); 1: calendar-day rows, still readable
+FORMAT_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+
+
+def panel_path(universe, panel_dir=PANEL_DIR) -> str:
+    return os.path.join(panel_dir, universe)
+
+
+class Panel:
+    """Read-only, memory-mapped view of a built panel."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "panel.json")) as f:
+            header = json.load(f)
+
+        if header["format_version"] not in READABLE_VERSIONS:
+            raise ValueError(f"Unsupported panel version in {path}.")
+
+        self.path = path
+        self.header = header
+        self.universe = header["universe"]
+        self.start = np.datetime64(header["start"], "D")
+        self.n_dates = header["n_dates"]
+        self.tickers = np.array(header["tickers"], dtype=str)
+        self.calendar = header.get("calendar", "days")
+        self._maps = {}
+
+        if self.calendar == "sessions":
+            self.offsets = np.fromfile(os.path.join(path, header["sessions"]),
+                                       dtype=np.int32)
+        else:
+            self.offsets = np.arange(self.n_dates, dtype=np.int32)
+
+    @classmethod
+    def open(cls, universe="Unadjusted", panel_dir=PANEL_DIR):
+        return cls(panel_path(universe, panel_dir))
+
+    # --------------------------------------------------
+    # Axes
+    # --------------------------------------------------
+    @property
+    def shape(self):
+        return (self.n_dates, len(self.tickers))
+
+    @property
+    def fields(self):
+        return list(self.header["fields"])
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self.start + self.offsets.astype(np.int64) * ONE_DAY
+
+    @property
+    def sources(self) -> dict:
+        """Signature of the files the panel was built from ({} if unrecorded)."""
+        try:
+            with open(os.path.join(self.path, "sources.json")) as f:
+                return json.load(f)
+        except OSError:
+            return {}
+
+    def ticker_position(self, ticker) -> int:
+        i = int(np.searchsorted(self.tickers, ticker))
+        if i == len(self.tickers) or self.tickers[i] != ticker:
+            raise KeyError(ticker)
+        return i
+
+    def date_position(self, date, side="left") -> int:
+        """
+        Row of ``date``: the first row on or after it, or with
+        ``side="right"`` the first row after it.
+        """
+        offset = int((to_day(date) - self.start) // ONE_DAY)
+        return int(np.searchsorted(self.offsets, offset, side=side))
+
+    # --------------------------------------------------
+    # Data
+    # --------------------------------------------------
+    def _map(self, name, spec):
+        if name not in self._maps:
+            self._maps[name] = np.memmap(
+                os.path.join(self.path, spec["file"]),
+                dtype=spec["dtype"],
+                mode="r",
+                shape=self.shape,
+                order="F"
+            )
+        return self._maps[name]
+
+    def field(self, name="Close") -> np.memmap:
+        """Full (dates x tickers) matrix of ``name`` (memory-mapped)."""
+        return self._map(name, self.header["fields"][name])
+
+    @property
+    def mask(self) -> np.memmap:
+        """Validity mask: the universe's version exists on that date."""
+        return self._map("mask", self.header["mask"])
+
+    def ticker(self, ticker, field="Close") -> np.ndarray:
+        """Contiguous view of one ticker over every row."""
+        return self.field(field)[:, self.ticker_position(ticker)]
+
+    def window(self, start=None, end=None, field="Close") -> np.ndarray:
+        """View of all tickers between ``start`` and ``end`` (inclusive)."""
+        lo = 0 if start is None else self.date_position(start)
+        hi = self.n_dates if end is None else self.date_position(end, "right")
+        return self.field(field)[lo:hi]
+
+    def series(self, ticker, field="Close", valid_only=True) -> pd.Series:
+        """One ticker as a date-indexed Series (copy)."""
+        col = self.ticker_position(ticker)
+        values = self.field(field)[:, col]
+        keep = self.mask[:, col].astype(bool) & ~np.isnan(values)
+        if not valid_only:
+            keep = slice(None)
+        return pd.Series(
+            np.array(values[keep]),
+            index=pd.DatetimeIndex(
+                self.dates[keep].astype("datetime64[ns]"), name="Date"
+            ),
+            name=field
+        )
+
+
+def build_panel(universe="Unadjusted", fields=FIELDS, matrix=None,
+                panel_dir=PANEL_DIR, dtype="float64", store_dir=store.STORE_DIR,
+                csv_dir=None, batch_size=64, calendar="sessions") -> Panel:
+    """
+    Build the panel of ``universe``.
+
+    With an ``AvailabilityMatrix`` the panel uses its calendar and ticker
+    universe and the mask comes from the availability codes. Without one,
+    the calendar spans the loaded data and the mask marks stored rows.
+    Tickers are loaded in batches and written straight into the memmap
+    files, so the universe is never held in memory at once.
+
+    ``calendar="sessions"`` keeps only trading sessions as rows. Data
+    dated outside the panel calendar (or on a day the availability
+    matrix has no session) is dropped and counted in the header
+    (``dropped_rows``).
+    """
+    if calendar not in CALENDARS:
+        raise ValueError(f"Unknown calendar {calendar!r}; choose from {CALENDARS}.")
+
+    path = panel_path(universe, panel_dir)
+    os.makedirs(path, exist_ok=True)
+
+    # Taken before reading, so an edit made during the build shows as stale
+    sources = build.input_signature(
+        store.source_files(universe, store_dir, csv_dir)
+    )
+
+    if matrix is not None:
+        tickers = matrix.tickers
+        sessions = TradingCalendar.from_matrix(matrix)
+    else:
+        bounds = store.load_tickers(universe=universe, columns=["Date"],
+                                    store_dir=store_dir, csv_dir=csv_dir)
+        tickers = np.unique(bounds["Ticker"].to_numpy(dtype=str))
+        sessions = TradingCalendar.from_dates(bounds["Date"].to_numpy())
+        del bounds
+
+    start = sessions.start
+    if calendar == "sessions":
+        row_of_day = sessions.session_of_day
+    else:
+        row_of_day = np.arange(sessions.n_days, dtype=np.int32)
+    n_dates = int(row_of_day.max(initial=-1)) + 1
+    shape = (n_dates, len(tickers))
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "universe": universe,
+        "start": str(start),
+        "n_dates": n_dates,
+        "calendar": calendar,
+        "tickers": [str(t) for t in tickers],
+        "order": "F",
+        "fields": {
+            name: {"file": f"{name}.{np.dtype(dtype).kind}{np.dtype(dtype).itemsize}",
+                   "dtype": np.dtype(dtype).str}
+            for name in fields
+        },
+        "mask": {"file": "mask.u1", "dtype": "|u1"},
+        "dropped_rows": 0,
+    }
+    if calendar == "sessions":
+        header["sessions"] = "sessions.i4"
+        sessions.sessions.astype("<i4").tofile(
+            os.path.join(path, header["sessions"])
+        )
+
+    planes = {
+        name: np.memmap(os.path.join(path, spec["file"]), dtype=spec["dtype"],
+                        mode="w+", shape=shape, order="F")
+        for name, spec in header["fields"].items()
+    }
+    for plane in planes.values():
+        plane[:] = np.nan
+
+    mask = np.memmap(os.path.join(path, "mask.u1"), dtype=np.uint8,
+                     mode="w+", shape=shape, order="F")
+
+    if matrix is not None:
+        flag = UNIVERSE_FLAGS[universe]
+        col = matrix.ticker_index()
+        row = row_of_day[matrix.days]
+        hit = ((matrix.codes & flag) > 0) & (row >= 0)
+        mask[row[hit], col[hit]] = 1
+
+    for lo in range(0, len(tickers), batch_size):
+        batch = list(tickers[lo:lo + batch_size])
+        data = store.load_tickers(batch, universe=universe, columns=list(fields),
+                                  store_dir=store_dir, csv_dir=csv_dir)
+        if data.empty:
+            continue
+
+        col = np.searchsorted(tickers, data["Ticker"].to_numpy(dtype=str))
+        day = (data["Date"].to_numpy().astype("datetime64[D]") - start) // ONE_DAY
+        inside = (day >= 0) & (day < len(row_of_day))
+        row = np.full(len(day), -1, dtype=np.int64)
+        row[inside] = row_of_day[day[inside]]
+        inside &= row >= 0
+        header["dropped_rows"] += int((~inside).sum())
+
+        for name, plane in planes.items():
+            plane[row[inside], col[inside]] = data[name].to_numpy()[inside]
+        if matrix is None:
+            mask[row[inside], col[inside]] = 1
+
+    for plane in planes.values():
+        plane.flush()
+    mask.flush()
+    del planes, mask
+
+    with open(os.path.join(path, "panel.json"), "w") as f:
+        json.dump(header, f, indent=2)
+    with open(os.path.join(path, "sources.json"), "w") as f:
+        json.dump(sources, f, indent=2, sort_keys=True)
+
+    return Panel(path)
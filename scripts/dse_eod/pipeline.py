@@ -0,0 +1,171 @@
+"""
+Metadata Pipeline
+
+Streams the two AmarStock source CSVs once (Date and Ticker only, see
+dse_eod.ingest) and derives every metadata artifact from the in-memory
+availability matrix:
+
+- metadata/availability.npz          (compact availability store)
+- metadata/availability_index.npz    (by-date query index)
+- metadata/company_metadata.csv
+- metadata/date_coverage_summary.csv
+- metadata/coverage_{weekly,monthly,yearly}.csv  (coverage cubes)
+- metadata/trading_segments.csv      (per-ticker trading segments)
+- metadata/availability_matrix.csv   (dense export, opt-in)
+- metadata/pipeline_state.json       (watermark for incremental updates)
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+import pandas as pd
+
+from dse_eod.availability import (
+    AvailabilityMatrix,
+    DATASET_START,
+    DATASET_END,
+    MATRIX_PATH,
+)
+from dse_eod.company import company_metadata
+from dse_eod.coverage import CUBE_PATH, coverage_tables
+from dse_eod.ingest import (
+    CHUNK_SIZE,
+    DATE_FORMAT,
+    availability_from_pairs,
+    read_pairs,
+)
+from dse_eod.profiling import stage
+from dse_eod.query import INDEX_PATH, build_index
+from dse_eod.segments import SEGMENTS_PATH, trading_segments
+
+
+# ==================================================
+# Configuration
+# ==================================================
+UNADJUSTED_SOURCE = "UnAdjusted-AmarStock.csv"
+ADJUSTED_SOURCE = "Adjusted-AmarStock.csv"
+
+COMPANY_METADATA_PATH = "metadata/company_metadata.csv"
+DATE_COVERAGE_PATH = "metadata/date_coverage_summary.csv"
+STATE_PATH = "metadata/pipeline_state.json"
+
+STATE_VERSION = 1
+
+
+@dataclass
+class PipelineResult:
+    matrix: AvailabilityMatrix
+    company_metadata: pd.DataFrame
+    date_coverage: pd.DataFrame
+    coverage_cubes: dict  # resolution -> DataFrame
+    trading_segments: pd.DataFrame
+
+
+def build_availability(unadjusted_path=UNADJUSTED_SOURCE,
+                       adjusted_path=ADJUSTED_SOURCE,
+                       start=DATASET_START,
+                       end=DATASET_END,
+                       chunksize=CHUNK_SIZE,
+                       date_format=DATE_FORMAT) -> AvailabilityMatrix:
+    """Availability matrix streamed from the two source dumps."""
+    return availability_from_pairs(
+        adjusted=read_pairs(adjusted_path, chunksize, date_format),
+        unadjusted=read_pairs(unadjusted_path, chunksize, date_format),
+        start=start,
+        end=end
+    )
+
+
+def derive_metadata(matrix) -> PipelineResult:
+    """Company, per-date and segment metadata for an in-memory matrix."""
+    tables = {}
+    for output, derive in (("company_metadata", company_metadata),
+                           ("trading_segments", trading_segments)):
+        with stage("reduce", output=output, rows=matrix.nnz):
+            tables[output] = derive(matrix)
+
+    # Daily coverage and the cubes share one pass over the codes
+    with stage("reduce", output="date_coverage", rows=matrix.nnz):
+        tables["date_coverage"], tables["coverage_cubes"] = coverage_tables(matrix)
+
+    return PipelineResult(matrix=matrix, **tables)
+
+
+def read_state(path=STATE_PATH) -> dict:
+    """Load the incremental-update state written by the last run."""
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("format_version") != STATE_VERSION:
+        raise ValueError(f"Unsupported pipeline state in {path}.")
+    return state
+
+
+def write_state(matrix, matrix_path=MATRIX_PATH, path=STATE_PATH):
+    """
+    Record the watermark (last calendar day covered) of the artifacts.
+    Incremental updates only accept data after this day.
+    """
+    state = {
+        "format_version": STATE_VERSION,
+        "matrix_path": matrix_path,
+        "start": str(matrix.start),
+        "watermark": str(matrix.end),
+        "n_tickers": matrix.n_tickers,
+        "nnz": matrix.nnz,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2)
+    return state
+
+
+def save_outputs(result, matrix_path=MATRIX_PATH, matrix_csv_path=None,
+                 company_path=COMPANY_METADATA_PATH,
+                 coverage_path=DATE_COVERAGE_PATH,
+                 cube_path=CUBE_PATH,
+                 segments_path=SEGMENTS_PATH,
+                 state_path=STATE_PATH,
+                 index_path=INDEX_PATH):
+    """
+    Write the pipeline artifacts. ``matrix_path`` / ``matrix_csv_path``
+    may be ``None`` to skip the compact store / dense CSV export. The
+    incremental state and the query index are only written alongside
+    the compact store. ``cube_path`` is formatted with each cube's
+    resolution.
+    """
+    cubes = [(cube, cube_path.format(resolution))
+             for resolution, cube in result.coverage_cubes.items()]
+
+    for path in [company_path, coverage_path, segments_path] + [p for _, p in cubes]:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with stage("save", output="availability", rows=result.matrix.nnz):
+        if matrix_path:
+            result.matrix.save(matrix_path)
+            write_state(result.matrix, matrix_path, state_path)
+            build_index(result.matrix, index_path)
+        if matrix_csv_path:
+            result.matrix.to_csv(matrix_csv_path)
+
+    for table, path in ((result.company_metadata, company_path),
+                        (result.date_coverage, coverage_path),
+                        (result.trading_segments, segments_path), *cubes):
+        with stage("save", output=path, rows=len(table)):
+            table.to_csv(path, index=False)
+
+
+def run_pipeline(unadjusted_path=UNADJUSTED_SOURCE,
+                 adjusted_path=ADJUSTED_SOURCE,
+                 start=DATASET_START,
+                 end=DATASET_END,
+                 chunksize=CHUNK_SIZE,
+                 date_format=DATE_FORMAT,
+                 **save_kwargs) -> PipelineResult:
+    """Source dumps -> availability -> metadata, in one run."""
+    matrix = build_availability(
+        unadjusted_path, adjusted_path, start, end, chunksize, date_format
+    )
+    result = derive_metadata(matrix)
+    save_outputs(result, **save_kwargs)
+    return result
@@ -0,0 +1,228 @@
+"""
+Stage Instrumentation
+
+``stage(name, **fields)`` wraps one logical step of a script (load,
+parse, build, reduce, fit, forecast, save, render) and, when enabled,
+records for it:
+
+- wall-clock and CPU seconds
+- rows processed (``record.rows``, set by the caller)
+- resident memory after the stage, its change, and the process peak
+- the enclosing stages, the script and the process id
+
+Everything is switched on from the environment, so production runs
+can be measured without editing the scripts:
+
+    DSE_STAGE_LOG=stages.jsonl      append one JSON object per stage
+                                    ("-" writes to stderr)
+    DSE_PROFILE=cprofile            dump a profile per stage under
+    DSE_PROFILE=pyinstrument        DSE_PROFILE_DIR (.cache/profiles)
+    DSE_PROFILE_STAGES=fit,render   only profile these stages
+
+With neither variable set a stage costs a couple of attribute lookups.
+Worker processes inherit the environment and append to the same log.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import count
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+LOG_ENV = "DSE_STAGE_LOG"
+PROFILE_ENV = "DSE_PROFILE"
+PROFILE_DIR_ENV = "DSE_PROFILE_DIR"
+PROFILE_STAGES_ENV = "DSE_PROFILE_STAGES"
+
+PROFILE_DIR = ".cache/profiles"
+PROFILERS = ("cprofile", "pyinstrument")
+
+_open_stages = []     # names of the stages currently running
+_profiling = False    # profilers cannot nest: only the outermost runs
+_dumps = count(1)
+
+
+class StageRecord:
+    """Handle yielded by ``stage``; the caller fills in rows and fields."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.rows = fields.pop("rows", None)
+        self.fields = fields
+
+    def add(self, **fields):
+        self.fields.update(fields)
+
+
+# ==================================================
+# Memory
+# ==================================================
+def current_rss_mb():
+    """Resident memory of this process (None where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _round(value, digits=1):
+    return None if value is None else round(value, digits)
+
+
+# ==================================================
+# Profilers
+# ==================================================
+def _profile_this(name) -> bool:
+    selected = os.environ.get(PROFILE_STAGES_ENV)
+    return not selected or name in selected.split(",")
+
+
+def _start_profiler(kind):
+    if kind == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    if kind == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as exc:
+            raise ImportError(
+                f"{PROFILE_ENV}=pyinstrument requires pyinstrument "
+                "(pip install pyinstrument)."
+            ) from exc
+        profiler = Profiler()
+        profiler.start()
+        return profiler
+
+    raise ValueError(f"Unknown {PROFILE_ENV} {kind!r}; choose from {PROFILERS}.")
+
+
+def _stop_profiler(kind, profiler, path) -> str:
+    """Stop ``profiler`` and write its dump next to ``path``."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if kind == "cprofile":
+        profiler.disable()
+        profiler.dump_stats(path + ".prof")
+        return path + ".prof"
+
+    profiler.stop()
+    with open(path + ".html", "w") as f:
+        f.write(profiler.output_html())
+    return path + ".html"
+
+
+def _script_name() -> str:
+    return os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+
+
+# ==================================================
+# Log
+# ==================================================
+def _emit(target, entry):
+    line = json.dumps(entry, default=str) + "\n"
+    if target == "-":
+        sys.stderr.write(line)
+        return
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    # One write per line in append mode: safe across worker processes
+    with open(target, "a") as f:
+        f.write(line)
+
+
+@contextmanager
+def stage(name, **fields):
+    """
+    Instrument the enclosed block as stage ``name``. ``fields`` (and
+    ``rows``) are added to the log entry; the yielded record takes
+    values known only at the end, e.g. ``record.rows = len(frame)``.
+    """
+    global _profiling
+
+    record = StageRecord(name, fields)
+    log = os.environ.get(LOG_ENV)
+    kind = os.environ.get(PROFILE_ENV)
+
+    if not log and not kind:
+        yield record
+        return
+
+    parents = list(_open_stages)
+    _open_stages.append(name)
+
+    profiler = None
+    if kind and not _profiling and _profile_this(name):
+        profiler = _start_profiler(kind)
+        _profiling = True
+
+    rss_before = current_rss_mb()
+    started = datetime.now(timezone.utc)
+    wall, cpu = time.perf_counter(), time.process_time()
+    status, error = "ok", None
+
+    try:
+        yield record
+    except BaseException as exc:
+        status, error = "error", f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        _open_stages.pop()
+
+        dump = None
+        if profiler is not None:
+            _profiling = False
+            path = os.path.join(
+                os.environ.get(PROFILE_DIR_ENV, PROFILE_DIR),
+                f"{_script_name()}-{'.'.join(parents + [name])}"
+                f"-{os.getpid()}-{next(_dumps)}"
+            )
+            dump = _stop_profiler(kind, profiler, path)
+
+        if log:
+            rss_after = current_rss_mb()
+            entry = {
+                "time": started.isoformat(timespec="milliseconds"),
+                "script": _script_name(),
+                "pid": os.getpid(),
+                "stage": name,
+                "parents": parents,
+                "status": status,
+                "wall_s": round(wall, 6),
+                "cpu_s": round(cpu, 6),
+                "rows": record.rows,
+                "rss_mb": _round(rss_after),
+                "rss_delta_mb": _round(
+                    None if rss_before is None or rss_after is None
+                    else rss_after - rss_before
+                ),
+                "peak_rss_mb": _round(peak_rss_mb()),
+            }
+            if error:
+                entry["error"] = error
+            if dump:
+                entry["profile"] = dump
+            entry.update(record.fields)
+            _emit(log, entry)
@@ -0,0 +1,294 @@
+"""
+Availability Query Index
+
+Answers point, range and set questions about the availability matrix
+without densifying or rescanning it:
+
+- by ticker: the matrix's own CSR layout (day offsets sorted within
+  each ticker), searched with binary search
+- by date:   a transposed (CSC) copy, the tickers of each calendar day
+  sorted by ticker position
+
+Sessions and gaps follow the DSE trading calendar (dse_eod.calendar):
+weekends and inferred holidays are never reported as missed days.
+
+The transposed arrays are persisted next to the compact store together
+with the matrix fingerprint (``AvailabilityMatrix.fingerprint``, kept
+in the store when it is saved); ``open_index`` compares the two
+strings and rebuilds the arrays only when the matrix has changed.
+
+Every query takes a ``version``: "any", "adjusted", "unadjusted" or
+"both" (the codes 1/2/3 of the matrix).
+"""
+
+import os
+
+import numpy as np
+
+from dse_eod.availability import (
+    ADJUSTED,
+    BOTH,
+    ONE_DAY,
+    UNADJUSTED,
+    load_availability,
+    to_day,
+)
+from dse_eod.calendar import TradingCalendar
+
+
+INDEX_PATH = "metadata/availability_index.npz"
+INDEX_VERSION = 1
+
+VERSIONS = ("any", "adjusted", "unadjusted", "both")
+
+
+def version_mask(codes, version="any") -> np.ndarray:
+    """Boolean mask of the codes that count as available for ``version``."""
+    if version == "any":
+        return codes > 0
+    if version == "adjusted":
+        return (codes & ADJUSTED) > 0
+    if version == "unadjusted":
+        return (codes & UNADJUSTED) > 0
+    if version == "both":
+        return codes == BOTH
+    raise ValueError(f"Unknown version {version!r}; choose from {VERSIONS}.")
+
+
+class AvailabilityIndex:
+    """
+    Query index over an AvailabilityMatrix.
+
+    ``date_indptr`` (n_days + 1), ``date_tickers`` (ticker positions)
+    and ``date_codes`` are the by-date layout of the same entries.
+    """
+
+    def __init__(self, matrix, date_indptr, date_tickers, date_codes):
+        self.matrix = matrix
+        self.date_indptr = np.asarray(date_indptr, dtype=np.int64)
+        self.date_tickers = np.asarray(date_tickers, dtype=np.int32)
+        self.date_codes = np.asarray(date_codes, dtype=np.uint8)
+        self._keys = None
+        self._calendar = None
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Build the by-date layout (a stable sort of the entries by day)."""
+        order = np.argsort(matrix.days, kind="stable")
+        counts = np.bincount(matrix.days, minlength=matrix.n_days)
+
+        return cls(
+            matrix,
+            np.concatenate([[0], np.cumsum(counts)]),
+            matrix.ticker_index()[order],
+            matrix.codes[order]
+        )
+
+    def append(self, delta, merged):
+        """
+        Index of ``merged``, i.e. this index's matrix with ``delta``
+        appended (``AvailabilityMatrix.append``). Only the entries of
+        ``delta`` are sorted; the existing by-date arrays are reused,
+        with ticker positions remapped when new tickers appear.
+        """
+        tail = AvailabilityIndex.from_matrix(delta)
+        shift = int((delta.start - merged.start) // ONE_DAY)
+        n_gap = shift - self.matrix.n_days  # days between the two calendars
+
+        tickers = self.date_tickers
+        if merged.n_tickers != self.matrix.n_tickers:
+            tickers = np.searchsorted(merged.tickers, self.matrix.tickers)[tickers]
+        new_pos = np.searchsorted(merged.tickers, delta.tickers)
+
+        end = self.date_indptr[-1]
+        return AvailabilityIndex(
+            merged,
+            np.concatenate([
+                self.date_indptr, np.full(n_gap, end), end + tail.date_indptr[1:]
+            ]),
+            np.concatenate([tickers, new_pos[tail.date_tickers]]),
+            np.concatenate([self.date_codes, tail.date_codes])
+        )
+
+    def __repr__(self):
+        m = self.matrix
+        return (
+            f"AvailabilityIndex(tickers={m.n_tickers}, days={m.n_days}, "
+            f"start={m.start}, nnz={m.nnz})"
+        )
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            format_version=INDEX_VERSION,
+            fingerprint=self.matrix.fingerprint,
+            date_indptr=self.date_indptr,
+            date_tickers=self.date_tickers,
+            date_codes=self.date_codes
+        )
+
+    @classmethod
+    def load(cls, matrix, path=INDEX_PATH):
+        """Load the by-date arrays for ``matrix``; ValueError if they are stale."""
+        with np.load(path, allow_pickle=False) as store:
+            if int(store["format_version"]) != INDEX_VERSION:
+                raise ValueError(f"Unsupported index version in {path}.")
+            if str(store["fingerprint"]) != matrix.fingerprint:
+                raise ValueError(f"{path} was built from a different matrix.")
+            return cls(
+                matrix,
+                store["date_indptr"],
+                store["date_tickers"],
+                store["date_codes"]
+            )
+
+    @property
+    def calendar(self) -> TradingCalendar:
+        """Trading calendar inferred from the per-date counts."""
+        if self._calendar is None:
+            self._calendar = TradingCalendar.from_counts(
+                self.matrix.start, np.diff(self.date_indptr)
+            )
+        return self._calendar
+
+    # --------------------------------------------------
+    # Lookups
+    # --------------------------------------------------
+    def _ticker_position(self, ticker) -> int:
+        tickers = self.matrix.tickers
+        i = int(np.searchsorted(tickers, ticker))
+        if i == len(tickers) or tickers[i] != ticker:
+            raise KeyError(ticker)
+        return i
+
+    def _offset(self, date) -> int:
+        """Calendar offset of ``date`` (may fall outside the calendar)."""
+        return int((to_day(date) - self.matrix.start) // ONE_DAY)
+
+    def _offset_range(self, start, end):
+        lo = 0 if start is None else max(self._offset(start), 0)
+        hi = self.matrix.n_days if end is None else min(
+            self._offset(end) + 1, self.matrix.n_days
+        )
+        return lo, max(lo, hi)
+
+    def _dates(self, offsets) -> np.ndarray:
+        return self.matrix.start + np.asarray(offsets, dtype=np.int64) * ONE_DAY
+
+    def code(self, ticker, date) -> int:
+        """Availability code (0-3) of ``ticker`` on ``date``."""
+        days, codes = self.matrix.ticker_slice(ticker)
+        offset = self._offset(date)
+        j = int(np.searchsorted(days, offset))
+        return int(codes[j]) if j < len(days) and days[j] == offset else 0
+
+    def has(self, ticker, date, version="any") -> bool:
+        return bool(version_mask(np.uint8(self.code(ticker, date)), version))
+
+    def days(self, ticker, start=None, end=None, version="any") -> np.ndarray:
+        """Dates (datetime64[D]) on which ``ticker`` is available."""
+        days, codes = self.matrix.ticker_slice(ticker)
+        lo, hi = self._offset_range(start, end)
+        a, b = np.searchsorted(days, [lo, hi])
+        days, codes = days[a:b], codes[a:b]
+        return self._dates(days[version_mask(codes, version)])
+
+    def tickers_on(self, date, version="any") -> np.ndarray:
+        """Tickers available on ``date``."""
+        offset = self._offset(date)
+        if not 0 <= offset < self.matrix.n_days:
+            return self.matrix.tickers[:0]
+        lo, hi = self.date_indptr[offset], self.date_indptr[offset + 1]
+        keep = version_mask(self.date_codes[lo:hi], version)
+        return self.matrix.tickers[self.date_tickers[lo:hi][keep]]
+
+    def counts_by_date(self, version="any") -> np.ndarray:
+        """Number of available tickers on every calendar day."""
+        keep = version_mask(self.date_codes, version)
+        day_of_entry = np.repeat(
+            np.arange(self.matrix.n_days), np.diff(self.date_indptr)
+        )
+        return np.bincount(day_of_entry[keep], minlength=self.matrix.n_days)
+
+    def active_tickers(self, start=None, end=None) -> np.ndarray:
+        """Tickers with at least one available day in ``start``..``end``."""
+        m = self.matrix
+        if self._keys is None:
+            # Entries are sorted by (ticker, day): one global sorted key array
+            self._keys = m.ticker_index().astype(np.int64) * m.n_days + m.days
+
+        lo, hi = self._offset_range(start, end)
+        base = np.arange(m.n_tickers, dtype=np.int64) * m.n_days
+        counts = (
+            np.searchsorted(self._keys, base + hi)
+            - np.searchsorted(self._keys, base + lo)
+        )
+        return m.tickers[counts > 0]
+
+    def sessions(self, start=None, end=None) -> np.ndarray:
+        """Trading sessions between ``start`` and ``end``."""
+        lo, hi = self.calendar.session_range(start, end)
+        return self.calendar.to_date(np.arange(lo, hi))
+
+    def gaps(self, ticker, start=None, end=None) -> np.ndarray:
+        """
+        Sessions between the ticker's first and last available day (and
+        within ``start``..``end``) on which it has no data.
+        """
+        days, _ = self.matrix.ticker_slice(ticker)
+        if not len(days):
+            return self._dates([])
+
+        lo, hi = self._offset_range(start, end)
+        lo, hi = max(lo, int(days[0])), min(hi, int(days[-1]) + 1)
+        if lo >= hi:
+            return self._dates([])
+
+        sessions = self.calendar.sessions
+        a, b = np.searchsorted(sessions, [lo, hi])
+        return self._dates(np.setdiff1d(sessions[a:b], days, assume_unique=True))
+
+    def common_days(self, tickers, start=None, end=None, version="any") -> np.ndarray:
+        """Dates on which every ticker in ``tickers`` is available."""
+        common = None
+        for ticker in tickers:
+            days = self.days(ticker, start, end, version)
+            common = days if common is None else np.intersect1d(
+                common, days, assume_unique=True
+            )
+        return self._dates([]) if common is None else common
+
+    def common_tickers(self, dates, version="any") -> np.ndarray:
+        """Tickers available on every date in ``dates``."""
+        common = None
+        for date in dates:
+            tickers = self.tickers_on(date, version)
+            common = tickers if common is None else np.intersect1d(
+                common, tickers, assume_unique=True
+            )
+        return self.matrix.tickers[:0] if common is None else common
+
+
+def build_index(matrix, path=INDEX_PATH) -> AvailabilityIndex:
+    """Build the index for ``matrix`` and persist it at ``path``."""
+    index = AvailabilityIndex.from_matrix(matrix)
+    if path:
+        index.save(path)
+    return index
+
+
+def open_index(matrix_path=None, index_path=INDEX_PATH) -> AvailabilityIndex:
+    """
+    Index for the stored availability matrix (``load_availability``),
+    reusing the persisted by-date arrays when they match the matrix and
+    rebuilding (and re-saving) them otherwise.
+    """
+    matrix = load_availability(matrix_path)
+    try:
+        return AvailabilityIndex.load(matrix, index_path)
+    except (OSError, ValueError, KeyError):
+        return build_index(matrix, index_path)
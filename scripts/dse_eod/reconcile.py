@@ -0,0 +1,237 @@
+"""
+Adjusted vs Unadjusted Reconciliation
+
+The availability codes only record whether each version of a (ticker,
+date) row exists; this module compares the prices. On every date both
+versions carry, the adjustment factor is
+
+    factor = Adjusted Close / Unadjusted Close
+
+Backward adjustment keeps the factor constant between corporate actions
+and steps at each ex-date, so along each ticker's aligned rows:
+
+- a step that persists is a corporate-action event; its ``Ratio``
+  (factor before / factor after) is what the prices before the ex-date
+  are multiplied by
+- a single row off the level on both sides of it, or a non-positive
+  price, is a "mismatch": the versions disagree on that day
+
+A step counts when its log size exceeds ``tolerance`` and the rounding
+error of the four closes involved. The source carries no event type,
+so ``Kind`` is inferred from the ratio: "split" (2:1 or more), "bonus"
+(1 / (1 + b) for a bonus rate b in steps of 5%), "dividend" (any other
+reduction) or "reverse" (the factor went up).
+
+Both versions are aligned and scanned as flat arrays for the whole
+universe at once. The result is a compact table, one row per event or
+mismatch (metadata/adjustment_events.csv), which ``back_adjust``
+applies to unadjusted prices.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.ingest import SourceCloses
+
+
+# ==================================================
+# Configuration
+# ==================================================
+EVENTS_PATH = "metadata/adjustment_events.csv"
+
+TOLERANCE = 0.005    # smallest log factor step reported
+PRICE_TICK = 0.01    # rounding of the stored closes
+SPLIT_RATIO = 0.5    # ratios at or below this are splits
+BONUS_STEP = 0.05    # bonus share rates are multiples of this
+BONUS_TOLERANCE = 0.001  # log distance from an exact bonus ratio
+
+KINDS = ("split", "bonus", "dividend", "reverse", "mismatch")
+
+EVENT_COLUMNS = [
+    "Ticker",
+    "Date",
+    "Kind",
+    "Ratio",
+    "Adjusted_Close",
+    "Unadjusted_Close",
+]
+
+_DAY_BIAS = 1 << 31
+
+
+def _keys(codes, days) -> np.ndarray:
+    """int64 (ticker, day) keys; sorted when the inputs are."""
+    day = np.asarray(days).astype("datetime64[D]").astype(np.int64)
+    return (np.asarray(codes, dtype=np.int64) << 32) | (day + _DAY_BIAS)
+
+
+@dataclass
+class Reconciliation:
+    """Closes of both versions on the rows both carry, sorted by ticker and day."""
+    tickers: np.ndarray      # sorted union of both versions
+    ticker_idx: np.ndarray   # int64 positions into ``tickers``
+    days: np.ndarray         # datetime64[D]
+    adjusted: np.ndarray
+    unadjusted: np.ndarray
+    only_adjusted: int       # rows present in one version only
+    only_unadjusted: int
+
+    @property
+    def factor(self) -> np.ndarray:
+        """Adjusted / Unadjusted Close per aligned row."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.adjusted / self.unadjusted
+
+    def factor_series(self, ticker) -> pd.Series:
+        """Adjustment factor of ``ticker`` indexed by Date."""
+        code = np.searchsorted(self.tickers, ticker)
+        if code == len(self.tickers) or self.tickers[code] != ticker:
+            raise KeyError(ticker)
+        lo, hi = np.searchsorted(self.ticker_idx, [code, code + 1])
+        return pd.Series(
+            self.factor[lo:hi],
+            index=pd.DatetimeIndex(self.days[lo:hi], name="Date"),
+            name="Factor"
+        )
+
+
+def align(adjusted: SourceCloses, unadjusted: SourceCloses) -> Reconciliation:
+    """Pair the rows of the two versions on (ticker, day)."""
+    tickers = np.union1d(adjusted.tickers, unadjusted.tickers)
+
+    keys = {}
+    for name, closes in (("adjusted", adjusted), ("unadjusted", unadjusted)):
+        remap = np.searchsorted(tickers, closes.tickers)
+        keys[name] = _keys(remap[closes.ticker_idx], closes.days)
+
+    k_adj, k_unadj = keys["adjusted"], keys["unadjusted"]
+    pos = np.searchsorted(k_unadj, k_adj)
+    hit = pos < len(k_unadj)
+    hit[hit] = k_unadj[pos[hit]] == k_adj[hit]
+
+    both = k_adj[hit]
+    return Reconciliation(
+        tickers=tickers,
+        ticker_idx=both >> 32,
+        days=((both & 0xFFFFFFFF) - _DAY_BIAS).astype("datetime64[D]"),
+        adjusted=adjusted.close[hit],
+        unadjusted=unadjusted.close[pos[hit]],
+        only_adjusted=int((~hit).sum()),
+        only_unadjusted=len(k_unadj) - int(hit.sum()),
+    )
+
+
+# ==================================================
+# Detection
+# ==================================================
+def classify(ratio, noise=0.0) -> np.ndarray:
+    """
+    Event kind of every price ratio (factor before / factor after);
+    ``noise`` is the log rounding error each ratio may carry.
+    """
+    ratio = np.asarray(ratio, dtype=float)
+    tolerance = np.maximum(BONUS_TOLERANCE, noise)
+    rate = BONUS_STEP * np.maximum(np.round((1 / ratio - 1) / BONUS_STEP), 1)
+    bonus = np.abs(np.log(ratio * (1 + rate))) <= tolerance
+
+    return np.select(
+        [ratio > 1, ratio <= SPLIT_RATIO * np.exp(tolerance), bonus],
+        ["reverse", "split", "bonus"],
+        default="dividend"
+    )
+
+
+def adjustment_events(rec, tolerance=TOLERANCE, tick=PRICE_TICK) -> pd.DataFrame:
+    """Corporate-action events and mismatches of every ticker (EVENT_COLUMNS)."""
+    adj, unadj = rec.adjusted, rec.unadjusted
+    valid = (adj > 0) & (unadj > 0)  # NaN compares False
+
+    rows = np.flatnonzero(valid)
+    code = rec.ticker_idx[rows]
+    a, u = adj[rows], unadj[rows]
+    log_factor = np.log(a) - np.log(u)
+
+    # Pair i compares valid rows i and i + 1 of the same ticker
+    same = code[1:] == code[:-1]
+    rounding = tick / 2 * (1 / a + 1 / u)
+    noise = rounding[1:] + rounding[:-1]
+    threshold = np.maximum(tolerance, noise)
+    step = log_factor[1:] - log_factor[:-1]
+    jump = same & (np.abs(step) > threshold)
+
+    # A row that jumps away and straight back is one bad day, not two events
+    around = np.maximum(tolerance, rounding[2:] + rounding[:-2])
+    spike = np.zeros(len(rows), dtype=bool)
+    spike[1:-1] = (
+        jump[:-1] & jump[1:]
+        & (np.abs(log_factor[2:] - log_factor[:-2]) <= around)
+    )
+    bad = np.flatnonzero(spike)
+    jump[bad - 1] = False
+    jump[bad] = False
+
+    at = np.flatnonzero(jump) + 1
+    ratio = np.exp(log_factor[at - 1] - log_factor[at])
+
+    invalid = np.flatnonzero(~valid)
+    parts = [
+        (rows[at], classify(ratio, noise[at - 1]), ratio),
+        (rows[bad], np.full(len(bad), "mismatch"),
+         np.exp(log_factor[bad] - log_factor[bad - 1])),
+        (invalid, np.full(len(invalid), "mismatch"), np.full(len(invalid), np.nan)),
+    ]
+
+    index = np.concatenate([p[0] for p in parts])
+    order = np.argsort(index, kind="stable")
+    index = index[order]
+
+    return pd.DataFrame({
+        "Ticker": rec.tickers[rec.ticker_idx[index]],
+        "Date": rec.days[index],
+        "Kind": np.concatenate([p[1] for p in parts])[order],
+        "Ratio": np.concatenate([p[2] for p in parts])[order],
+        "Adjusted_Close": adj[index],
+        "Unadjusted_Close": unadj[index],
+    }, columns=EVENT_COLUMNS)
+
+
+# ==================================================
+# Back-Adjustment
+# ==================================================
+def back_adjust(frame, events, columns=("Open", "High", "Low", "Close")):
+    """
+    Backward-adjust a long unadjusted frame (Ticker, Date, prices): each
+    row is multiplied by the ratios of all later events of its ticker.
+    Mismatch rows of ``events`` are ignored.
+    """
+    events = events[events["Kind"] != "mismatch"]
+    tickers = np.union1d(frame["Ticker"].to_numpy(dtype=str),
+                         events["Ticker"].to_numpy(dtype=str))
+
+    ev_code = np.searchsorted(tickers, events["Ticker"].to_numpy(dtype=str))
+    ev_keys = _keys(ev_code, pd.to_datetime(events["Date"]).to_numpy())
+    order = np.argsort(ev_keys, kind="stable")
+    ev_code, ev_keys = ev_code[order], ev_keys[order]
+    log_ratio = np.log(events["Ratio"].to_numpy(dtype=float)[order])
+
+    # Sum of the log ratios from each event to its ticker's last one
+    suffix = np.r_[np.cumsum(log_ratio[::-1])[::-1], 0.0]
+    next_ticker = np.searchsorted(ev_code, ev_code, side="right")
+    within = suffix[:-1] - suffix[next_ticker]
+
+    code = np.searchsorted(tickers, frame["Ticker"].to_numpy(dtype=str))
+    later = np.searchsorted(ev_keys, _keys(code, frame["Date"].to_numpy()),
+                            side="right")
+    has = later < len(ev_keys)
+    has[has] = ev_code[later[has]] == code[has]
+
+    factor = np.ones(len(frame))
+    factor[has] = np.exp(within[later[has]])
+
+    adjusted = frame.copy()
+    for column in columns:
+        if column in adjusted:
+            adjusted[column] = adjusted[column].to_numpy(dtype=float) * factor
+    return adjusted
@@ -0,0 +1,112 @@
+"""
+Parallel Experiment Runner
+
+Distributes independent per-ticker jobs across worker processes and
+streams their result rows to a CSV file as they finish, so that long
+runs can be resumed and partial results are never lost.
+
+Each worker limits its BLAS/OpenMP thread pools (one thread by
+default): the parallelism comes from the processes, and oversubscribed
+BLAS threads only slow small ARIMA fits down.
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+BLAS_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+
+def limit_blas_threads(threads=1):
+    """Cap BLAS/OpenMP threads for this process (and its children)."""
+    for name in BLAS_ENV_VARS:
+        os.environ[name] = str(threads)
+
+    # Pools that were already initialised ignore the environment
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(threads)
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def run_parallel(func, items, workers=None, threads_per_worker=1):
+    """
+    Yield ``(item, result)`` pairs as jobs complete.
+
+    ``func`` must be a picklable module-level function taking one item.
+    With ``workers=1`` the jobs run in this process, in order.
+    """
+    items = list(items)
+    workers = default_workers() if workers is None else workers
+
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    # Children inherit the environment before importing numpy
+    limit_blas_threads(threads_per_worker)
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(items)),
+        initializer=limit_blas_threads,
+        initargs=(threads_per_worker,)
+    ) as pool:
+        futures = {pool.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def completed_keys(path, key) -> set:
+    """Values of column ``key`` already present in the CSV at ``path``."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path, newline="") as f:
+        return {row[key] for row in csv.DictReader(f)}
+
+
+class CsvStream:
+    """
+    Appends result rows to a CSV file, flushing after each one.
+
+    ``resume=False`` truncates the file first; ``resume=True`` keeps the
+    rows already there (the header is only written to an empty file).
+    """
+
+    def __init__(self, path, columns, resume=False):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        fresh = not resume or not os.path.exists(path) or os.path.getsize(path) == 0
+        self.path = path
+        self.file = open(path, "w" if fresh else "a", newline="")
+        self.writer = csv.DictWriter(
+            self.file, fieldnames=columns, lineterminator="\n"
+        )
+        if fresh:
+            self.writer.writeheader()
+            self.file.flush()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,207 @@
+"""
+Trading Segments and Gaps
+
+Splits every ticker's availability into contiguous trading segments.
+Time is measured in the sessions of the DSE trading calendar
+(dse_eod.calendar), so weekends and holidays never break a segment,
+while a session the ticker misses does (a suspension or a data gap).
+
+One row per segment is written to metadata/trading_segments.csv:
+
+- Segment:       1-based position within the ticker
+- Start_Date / End_Date, Sessions (length), Calendar_Days
+- Gap_Before:    sessions missed since the previous segment (0 first)
+
+The first and last segment bound the listing window; ``gap_statistics``
+summarises the table per ticker and ``longest_segment`` picks the
+longest clean stretch for a ticker, optionally bridging short gaps.
+
+``append_segments`` extends a stored table with newly appended days
+without revisiting the older ones.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.availability import ONE_DAY, load_availability
+from dse_eod.calendar import TradingCalendar
+from dse_eod.query import version_mask
+
+
+SEGMENTS_PATH = "metadata/trading_segments.csv"
+
+COLUMNS = [
+    "Ticker",
+    "Segment",
+    "Start_Date",
+    "End_Date",
+    "Sessions",
+    "Calendar_Days",
+    "Gap_Before",
+]
+
+
+def trading_segments(matrix, version="any", calendar=None) -> pd.DataFrame:
+    """
+    Segment table for every ticker with at least one session.
+    ``calendar`` defaults to the sessions of ``matrix``.
+    """
+    if calendar is None:
+        calendar = TradingCalendar.from_matrix(matrix)
+    sessions = calendar.sessions.astype(np.int64)
+
+    ticker_idx = matrix.ticker_index()
+    s = calendar.session_of_day[matrix.days].astype(np.int64)
+    keep = (s >= 0) & version_mask(matrix.codes, version)
+    ticker_idx, s = ticker_idx[keep], s[keep]  # still sorted by (ticker, session)
+
+    if not len(s):
+        return pd.DataFrame(columns=COLUMNS)
+
+    new_ticker = np.r_[True, ticker_idx[1:] != ticker_idx[:-1]]
+    starts = np.flatnonzero(new_ticker | np.r_[True, np.diff(s) != 1])
+    ends = np.r_[starts[1:] - 1, len(s) - 1]
+
+    seg_ticker = ticker_idx[starts]
+    first_of_ticker = new_ticker[starts]
+
+    # Segment number within the ticker
+    ticker_start = np.maximum.accumulate(
+        np.where(first_of_ticker, np.arange(len(starts)), 0)
+    )
+    segment = np.arange(len(starts)) - ticker_start + 1
+
+    gap_before = np.zeros(len(starts), dtype=np.int64)
+    gap_before[1:] = s[starts[1:]] - s[ends[:-1]] - 1
+    gap_before[first_of_ticker] = 0
+
+    start_day = sessions[s[starts]]
+    end_day = sessions[s[ends]]
+    one_day = np.timedelta64(1, "D")
+
+    return pd.DataFrame({
+        "Ticker": matrix.tickers[seg_ticker],
+        "Segment": segment,
+        "Start_Date": np.datetime_as_string(
+            matrix.start + start_day * one_day, unit="D"
+        ),
+        "End_Date": np.datetime_as_string(
+            matrix.start + end_day * one_day, unit="D"
+        ),
+        "Sessions": ends - starts + 1,
+        "Calendar_Days": end_day - start_day + 1,
+        "Gap_Before": gap_before,
+    }, columns=COLUMNS)
+
+
+def append_segments(segments, delta, calendar) -> pd.DataFrame:
+    """
+    ``segments`` extended with the entries of ``delta``, a matrix of days
+    after every segment in the table (see ``AvailabilityMatrix.append``).
+    ``calendar`` holds the sessions of the combined matrix.
+
+    Only the tickers in ``delta`` change, and only from their last
+    segment on: it is extended when their first new session follows it
+    directly, and their new segments are numbered after it.
+    """
+    shift = int((delta.start - calendar.start) // ONE_DAY)
+    rebased = type(delta)(
+        delta.tickers, calendar.start, calendar.n_days,
+        delta.indptr, delta.days + shift, delta.codes
+    )
+    tail = trading_segments(rebased, calendar=calendar)
+    if tail.empty:
+        return segments
+
+    # Last stored segment of every ticker ("index": its row label)
+    last = segments.drop_duplicates("Ticker", keep="last").reset_index()
+    last = last.set_index("Ticker")
+
+    first = tail.index[(tail["Segment"] == 1) & tail["Ticker"].isin(last.index)]
+    prev = last.loc[tail.loc[first, "Ticker"]]
+    gap = (
+        calendar.to_session(_days(tail.loc[first, "Start_Date"]))
+        - calendar.to_session(_days(prev["End_Date"]))
+        - 1
+    )
+    tail["Segment"] += tail["Ticker"].map(last["Segment"]).fillna(0).astype(np.int64)
+    tail.loc[first, "Gap_Before"] = gap
+
+    # No missed session in between: the first new segment extends the last
+    joined = first[gap == 0]
+    rows = last.loc[tail.loc[joined, "Ticker"], "index"].to_numpy()
+    segments = segments.copy()
+    segments.loc[rows, "End_Date"] = tail.loc[joined, "End_Date"].to_numpy()
+    segments.loc[rows, "Sessions"] += tail.loc[joined, "Sessions"].to_numpy()
+    segments.loc[rows, "Calendar_Days"] = (
+        _days(segments.loc[rows, "End_Date"])
+        - _days(segments.loc[rows, "Start_Date"])
+    ) // ONE_DAY + 1
+
+    renumber = tail["Ticker"].isin(tail.loc[joined, "Ticker"])
+    tail.loc[renumber, "Segment"] -= 1
+
+    return (
+        pd.concat([segments, tail.drop(joined)], ignore_index=True)
+        .sort_values(["Ticker", "Segment"], kind="stable", ignore_index=True)
+    )
+
+
+def _days(dates) -> np.ndarray:
+    """``datetime64[D]`` array of ISO date strings."""
+    return np.asarray(dates, dtype=str).astype("datetime64[D]")
+
+
+def gap_statistics(segments) -> pd.DataFrame:
+    """Per-ticker listing window and gap summary of a segment table."""
+    grouped = segments.groupby("Ticker", sort=True)
+
+    stats = grouped.agg(
+        Listing_Start=("Start_Date", "first"),
+        Listing_End=("End_Date", "last"),
+        Segments=("Segment", "size"),
+        Sessions_Traded=("Sessions", "sum"),
+        Sessions_Missed=("Gap_Before", "sum"),
+        Longest_Gap=("Gap_Before", "max"),
+        Longest_Segment=("Sessions", "max"),
+    )
+    stats["Session_Coverage"] = np.round(
+        stats["Sessions_Traded"]
+        / (stats["Sessions_Traded"] + stats["Sessions_Missed"]), 4
+    )
+    return stats.reset_index()
+
+
+def longest_segment(segments, ticker, max_gap=0):
+    """
+    (start, end) dates of the ticker's longest run of sessions, bridging
+    gaps of at most ``max_gap`` sessions. Ties go to the earliest run.
+    """
+    rows = segments[segments["Ticker"] == ticker]
+    if rows.empty:
+        raise KeyError(ticker)
+
+    run = (rows["Gap_Before"].to_numpy() > max_gap).cumsum()
+    runs = rows.groupby(run, sort=True).agg(
+        Start_Date=("Start_Date", "first"),
+        End_Date=("End_Date", "last"),
+        Sessions=("Sessions", "sum"),
+    )
+    best = runs.iloc[int(np.argmax(runs["Sessions"].to_numpy()))]
+    return pd.Timestamp(best["Start_Date"]), pd.Timestamp(best["End_Date"])
+
+
+def load_segments(path=SEGMENTS_PATH, matrix_path=None) -> pd.DataFrame:
+    """
+    The stored segment table, computed (and written) from the
+    availability matrix if it does not exist yet.
+    """
+    if os.path.exists(path):
+        return pd.read_csv(path)
+
+    segments = trading_segments(load_availability(matrix_path))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    segments.to_csv(path, index=False)
+    return segments
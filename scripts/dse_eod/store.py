@@ -0,0 +1,299 @@
+"""
+Columnar EoD Store
+
+Per-ticker EoD data (Date, Open, High, Low, Close, Volume) for the
+Adjusted and Unadjusted universes, stored as Parquet datasets
+partitioned by ticker:
+
+    data_store/<Universe>/Ticker=<TICKER>/part-0.parquet
+
+Dates are stored natively (date32), prices as float64 (float32 on
+request) and volume as int64, so loading needs no text parsing and a
+ticker filter only opens that ticker's partition.
+
+The store needs ``pyarrow``. Without it, or when no store has been
+built, the loaders fall back to the per-ticker CSV files.
+"""
+
+import glob
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.profiling import stage
+
+
+# ==================================================
+# Configuration
+# ==================================================
+STORE_DIR = "data_store"
+
+UNIVERSES = ("Adjusted", "Unadjusted")
+
+CSV_DIRS = {
+    "Adjusted": "data_sample/Adjusted",
+    "Unadjusted": "data_sample/Unadjusted",
+}
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+COLUMNS = ["Date"] + PRICE_COLUMNS + ["Volume"]
+
+CSV_DATE_FORMAT = "%Y-%m-%d"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            "The columnar store requires pyarrow (pip install pyarrow)."
+        ) from exc
+    return pyarrow
+
+
+def _partitioning(pa):
+    # Explicit schema: tickers must never be inferred as integers
+    return pa.dataset.partitioning(
+        pa.schema([pa.field("Ticker", pa.string())]), flavor="hive"
+    )
+
+
+def _date32(pa, value):
+    return pa.scalar(pd.Timestamp(value).date(), pa.date32())
+
+
+def store_path(universe, store_dir=STORE_DIR) -> str:
+    return os.path.join(store_dir, universe)
+
+
+def has_store(universe, store_dir=STORE_DIR) -> bool:
+    """True when a columnar store exists for ``universe`` and can be read."""
+    if not os.path.isdir(store_path(universe, store_dir)):
+        return False
+    try:
+        _pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def source_files(universe, store_dir=STORE_DIR, csv_dir=None) -> list:
+    """
+    Files the loaders read for ``universe``: the store's Parquet files
+    when it exists, otherwise the per-ticker CSV files. Sorted.
+    """
+    if has_store(universe, store_dir):
+        pattern = os.path.join(store_path(universe, store_dir), "**", "*.parquet")
+        return sorted(glob.glob(pattern, recursive=True))
+    csv_dir = csv_dir or CSV_DIRS[universe]
+    return sorted(glob.glob(os.path.join(csv_dir, "*.csv")))
+
+
+# ==================================================
+# Typing
+# ==================================================
+def _typed(frame, price_dtype="float64") -> pd.DataFrame:
+    """Cast a raw EoD frame to the store schema."""
+    frame = frame.copy()
+
+    if not pd.api.types.is_datetime64_any_dtype(frame["Date"]):
+        frame["Date"] = pd.to_datetime(frame["Date"], format=CSV_DATE_FORMAT)
+    frame["Date"] = frame["Date"].dt.normalize()
+
+    for column in PRICE_COLUMNS:
+        if column in frame:
+            frame[column] = frame[column].astype(price_dtype)
+
+    if "Volume" in frame:
+        volume = pd.to_numeric(frame["Volume"])
+        # Missing volumes cannot be held in int64
+        frame["Volume"] = volume if volume.isna().any() else volume.astype(np.int64)
+
+    return frame
+
+
+def read_ticker_csv(ticker, csv_dir) -> pd.DataFrame:
+    """One per-ticker CSV with typed columns, sorted by date."""
+    path = os.path.join(csv_dir, f"{ticker}.csv")
+    if not os.path.exists(path):
+        raise KeyError(ticker)
+
+    data = pd.read_csv(path)
+    return _typed(data).sort_values("Date", kind="stable")
+
+
+# ==================================================
+# Conversion
+# ==================================================
+def write_store(frame, universe, store_dir=STORE_DIR, price_dtype="float64"):
+    """
+    Write a long frame (Ticker + EoD columns) as the store of ``universe``.
+    Any existing store for that universe is replaced.
+    """
+    pa = _pyarrow()
+
+    frame = _typed(frame, price_dtype)
+    frame = frame.sort_values(["Ticker", "Date"], kind="stable")
+    frame["Ticker"] = frame["Ticker"].astype(str)
+
+    fields = [
+        pa.field("Date", pa.date32()),
+        *[pa.field(c, pa.from_numpy_dtype(np.dtype(price_dtype)))
+          for c in PRICE_COLUMNS if c in frame],
+    ]
+    if "Volume" in frame:
+        fields.append(pa.field("Volume", pa.from_numpy_dtype(frame["Volume"].dtype)))
+    fields.append(pa.field("Ticker", pa.string()))
+
+    table = pa.Table.from_pandas(
+        frame[[f.name for f in fields]],
+        schema=pa.schema(fields),
+        preserve_index=False
+    )
+
+    # Written beside the store and swapped in, so tickers missing from
+    # ``frame`` do not survive from the old store
+    path = store_path(universe, store_dir)
+    staging, retired = f"{path}.partial", f"{path}.old"
+    for leftover in (staging, retired):
+        shutil.rmtree(leftover, ignore_errors=True)
+
+    pa.dataset.write_dataset(
+        table,
+        staging,
+        format="parquet",
+        partitioning=_partitioning(pa),
+        basename_template="part-{i}.parquet"
+    )
+    if os.path.exists(path):
+        os.replace(path, retired)
+    os.replace(staging, path)
+    shutil.rmtree(retired, ignore_errors=True)
+    return len(frame)
+
+
+def convert_csv_dir(universe, csv_dir=None, store_dir=STORE_DIR,
+                    price_dtype="float64"):
+    """Build the store of ``universe`` from a folder of <TICKER>.csv files."""
+    csv_dir = csv_dir or CSV_DIRS[universe]
+
+    frames = []
+    for path in sorted(glob.glob(os.path.join(csv_dir, "*.csv"))):
+        ticker = os.path.splitext(os.path.basename(path))[0]
+        frames.append(pd.read_csv(path).assign(Ticker=ticker))
+
+    if not frames:
+        raise FileNotFoundError(f"No per-ticker CSV files in {csv_dir}")
+
+    return write_store(
+        pd.concat(frames, ignore_index=True), universe, store_dir, price_dtype
+    )
+
+
+def convert_dump(path, universe, store_dir=STORE_DIR, price_dtype="float64"):
+    """Build the store of ``universe`` from an AmarStock dump (one CSV)."""
+    frame = pd.read_csv(path, usecols=["Ticker"] + COLUMNS)
+    frame["Date"] = pd.to_datetime(frame["Date"])
+    return write_store(frame, universe, store_dir, price_dtype)
+
+
+# ==================================================
+# Loading
+# ==================================================
+def load_tickers(tickers=None, universe="Unadjusted", columns=None,
+                 start=None, end=None, store_dir=STORE_DIR,
+                 csv_dir=None) -> pd.DataFrame:
+    """
+    Long frame (Ticker, Date, ...) for several tickers.
+
+    ``tickers=None`` loads the whole universe. Ticker and date filters are
+    pushed down to the Parquet reader; without a store the per-ticker CSV
+    files under ``csv_dir`` are read instead.
+    """
+    tickers = None if tickers is None else list(tickers)
+    with stage("load", universe=universe,
+               tickers="all" if tickers is None else len(tickers)) as record:
+        frame = _load_tickers(tickers, universe, columns, start, end,
+                              store_dir, csv_dir)
+        record.rows = len(frame)
+    return frame
+
+
+def _load_tickers(tickers, universe, columns, start, end, store_dir, csv_dir):
+    columns = [c for c in (columns or COLUMNS) if c != "Date"]
+
+    if has_store(universe, store_dir):
+        pa = _pyarrow()
+        ds = pa.dataset
+
+        dataset = ds.dataset(
+            store_path(universe, store_dir),
+            format="parquet",
+            partitioning=_partitioning(pa)
+        )
+
+        conditions = []
+        if tickers is not None:
+            conditions.append(ds.field("Ticker").isin(list(tickers)))
+        if start is not None:
+            conditions.append(ds.field("Date") >= _date32(pa, start))
+        if end is not None:
+            conditions.append(ds.field("Date") <= _date32(pa, end))
+
+        predicate = None
+        for condition in conditions:
+            predicate = condition if predicate is None else predicate & condition
+
+        table = dataset.to_table(
+            columns=["Ticker", "Date"] + columns,
+            filter=predicate
+        )
+        frame = table.to_pandas(date_as_object=False)
+        frame["Ticker"] = frame["Ticker"].astype(str)
+        return frame.sort_values(["Ticker", "Date"], kind="stable", ignore_index=True)
+
+    csv_dir = csv_dir or CSV_DIRS[universe]
+    if tickers is None:
+        tickers = [
+            os.path.splitext(os.path.basename(p))[0]
+            for p in sorted(glob.glob(os.path.join(csv_dir, "*.csv")))
+        ]
+
+    frames = []
+    for ticker in tickers:
+        try:
+            data = read_ticker_csv(ticker, csv_dir)
+        except KeyError:
+            continue
+        if start is not None:
+            data = data[data["Date"] >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data["Date"] <= pd.Timestamp(end)]
+        frames.append(data[["Date"] + columns].assign(Ticker=ticker))
+
+    if not frames:
+        return pd.DataFrame(columns=["Ticker", "Date"] + columns)
+
+    frame = pd.concat(frames, ignore_index=True)
+    return frame[["Ticker", "Date"] + columns]
+
+
+def load_ticker(ticker, universe="Unadjusted", columns=None,
+                start=None, end=None, store_dir=STORE_DIR,
+                csv_dir=None) -> pd.DataFrame:
+    """
+    EoD data of one ticker indexed by ``Date`` (sorted ascending).
+
+    Raises ``KeyError`` when the ticker is in neither the store nor the
+    CSV folder.
+    """
+    frame = load_tickers(
+        [ticker], universe, columns, start, end, store_dir, csv_dir
+    )
+    if frame.empty and not (start or end):
+        raise KeyError(ticker)
+    return frame.drop(columns="Ticker").set_index("Date")
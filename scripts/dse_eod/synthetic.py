@@ -0,0 +1,199 @@
+"""
+Synthetic AmarStock-Shaped Data
+
+Generates inputs with the layout of the real sources at any scale, for
+benchmarks and dry runs of the pipeline:
+
+- Adjusted-AmarStock.csv / UnAdjusted-AmarStock.csv:
+  Date, Ticker, Open, High, Low, Close, Volume (sorted by ticker, date)
+- data_sample/Unadjusted/<TICKER>.csv for the reference tickers the
+  experiments read
+
+The calendar follows the DSE rules (Sunday to Thursday sessions, a few
+holidays, the odd Saturday make-up session). Every ticker trades over a
+random listing window (the reference tickers the whole span);
+``missing`` is the fraction of its sessions
+lost to suspensions (runs of sessions) and one-version gaps, and the
+adjusted prices carry occasional corporate-action factors.
+
+Tickers are written one at a time, so memory stays at one ticker's
+history whatever the scale.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.availability import DATASET_START, AvailabilityMatrix
+from dse_eod.calendar import is_weekend
+
+
+# Tickers read by the experiments (see scripts/experiments/)
+REFERENCE_TICKERS = [
+    "1JANATAMF",
+    "AAMRANET",
+    "BATBC",
+    "GP",
+    "SQURPHARMA",
+    "TB20Y0744",
+]
+
+# Share of generated tickers per instrument family (name pattern)
+FAMILIES = [
+    ("EQ{:05d}", 0.80),
+    ("{:05d}MF", 0.08),
+    ("TB{:05d}", 0.06),
+    ("BOND{:05d}", 0.03),
+    ("SUKUK{:05d}", 0.01),
+    ("00IDX{:05d}", 0.02),
+]
+
+HOLIDAY_RATE = 0.03   # weekdays closed
+MAKEUP_RATE = 0.005   # Saturdays traded
+VERSION_GAP = 0.1     # share of ``missing`` that hits one version only
+
+
+def session_dates(start, n_days, rng) -> np.ndarray:
+    """Synthetic DSE sessions within ``n_days`` calendar days."""
+    dates = np.datetime64(start, "D") + np.arange(n_days)
+    weekend = is_weekend(dates)
+    saturday = weekend & (dates.astype(np.int64) % 7 == 2)  # 1970-01-03
+
+    open_day = np.where(
+        weekend,
+        saturday & (rng.random(n_days) < MAKEUP_RATE),
+        rng.random(n_days) >= HOLIDAY_RATE
+    )
+    return dates[open_day]
+
+
+def ticker_names(n_tickers) -> list:
+    """The reference tickers plus names spread over the families, sorted."""
+    names = list(REFERENCE_TICKERS[:n_tickers])
+    remaining = n_tickers - len(names)
+
+    counts = [int(remaining * share) for _, share in FAMILIES]
+    counts[0] += remaining - sum(counts)
+    for (pattern, _), count in zip(FAMILIES, counts):
+        names.extend(pattern.format(i) for i in range(count))
+    return sorted(names)
+
+
+def _listed(n_sessions, missing, rng, full=False) -> np.ndarray:
+    """Boolean mask of the sessions a ticker trades."""
+    lo, hi = np.sort(rng.integers(0, n_sessions, size=2))
+    if full or rng.random() < 0.3:  # listed over the whole span
+        lo, hi = 0, n_sessions - 1
+
+    traded = np.zeros(n_sessions, dtype=bool)
+    traded[lo:hi + 1] = True
+
+    # Suspensions: runs of missed sessions totalling ``missing``
+    length = hi - lo + 1
+    lost = int(length * missing * (1 - VERSION_GAP))
+    while lost > 0:
+        run = min(lost, int(rng.integers(1, 21)))
+        at = lo + int(rng.integers(0, length))
+        traded[at:at + run] = False
+        lost -= run
+    return traded
+
+
+def ticker_frames(dates, missing, rng, full=False):
+    """(unadjusted, adjusted) OHLCV frames of one ticker."""
+    dates = dates[_listed(len(dates), missing, rng, full)]
+    n = len(dates)
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = np.abs(rng.normal(0, 0.01, n))
+    unadjusted = pd.DataFrame({
+        "Date": np.datetime_as_string(dates, unit="D"),
+        "Open": (close * (1 + rng.normal(0, 0.005, n))).round(2),
+        "High": (close * (1 + spread)).round(2),
+        "Low": (close * (1 - spread)).round(2),
+        "Close": close.round(2),
+        "Volume": rng.integers(0, 100_000, n),
+    })
+    unadjusted["High"] = unadjusted[["Open", "High", "Close"]].max(axis=1)
+    unadjusted["Low"] = unadjusted[["Open", "Low", "Close"]].min(axis=1)
+
+    # Corporate actions: backward-cumulated price factors
+    events = rng.random(n) < 0.002
+    factor = np.cumprod(np.where(events, rng.uniform(0.5, 0.95, n), 1.0)[::-1])[::-1]
+    factor = np.r_[factor[1:], 1.0]
+    adjusted = unadjusted.copy()
+    for column in ("Open", "High", "Low", "Close"):
+        adjusted[column] = (unadjusted[column] * factor).round(2)
+
+    # Rows present in one version only
+    gap = missing * VERSION_GAP
+    keep_u = rng.random(n) >= gap / 2
+    keep_a = rng.random(n) >= gap / 2
+    return unadjusted[keep_u].copy(), adjusted[keep_a].copy()
+
+
+def generate_dumps(directory, n_tickers=100, n_days=4865, missing=0.05,
+                   start=DATASET_START, seed=0, sample=True) -> dict:
+    """
+    Write the synthetic dumps (and, with ``sample``, the per-ticker
+    sample CSVs) under ``directory``. Returns their row counts and the
+    calendar bounds.
+    """
+    rng = np.random.default_rng(seed)
+    dates = session_dates(start, n_days, rng)
+
+    os.makedirs(directory, exist_ok=True)
+    sample_dir = os.path.join(directory, "data_sample", "Unadjusted")
+    if sample:
+        os.makedirs(sample_dir, exist_ok=True)
+
+    paths = {
+        "Unadjusted": os.path.join(directory, "UnAdjusted-AmarStock.csv"),
+        "Adjusted": os.path.join(directory, "Adjusted-AmarStock.csv"),
+    }
+    rows = dict.fromkeys(paths, 0)
+    header = True
+
+    for ticker in ticker_names(n_tickers):
+        reference = ticker in REFERENCE_TICKERS
+        unadjusted, adjusted = ticker_frames(dates, missing, rng, full=reference)
+
+        for universe, frame in (("Unadjusted", unadjusted), ("Adjusted", adjusted)):
+            frame.insert(1, "Ticker", ticker)
+            frame.to_csv(paths[universe], mode="w" if header else "a",
+                         header=header, index=False)
+            rows[universe] += len(frame)
+        header = False
+
+        if sample and reference:
+            unadjusted.drop(columns="Ticker").to_csv(
+                os.path.join(sample_dir, f"{ticker}.csv"), index=False
+            )
+
+    return {
+        "start": str(np.datetime64(start, "D")),
+        "end": str(np.datetime64(start, "D") + n_days - 1),
+        "sessions": len(dates),
+        "rows": rows,
+    }
+
+
+def synthetic_matrix(n_tickers, n_days, seed=0, start=DATASET_START):
+    """Random listing windows with ~90% both / 5% adjusted / 5% unadjusted."""
+    rng = np.random.default_rng(seed)
+
+    bounds = np.sort(rng.integers(0, n_days, size=(n_tickers, 2)), axis=1)
+    lengths = bounds[:, 1] - bounds[:, 0] + 1
+
+    ticker_idx = np.repeat(np.arange(n_tickers), lengths)
+    day_idx = (
+        np.repeat(bounds[:, 0], lengths)
+        + np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    )
+    codes = rng.choice([1, 2, 3], size=len(day_idx), p=[0.05, 0.05, 0.9])
+
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    return AvailabilityMatrix.from_codes(
+        ticker_idx, day_idx, codes, tickers, start, n_days
+    )
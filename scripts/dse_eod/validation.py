@@ -0,0 +1,317 @@
+"""
+OHLCV Integrity Checks
+
+Validates EoD rows (Date, Ticker, Open, High, Low, Close, Volume) as
+they are read, chunk by chunk, with every check vectorized over the
+chunk:
+
+- high_below_open_close:  High < max(Open, Close)
+- low_above_open_close:   Low > min(Open, Close)
+- missing_value:          an empty or non-numeric price or volume
+- negative_volume:        Volume < 0
+- missing_ticker:         an empty Ticker
+- invalid_date:           an empty Date or one that does not parse
+- weekend_date:           a Friday or Saturday row (DSE make-up
+                          Saturdays land here too; they are for review)
+- unsorted_date:          a date earlier than the ticker's previous row
+- duplicate_date:         a (ticker, date) seen before (later rows flagged)
+
+Sources are an AmarStock dump (``validate_dump``) or a folder of
+per-ticker CSV files (``validate_csv_dir``). Besides one chunk, memory
+holds a last-date slot per ticker. Only the tickers with unsorted
+dates are read a second time, keeping an int64 (ticker, date) key plus
+a line number per row of theirs, to find repeats of older dates.
+
+``report`` condenses the row-level violations into one row per
+(source, ticker, check).
+"""
+
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.calendar import is_weekend
+from dse_eod.profiling import stage
+
+
+# ==================================================
+# Configuration
+# ==================================================
+REPORT_PATH = "metadata/ohlcv_violations.csv"
+
+CHUNK_SIZE = 500_000
+DATE_FORMAT = "ISO8601"
+CSV_BATCH = 200  # per-ticker files validated together
+
+CHECKS = (
+    "high_below_open_close",
+    "low_above_open_close",
+    "missing_value",
+    "negative_volume",
+    "missing_ticker",
+    "invalid_date",
+    "weekend_date",
+    "unsorted_date",
+    "duplicate_date",
+)
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+COLUMNS = ["Date", "Ticker"] + PRICE_COLUMNS + ["Volume"]
+
+DETAIL_COLUMNS = ["Source", "Line", "Ticker", "Date", "Check"]
+REPORT_COLUMNS = [
+    "Source",
+    "Ticker",
+    "Check",
+    "Rows",
+    "First_Date",
+    "Last_Date",
+    "First_Line",
+]
+
+_DAY_BIAS = 1 << 31
+_NO_DAY = np.iinfo(np.int64).min
+_NO_TICKER = ""  # reported name of rows with an empty Ticker
+
+
+class Validator:
+    """
+    Accumulates the violations of one source over its chunks.
+
+    ``check`` streams every row once. Duplicates of the previous row of
+    the same ticker are caught there; a ticker whose dates go backwards
+    can also repeat an older date, so those tickers (``recheck``) are
+    read again through ``collect`` and sorted in ``finish``.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.rows = 0
+        self._ticker_ids = {}
+        self._last_day = np.empty(0, dtype=np.int64)
+        self._unsorted = np.empty(0, dtype=bool)
+        self._keys, self._lines = [], []
+        self._found = []  # (lines, ticker ids, days, check codes)
+
+    def _flag(self, mask, lines, ids, days, check):
+        hit = np.flatnonzero(mask)
+        if len(hit):
+            self._found.append((
+                lines[hit], ids[hit], days[hit],
+                np.full(len(hit), CHECKS.index(check), dtype=np.int8),
+            ))
+
+    def _decode(self, chunk):
+        """Global ticker ids, day numbers and the rows lacking a ticker."""
+        tickers = chunk["Ticker"].astype("category")
+        names = list(tickers.cat.categories.astype(str)) + [_NO_TICKER]
+        to_global = np.array(
+            [self._ticker_ids.setdefault(t, len(self._ticker_ids)) for t in names],
+            dtype=np.int64
+        )
+        codes = tickers.cat.codes.to_numpy()  # -1: empty cell
+        ids = to_global[codes]
+
+        dates = chunk["Date"].astype("category")
+        parsed = pd.to_datetime(dates.cat.categories, format=DATE_FORMAT,
+                                errors="coerce")
+        category_days = np.r_[
+            np.where(parsed.isna(), _NO_DAY,
+                     parsed.to_numpy().astype("datetime64[D]").astype(np.int64)),
+            _NO_DAY,
+        ]
+        days = category_days[dates.cat.codes.to_numpy()]
+
+        n = len(self._ticker_ids)
+        if len(self._last_day) < n:
+            self._last_day = np.r_[
+                self._last_day, np.full(n - len(self._last_day), _NO_DAY)
+            ]
+            self._unsorted = np.r_[
+                self._unsorted, np.zeros(n - len(self._unsorted), dtype=bool)
+            ]
+        return ids, days, codes < 0
+
+    def check(self, chunk, lines):
+        """
+        Validate ``chunk`` (COLUMNS, in file order); ``lines`` are the
+        file line numbers of its rows.
+        """
+        lines = np.asarray(lines, dtype=np.int64)
+        self.rows += len(chunk)
+
+        ids, days, no_ticker = self._decode(chunk)
+        dated = days != _NO_DAY
+
+        # Row-wise value checks (a column with stray text parses as object)
+        values = {c: pd.to_numeric(chunk[c], errors="coerce").to_numpy(dtype=float)
+                  for c in PRICE_COLUMNS + ["Volume"]}
+        o, h, lo, c = (values[k] for k in PRICE_COLUMNS)
+        missing = np.isnan(np.column_stack(list(values.values()))).any(axis=1)
+
+        self._flag(h < np.fmax(o, c), lines, ids, days, "high_below_open_close")
+        self._flag(lo > np.fmin(o, c), lines, ids, days, "low_above_open_close")
+        self._flag(missing, lines, ids, days, "missing_value")
+        self._flag(values["Volume"] < 0, lines, ids, days, "negative_volume")
+        self._flag(no_ticker, lines, ids, days, "missing_ticker")
+        self._flag(~dated, lines, ids, days, "invalid_date")
+        weekend = np.zeros(len(days), dtype=bool)
+        weekend[dated] = is_weekend(days[dated].astype("datetime64[D]"))
+        self._flag(weekend, lines, ids, days, "weekend_date")
+
+        # Order: each row against the ticker's previous dated row
+        at = np.flatnonzero(dated & ~no_ticker)
+        at = at[np.argsort(ids[at], kind="stable")]
+        sid, sday = ids[at], days[at]
+        previous = np.empty(len(at), dtype=np.int64)
+        if len(at):
+            first = np.r_[True, sid[1:] != sid[:-1]]
+            previous[~first] = sday[:-1][~first[1:]]
+            previous[first] = self._last_day[sid[first]]
+            last = np.r_[sid[1:] != sid[:-1], True]
+            self._last_day[sid[last]] = sday[last]
+
+        unsorted = np.zeros(len(days), dtype=bool)
+        unsorted[at] = (previous != _NO_DAY) & (sday < previous)
+        repeat = np.zeros(len(days), dtype=bool)
+        repeat[at] = sday == previous
+        self._unsorted[ids[unsorted]] = True
+
+        self._flag(unsorted, lines, ids, days, "unsorted_date")
+        self._flag(repeat, lines, ids, days, "duplicate_date")
+
+    @property
+    def recheck(self) -> list:
+        """Tickers whose dates go backwards somewhere."""
+        names = np.array(list(self._ticker_ids), dtype=object)
+        return list(names[self._unsorted])
+
+    def collect(self, chunk, lines):
+        """Second pass: keep the (ticker, date) keys of ``recheck`` tickers."""
+        lines = np.asarray(lines, dtype=np.int64)
+        ids, days, no_ticker = self._decode(chunk)
+        keep = self._unsorted[ids] & (days != _NO_DAY) & ~no_ticker
+
+        self._keys.append((ids[keep] << 32) | (days[keep] + _DAY_BIAS))
+        self._lines.append(lines[keep])
+
+    def finish(self):
+        """Redo the duplicate check of the ``recheck`` tickers over all their rows."""
+        if not self._keys:
+            return
+        keys = np.concatenate(self._keys)
+        lines = np.concatenate(self._lines)
+        self._keys, self._lines = [], []
+
+        # Their adjacent repeats were flagged by ``check`` already
+        code = CHECKS.index("duplicate_date")
+        self._found = [
+            tuple(a[keep] for a in part)
+            for part in self._found
+            for keep in [~((part[3] == code) & self._unsorted[part[1]])]
+        ]
+
+        order = np.lexsort((lines, keys))
+        keys, lines = keys[order], lines[order]
+        repeat = np.r_[False, keys[1:] == keys[:-1]]
+        self._flag(repeat, lines, keys >> 32,
+                   (keys & 0xFFFFFFFF) - _DAY_BIAS, "duplicate_date")
+
+    def violations(self) -> pd.DataFrame:
+        """One row per violation (DETAIL_COLUMNS), by line."""
+        if not self._found:
+            return pd.DataFrame(columns=DETAIL_COLUMNS)
+
+        lines, ids, days, checks = (np.concatenate(p) for p in zip(*self._found))
+        names = np.array(list(self._ticker_ids), dtype=object)
+        dates = np.where(days == _NO_DAY, np.datetime64("NaT"),
+                         days.astype("datetime64[D]"))
+
+        frame = pd.DataFrame({
+            "Source": self.source,
+            "Line": lines,
+            "Ticker": names[ids],
+            "Date": dates,
+            "Check": np.array(CHECKS)[checks],
+        }, columns=DETAIL_COLUMNS)
+        return frame.sort_values(["Line", "Check"], kind="stable", ignore_index=True)
+
+
+# ==================================================
+# Sources
+# ==================================================
+def _dump_chunks(path, chunksize, usecols=COLUMNS):
+    """(chunk, file line numbers) of an AmarStock dump."""
+    reader = pd.read_csv(path, usecols=usecols, chunksize=chunksize,
+                         dtype={"Date": "category", "Ticker": "category"})
+    line = 2  # after the header
+    for chunk in reader:
+        yield chunk, np.arange(line, line + len(chunk))
+        line += len(chunk)
+
+
+def validate_dump(path, chunksize=CHUNK_SIZE) -> pd.DataFrame:
+    """Row-level violations of an AmarStock dump, read in chunks."""
+    validator = Validator(path)
+    with stage("validate", source=path, chunksize=chunksize) as record:
+        for chunk, lines in _dump_chunks(path, chunksize):
+            validator.check(chunk, lines)
+        if validator.recheck:
+            for chunk, lines in _dump_chunks(path, chunksize, ["Date", "Ticker"]):
+                validator.collect(chunk, lines)
+        validator.finish()
+        record.rows = validator.rows
+    return validator.violations()
+
+
+def _csv_batches(paths, batch, usecols):
+    """(chunk, file line numbers) of ``batch`` <TICKER>.csv files at a time."""
+    for lo in range(0, len(paths), batch):
+        frames, lines = [], []
+        for path in paths[lo:lo + batch]:
+            ticker = os.path.splitext(os.path.basename(path))[0]
+            frame = pd.read_csv(path, usecols=usecols, dtype={"Date": str})
+            frames.append(frame.assign(Ticker=ticker))
+            lines.append(np.arange(2, len(frame) + 2))
+        if frames:
+            yield pd.concat(frames, ignore_index=True), np.concatenate(lines)
+
+
+def validate_csv_dir(csv_dir, batch=CSV_BATCH) -> pd.DataFrame:
+    """Row-level violations of a folder of <TICKER>.csv files."""
+    validator = Validator(csv_dir)
+    paths = sorted(glob.glob(os.path.join(csv_dir, "*.csv")))
+    columns = [c for c in COLUMNS if c != "Ticker"]
+
+    with stage("validate", source=csv_dir, files=len(paths)) as record:
+        for chunk, lines in _csv_batches(paths, batch, columns):
+            validator.check(chunk, lines)
+        recheck = [os.path.join(csv_dir, f"{t}.csv") for t in validator.recheck]
+        for chunk, lines in _csv_batches(recheck, batch, ["Date"]):
+            validator.collect(chunk, lines)
+        validator.finish()
+        record.rows = validator.rows
+    return validator.violations()
+
+
+def report(violations) -> pd.DataFrame:
+    """One row per (source, ticker, check): count, date range, first line."""
+    if violations.empty:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    summary = violations.groupby(["Source", "Ticker", "Check"], sort=False).agg(
+        Rows=("Line", "size"),
+        First_Date=("Date", "min"),
+        Last_Date=("Date", "max"),
+        First_Line=("Line", "min"),
+    ).reset_index()
+
+    rank = {check: i for i, check in enumerate(CHECKS)}
+    summary = summary.sort_values(
+        ["Source", "Ticker", "Check"],
+        key=lambda col: col.map(rank) if col.name == "Check" else col,
+        kind="stable", ignore_index=True
+    )
+    return summary[REPORT_COLUMNS]
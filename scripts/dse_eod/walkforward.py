@@ -0,0 +1,227 @@
+"""
+Walk-Forward Backtesting
+
+Evaluates a model over successive forecast origins instead of a single
+train/test split. The series is cut into folds:
+
+- expanding windows: every fold trains on everything before its origin
+- sliding windows: every fold trains on the last ``window_size``
+  observations before its origin
+
+and each fold forecasts the ``horizon`` observations after its origin.
+Origins are ``step`` observations apart; ``step`` is the refit cadence,
+so a series of n observations costs at most (n - initial) / step fits
+(capped by ``max_folds``, which keeps the most recent folds), never one
+fit per test observation as in the exact rolling scheme of A1.
+
+Within a fold the test observations are forecast either
+
+- "one-step": one step ahead each, the fitted model being run over the
+  fold's test data with its parameters held fixed (a filter pass), or
+- "multi-step": 1..horizon steps ahead from the origin.
+
+Fits go through ``dse_eod.models``: with the statsmodels backend the
+folds are fitted concurrently across worker processes
+(``dse_eod.runner.run_parallel``); the NumPy backend fits every fold of
+every series in one batch. RMSE and MAE are computed for all folds at
+once on a (folds, horizon) error array.
+"""
+
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from dse_eod.models import (
+    fit_arima,
+    fit_arima_many,
+    predict_one_step,
+    predict_one_step_many,
+)
+from dse_eod.runner import run_parallel
+
+
+WINDOWS = ("expanding", "sliding")
+MODES = ("one-step", "multi-step")
+
+FOLD_COLUMNS = [
+    "Ticker",
+    "Fold",
+    "Train_Start",
+    "Train_End",
+    "Test_Start",
+    "Test_End",
+    "Train_Size",
+    "Test_Size",
+    "AIC",
+    "BIC",
+    "RMSE",
+    "MAE",
+]
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Positions of one fold: train [train_start, origin), test [origin, end)."""
+    number: int
+    train_start: int
+    origin: int
+    end: int
+
+
+def make_folds(n_obs, initial, horizon, step=None, window="expanding",
+               window_size=None, max_folds=None) -> list:
+    """
+    Folds over a series of ``n_obs`` observations. The first origin is
+    ``initial``; origins advance by ``step`` (default ``horizon``) while
+    a full horizon of test data remains.
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown window {window!r}; choose from {WINDOWS}.")
+    step = horizon if step is None else step
+    window_size = initial if window_size is None else window_size
+    if min(initial, horizon, step, window_size) < 1:
+        raise ValueError("initial, horizon, step and window_size must be positive.")
+
+    origins = np.arange(initial, n_obs - horizon + 1, step)
+    if max_folds is not None:
+        origins = origins[len(origins) - min(max_folds, len(origins)):]
+
+    return [
+        Fold(
+            number=i + 1,
+            train_start=0 if window == "expanding" else max(0, int(o) - window_size),
+            origin=int(o),
+            end=int(o) + horizon,
+        )
+        for i, o in enumerate(origins)
+    ]
+
+
+# ==================================================
+# Metrics
+# ==================================================
+def fold_errors(actuals, forecasts) -> np.ndarray:
+    """(folds, horizon) forecast errors, NaN-padded for shorter folds."""
+    width = max((len(a) for a in actuals), default=0)
+    errors = np.full((len(actuals), width), np.nan)
+    for i, (actual, forecast) in enumerate(zip(actuals, forecasts)):
+        errors[i, :len(actual)] = np.asarray(forecast, dtype=float) - actual
+    return errors
+
+
+def fold_metrics(errors) -> dict:
+    """RMSE and MAE of every row of ``errors`` (NaN ignored)."""
+    valid = ~np.isnan(errors)
+    count = np.maximum(valid.sum(axis=1), 1)
+    squared = np.where(valid, errors * errors, 0.0).sum(axis=1)
+    absolute = np.where(valid, np.abs(errors), 0.0).sum(axis=1)
+    return {
+        "RMSE": np.sqrt(squared / count),
+        "MAE": absolute / count,
+    }
+
+
+# ==================================================
+# Evaluation
+# ==================================================
+def evaluate_fold(job, order, mode="one-step", backend="statsmodels",
+                  cache=None):
+    """
+    Fit one (ticker, fold number, train, test) job and forecast its test
+    window. Returns (fit, forecast); module-level so worker processes
+    can run it.
+    """
+    _, _, train, test = job
+
+    steps = len(test) if mode == "multi-step" else 0
+    fit = fit_arima(train, order, steps, backend=backend, cache=cache)
+    if mode == "multi-step":
+        return fit, fit.forecast
+    return fit, predict_one_step(train, test, order, fit)
+
+
+def _evaluate_batch(jobs, order, mode, cache):
+    """All jobs with one batched NumPy fit (and one filter pass)."""
+    trains = [train for _, _, train, _ in jobs]
+    tests = [test for _, _, _, test in jobs]
+
+    if mode == "multi-step":
+        fits = fit_arima_many(trains, order, [len(t) for t in tests], cache=cache)
+        return [(fit, fit.forecast) for fit in fits]
+
+    fits = fit_arima_many(trains, order, 0, cache=cache)
+    return list(zip(fits, predict_one_step_many(trains, tests, order, fits)))
+
+
+def walk_forward(series, order, initial, horizon, step=None,
+                 window="expanding", window_size=None, max_folds=None,
+                 mode="one-step", backend="statsmodels", cache=None,
+                 workers=None, threads_per_worker=1) -> pd.DataFrame:
+    """
+    Walk-forward evaluation of ARIMA ``order`` on every series of
+    ``series`` ({ticker: pd.Series}); one row per fold (FOLD_COLUMNS).
+    Series too short for a single fold get no rows.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; choose from {MODES}.")
+
+    folds, jobs = [], []
+    for ticker, values in series.items():
+        array = np.asarray(values, dtype=float)
+        for fold in make_folds(len(array), initial, horizon, step, window,
+                               window_size, max_folds):
+            folds.append((ticker, values.index, fold))
+            jobs.append((ticker, fold.number,
+                         array[fold.train_start:fold.origin],
+                         array[fold.origin:fold.end]))
+
+    if not jobs:
+        return pd.DataFrame(columns=FOLD_COLUMNS)
+
+    if backend == "numpy":
+        outcomes = _evaluate_batch(jobs, order, mode, cache)
+    else:
+        done = run_parallel(
+            partial(evaluate_fold, order=order, mode=mode, backend=backend,
+                    cache=cache),
+            jobs,
+            workers=workers,
+            threads_per_worker=threads_per_worker,
+        )
+        # Folds complete out of order with several workers
+        position = {job[:2]: i for i, job in enumerate(jobs)}
+        outcomes = [None] * len(jobs)
+        for job, outcome in done:
+            outcomes[position[job[:2]]] = outcome
+
+    metrics = fold_metrics(fold_errors([test for _, _, _, test in jobs],
+                                       [forecast for _, forecast in outcomes]))
+
+    return pd.DataFrame({
+        "Ticker": [ticker for ticker, _, _ in folds],
+        "Fold": [fold.number for _, _, fold in folds],
+        "Train_Start": [index[fold.train_start] for _, index, fold in folds],
+        "Train_End": [index[fold.origin - 1] for _, index, fold in folds],
+        "Test_Start": [index[fold.origin] for _, index, fold in folds],
+        "Test_End": [index[fold.end - 1] for _, index, fold in folds],
+        "Train_Size": [fold.origin - fold.train_start for _, _, fold in folds],
+        "Test_Size": [fold.end - fold.origin for _, _, fold in folds],
+        "AIC": [fit.aic for fit, _ in outcomes],
+        "BIC": [fit.bic for fit, _ in outcomes],
+        "RMSE": metrics["RMSE"],
+        "MAE": metrics["MAE"],
+    }, columns=FOLD_COLUMNS)
+
+
+def summarize(folds) -> pd.DataFrame:
+    """Per-ticker fold count and mean / standard deviation of the errors."""
+    return folds.groupby("Ticker", sort=False).agg(
+        Folds=("Fold", "size"),
+        Test_Observations=("Test_Size", "sum"),
+        RMSE_Mean=("RMSE", "mean"),
+        RMSE_STD=("RMSE", "std"),
+        MAE_Mean=("MAE", "mean"),
+        MAE_STD=("MAE", "std"),
+    ).reset_index()
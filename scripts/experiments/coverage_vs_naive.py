@@ -3,18 +3,28 @@ Coverage-Aware vs Naive Modeling Comparison
 
 Demonstrates distortion caused by ignoring listing start dates
 using AAMRANET as case study.
+
+Fits are cached in .cache/fits (--no-cache refits).
+
+With --longest-segment the coverage-aware model only uses the ticker's
+longest clean trading segment from metadata/trading_segments.csv
+(gaps of up to --max-gap sessions are bridged).
+
+Log prices and returns come from the feature cache
+(scripts/build_features.py) when one is built. statsmodels and scikit-learn are imported when the
+comparison runs, not when the module is imported.
 """
 
-import pandas as pd
-import numpy as np
+import argparse
 import os
+import sys
 import warnings
-
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.metrics import mean_squared_error, mean_absolute_error
 from math import sqrt
 
-warnings.filterwarnings("ignore")
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 # ==================================================
 # Configuration
@@ -27,106 +37,166 @@ RESULT_DIR = "results/tables"
 ARIMA_ORDER = (1, 0, 1)
 TRAIN_RATIO = 0.8
 
-os.makedirs(RESULT_DIR, exist_ok=True)
 
-# ==================================================
-# Load Data
-# ==================================================
+def evaluate(returns, backend, cache):
+    """Fit on the first TRAIN_RATIO of ``returns``; forecast the rest."""
+    from sklearn.metrics import mean_squared_error, mean_absolute_error
 
-path = os.path.join(DATA_DIR, f"{TICKER}.csv")
-data = pd.read_csv(path)
+    from dse_eod.models import fit_arima
 
-data["Date"] = pd.to_datetime(data["Date"], format="%Y-%m-%d")
-data = data.sort_values("Date")
-data.set_index("Date", inplace=True)
+    split = int(len(returns) * TRAIN_RATIO)
+    train = returns.iloc[:split]
+    test = returns.iloc[split:]
 
-prices_actual = data["Close"].astype(float).dropna()
+    fit = fit_arima(train, ARIMA_ORDER, len(test), backend=backend,
+                    cache=cache)
 
-# ==================================================
-# MODEL A — Coverage-Aware
-# ==================================================
+    rmse = sqrt(mean_squared_error(test, fit.forecast))
+    mae = mean_absolute_error(test, fit.forecast)
+    return fit, rmse, mae
 
-log_prices_A = np.log(prices_actual)
-returns_A = log_prices_A.diff().dropna()
 
-split_A = int(len(returns_A) * TRAIN_RATIO)
-train_A = returns_A.iloc[:split_A]
-test_A = returns_A.iloc[split_A:]
+def load_log_prices():
+    """Log Close prices of TICKER (feature cache when built)."""
+    from dse_eod.features import shared_features
+    from dse_eod.store import load_ticker
 
-model_A = ARIMA(train_A, order=ARIMA_ORDER)
-fit_A = model_A.fit()
+    features = shared_features(refresh=True)
+    if features is not None and TICKER in features:
+        return features.series(TICKER, "log_close")
 
-forecast_A = fit_A.forecast(steps=len(test_A))
+    # Columnar store when built, otherwise DATA_DIR/<TICKER>.csv
+    data = load_ticker(TICKER, csv_dir=DATA_DIR)
 
-rmse_A = sqrt(mean_squared_error(test_A, forecast_A))
-mae_A = mean_absolute_error(test_A, forecast_A)
+    prices_actual = data["Close"].astype(float).dropna()
+    return np.log(prices_actual)
 
-# ==================================================
-# MODEL B — Naive (Backward Forward-Fill)
-# ==================================================
 
-# Create full date index from dataset start
-full_dates = pd.date_range(
-    start="2012-10-01",
-    end=prices_actual.index.max(),
-    freq="D"
-)
+def load_log_returns(log_prices):
+    """Log returns of TICKER between observed rows (feature cache when built)."""
+    from dse_eod.features import shared_features
 
-df_full = pd.DataFrame(index=full_dates)
-df_full = df_full.join(prices_actual.rename("Close"))
+    features = shared_features()
+    if features is not None and TICKER in features:
+        return features.series(TICKER, "log_return")
+    return log_prices.diff().dropna()
 
-# Forward-fill (backward to pre-listing period)
-df_full["Close"] = df_full["Close"].ffill()
 
-# Drop remaining NaNs (if any at beginning)
-df_full = df_full.dropna()
+def coverage_aware_returns(returns, args):
+    """MODEL A — Coverage-Aware: returns between observed prices only."""
+    from dse_eod.segments import load_segments, longest_segment
 
-log_prices_B = np.log(df_full["Close"])
-returns_B = log_prices_B.diff().dropna()
+    if not args.longest_segment:
+        return returns
 
-split_B = int(len(returns_B) * TRAIN_RATIO)
-train_B = returns_B.iloc[:split_B]
-test_B = returns_B.iloc[split_B:]
+    seg_start, seg_end = longest_segment(
+        load_segments(), TICKER, max_gap=args.max_gap
+    )
+    print(f"Longest segment: {seg_start.date()} to {seg_end.date()}")
 
-model_B = ARIMA(train_B, order=ARIMA_ORDER)
-fit_B = model_B.fit()
+    # The segment starts on an observed session; its return spans the
+    # gap before the segment
+    returns_A = returns.loc[seg_start:seg_end]
+    return returns_A[returns_A.index > seg_start]
 
-forecast_B = fit_B.forecast(steps=len(test_B))
 
-rmse_B = sqrt(mean_squared_error(test_B, forecast_B))
-mae_B = mean_absolute_error(test_B, forecast_B)
+def naive_filled_returns(log_prices):
+    """MODEL B — Naive (Backward Forward-Fill) over every calendar day."""
+    import pandas as pd
 
-# ==================================================
-# Save Comparison
-# ==================================================
+    # Full date index from dataset start
+    full_dates = pd.date_range(
+        start="2012-10-01",
+        end=log_prices.index.max(),
+        freq="D"
+    )
+
+    # Forward-fill (backward to pre-listing period); the log commutes
+    # with the fill, so the observed log prices are filled directly.
+    # Remaining NaNs (if any at the beginning) are dropped.
+    log_prices_B = log_prices.reindex(full_dates).ffill().dropna()
+    return log_prices_B.diff().dropna()
+
+
+def main(argv=None):
+    from dse_eod.models import BACKENDS
+    from dse_eod.fit_cache import FitCache
+
+    warnings.filterwarnings("ignore")
+
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(
+        description="Coverage-aware vs naive modeling comparison."
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="statsmodels",
+                        help="ARIMA fitting backend.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Refit both models instead of using the fit cache.")
+    parser.add_argument("--longest-segment", action="store_true",
+                        help="Fit the coverage-aware model on the longest "
+                             "gap-free trading segment only.")
+    parser.add_argument("--max-gap", type=int, default=0,
+                        help="Missed sessions bridged by --longest-segment.")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else FitCache()
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+
+    # ==================================================
+    # Load Data
+    # ==================================================
+
+    log_prices = load_log_prices()
 
-results = pd.DataFrame([
-    {
-        "Model": "Coverage-Aware",
-        "Observations": len(returns_A),
-        "Return_STD": returns_A.std(),
-        "AIC": fit_A.aic,
-        "BIC": fit_A.bic,
-        "RMSE": rmse_A,
-        "MAE": mae_A
-    },
-    {
-        "Model": "Naive_Filled",
-        "Observations": len(returns_B),
-        "Return_STD": returns_B.std(),
-        "AIC": fit_B.aic,
-        "BIC": fit_B.bic,
-        "RMSE": rmse_B,
-        "MAE": mae_B
-    }
-])
-
-output_path = os.path.join(
-    RESULT_DIR,
-    "coverage_vs_naive_comparison.csv"
-)
-
-results.to_csv(output_path, index=False)
-
-print("\nCoverage-aware vs naive comparison completed.")
-print(f"Results saved to: {output_path}")
\ No newline at end of file
+    try:
+        returns_A = coverage_aware_returns(load_log_returns(log_prices), args)
+    except FileNotFoundError as exc:
+        raise SystemExit(exc)
+    fit_A, rmse_A, mae_A = evaluate(returns_A, args.backend, cache)
+
+    returns_B = naive_filled_returns(log_prices)
+    fit_B, rmse_B, mae_B = evaluate(returns_B, args.backend, cache)
+
+    # ==================================================
+    # Save Comparison
+    # ==================================================
+
+    results = pd.DataFrame([
+        {
+            "Model": "Coverage-Aware",
+            "Observations": len(returns_A),
+            "Return_STD": returns_A.std(),
+            "AIC": fit_A.aic,
+            "BIC": fit_A.bic,
+            "RMSE": rmse_A,
+            "MAE": mae_A
+        },
+        {
+            "Model": "Naive_Filled",
+            "Observations": len(returns_B),
+            "Return_STD": returns_B.std(),
+            "AIC": fit_B.aic,
+            "BIC": fit_B.bic,
+            "RMSE": rmse_B,
+            "MAE": mae_B
+        }
+    ])
+
+    output_path = os.path.join(
+        RESULT_DIR,
+        "coverage_vs_naive_comparison.csv"
+    )
+
+    results.to_csv(output_path, index=False)
+
+    if cache is not None:
+        cache.evict()
+
+    print("\nCoverage-aware vs naive comparison completed.")
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
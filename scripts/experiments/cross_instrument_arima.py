@@ -6,118 +6,252 @@ multiple instrument types using log returns.
 
 This experiment demonstrates structural heterogeneity
 in forecasting error and volatility across instrument categories.
+
+By default the five reference instruments below are evaluated.
+With --all, every Equity / MutualFund / TreasuryBill ticker in
+metadata/company_metadata.csv is evaluated across worker processes;
+rows are streamed to the result file as fits finish, and --resume
+skips tickers that already have a row. --backend numpy fits all
+tickers in one batched ARMA(1,1) estimation instead.
+
+Fits are cached in .cache/fits, so re-runs on unchanged data only
+recompute the metrics; --no-cache refits everything. Log returns come
+from the feature cache (scripts/build_features.py) when one is built.
 """
 
-import pandas as pd
-import numpy as np
+import argparse
+import csv
 import os
+import sys
 import warnings
-
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.metrics import mean_squared_error, mean_absolute_error
+from functools import partial
 from math import sqrt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dse_eod.features import shared_features  # noqa: E402
+from dse_eod.models import BACKENDS, fit_arima, fit_arima_many  # noqa: E402
+from dse_eod.fit_cache import FitCache  # noqa: E402
+from dse_eod.runner import CsvStream, completed_keys, run_parallel  # noqa: E402
+
+from experiments.instruments import (  # noqa: E402,F401 (re-exported)
+    COMPANY_METADATA_PATH,
+    DATA_DIR,
+    INSTRUMENTS,
+    STUDY_TYPES,
+    load_log_returns,
+    study_instruments,
+)
+
 warnings.filterwarnings("ignore")
 
 # ==================================================
 # Configuration
 # ==================================================
 
-INSTRUMENTS = {
-    "SQURPHARMA": "Equity",
-    "BATBC": "Equity",
-    "GP": "Equity",
-    "TB20Y0744": "TreasuryBill",
-    "1JANATAMF": "MutualFund"
-}
-
-DATA_DIR = "data_sample/Unadjusted"  # change if needed
 RESULT_DIR = "results/tables"
+OUTPUT_PATH = os.path.join(RESULT_DIR, "cross_instrument_metrics_returns.csv")
 
 ARIMA_ORDER = (1, 0, 1)
 TRAIN_RATIO = 0.8
 
-os.makedirs(RESULT_DIR, exist_ok=True)
+RESULT_COLUMNS = [
+    "Ticker",
+    "Instrument_Type",
+    "Observations",
+    "Train_Size",
+    "Test_Size",
+    "Return_STD",
+    "AIC",
+    "BIC",
+    "RMSE",
+    "MAE",
+]
 
-results = []
 
 # ==================================================
-# Loop Through Instruments
+# One Instrument
 # ==================================================
 
-for ticker, inst_type in INSTRUMENTS.items():
+def prepare_returns(ticker):
+    """Log returns and their train/test split for one ticker.
 
-    print(f"\nProcessing: {ticker}")
+    Returns (returns, train, test) or a skip message.
+    """
+    returns = load_log_returns(ticker)
+    if returns is None:
+        return "File not found."
 
-    path = os.path.join(DATA_DIR, f"{ticker}.csv")
+    if len(returns) + 1 < 250:  # observed prices
+        return "Insufficient observations."
 
-    if not os.path.exists(path):
-        print("File not found.")
-        continue
+    split_idx = int(len(returns) * TRAIN_RATIO)
 
-    data = pd.read_csv(path)
+    train = returns.iloc[:split_idx]
+    test = returns.iloc[split_idx:]
 
-    # Strict date parsing
-    data["Date"] = pd.to_datetime(data["Date"], format="%Y-%m-%d")
-    data = data.sort_values("Date")
-    data.set_index("Date", inplace=True)
+    return returns, train, test
 
-    prices = data["Close"].astype(float).dropna()
 
-    if len(prices) < 250:
-        print("Insufficient observations.")
-        continue
+def result_row(ticker, inst_type, returns, train, test, fit):
+    from sklearn.metrics import mean_squared_error, mean_absolute_error
 
     # ==================================================
-    # Compute Log Returns
+    # Evaluation Metrics
     # ==================================================
-    log_prices = np.log(prices)
-    returns = log_prices.diff().dropna()
+    rmse = sqrt(mean_squared_error(test, fit.forecast))
+    mae = mean_absolute_error(test, fit.forecast)
 
-    split_idx = int(len(returns) * TRAIN_RATIO)
+    return {
+        "Ticker": ticker,
+        "Instrument_Type": inst_type,
+        "Observations": len(returns),
+        "Train_Size": len(train),
+        "Test_Size": len(test),
+        "Return_STD": float(returns.std()),
+        "AIC": fit.aic,
+        "BIC": fit.bic,
+        "RMSE": float(rmse),
+        "MAE": float(mae)
+    }
 
-    train = returns.iloc[:split_idx]
-    test = returns.iloc[split_idx:]
+
+def evaluate_ticker(job, backend="statsmodels", cache=None):
+    """Fit and evaluate one (ticker, instrument type) job.
+
+    Returns (row, message); row is None when the ticker is skipped.
+    """
+    ticker, inst_type = job
+
+    prepared = prepare_returns(ticker)
+    if isinstance(prepared, str):
+        return None, prepared
+    returns, train, test = prepared
 
     # ==================================================
     # Fit ARIMA on Returns
     # ==================================================
-    model = ARIMA(train, order=ARIMA_ORDER)
-    model_fit = model.fit()
-
-    forecast = model_fit.forecast(steps=len(test))
+    try:
+        fit = fit_arima(train, ARIMA_ORDER, len(test), backend=backend,
+                        cache=cache)
+    except Exception as exc:  # one bad series must not stop the study
+        return None, f"Fit failed: {exc}"
+
+    return result_row(ticker, inst_type, returns, train, test, fit), "Done."
+
+
+def evaluate_batch(jobs, cache=None):
+    """All jobs with a single batched NumPy fit.
+
+    Yields ((ticker, type), (row, message)) like run_parallel.
+    """
+    prepared = [(job, prepare_returns(job[0])) for job in jobs]
+
+    for job, item in prepared:
+        if isinstance(item, str):
+            yield job, (None, item)
+
+    usable = [(job, item) for job, item in prepared if not isinstance(item, str)]
+    if not usable:
+        return
+
+    fits = fit_arima_many(
+        [train for _, (_, train, _) in usable],
+        ARIMA_ORDER,
+        [len(test) for _, (_, _, test) in usable],
+        cache=cache
+    )
+
+    for ((ticker, inst_type), (returns, train, test)), fit in zip(usable, fits):
+        row = result_row(ticker, inst_type, returns, train, test, fit)
+        yield (ticker, inst_type), (row, "Done.")
+
+
+def reorder_rows(path, order):
+    """Rewrite the streamed CSV in job order (values kept verbatim)."""
+    rank = {ticker: i for i, ticker in enumerate(order)}
+
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        columns = reader.fieldnames
+        rows = sorted(reader, key=lambda r: rank.get(r["Ticker"], len(rank)))
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Cross-instrument ARIMA robustness study."
+    )
+    parser.add_argument("--all", action="store_true",
+                        help="Evaluate every Equity/MutualFund/TreasuryBill "
+                             f"ticker in {COMPANY_METADATA_PATH}.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count - 1).")
+    parser.add_argument("--threads-per-worker", type=int, default=1,
+                        help="BLAS threads per worker.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep existing rows and skip their tickers.")
+    parser.add_argument("--backend", choices=BACKENDS, default="statsmodels",
+                        help="numpy: fit all tickers in one batched "
+                             "ARMA(1,1) estimation.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Refit every model instead of using the fit cache.")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else FitCache()
+
+    # Refreshed here, before any worker reads it
+    shared_features(refresh=True)
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+
+    jobs = study_instruments(args.all)
+
+    if args.resume:
+        done = completed_keys(OUTPUT_PATH, "Ticker")
+        print(f"Resuming: {len(done)} tickers already have results.")
+        pending = [job for job in jobs if job[0] not in done]
+    else:
+        pending = jobs
+
+    print(f"Instruments to evaluate: {len(pending)}")
 
     # ==================================================
-    # Evaluation Metrics
+    # Loop Through Instruments (streamed as they finish)
     # ==================================================
-    rmse = sqrt(mean_squared_error(test, forecast))
-    mae = mean_absolute_error(test, forecast)
 
-    results.append({
-        "Ticker": ticker,
-        "Instrument_Type": inst_type,
-        "Observations": len(returns),
-        "Train_Size": len(train),
-        "Test_Size": len(test),
-        "Return_STD": returns.std(),
-        "AIC": model_fit.aic,
-        "BIC": model_fit.bic,
-        "RMSE": rmse,
-        "MAE": mae
-    })
+    if args.backend == "numpy":
+        outcomes = evaluate_batch(pending, cache=cache)
+    else:
+        outcomes = run_parallel(
+            partial(evaluate_ticker, backend=args.backend, cache=cache),
+            pending,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker
+        )
+
+    with CsvStream(OUTPUT_PATH, RESULT_COLUMNS, resume=args.resume) as out:
+        for (ticker, _), (row, message) in outcomes:
+            print(f"Processing: {ticker} - {message}")
+            if row is not None:
+                out.write(row)
 
-# ==================================================
-# Save Results
-# ==================================================
+    # ==================================================
+    # Save Results
+    # ==================================================
 
-results_df = pd.DataFrame(results)
+    reorder_rows(OUTPUT_PATH, [ticker for ticker, _ in jobs])
 
-output_path = os.path.join(
-    RESULT_DIR,
-    "cross_instrument_metrics_returns.csv"
-)
+    if cache is not None:
+        cache.evict()
+
+    print("\nCross-instrument returns-based experiment completed.")
+    print(f"Results saved to: {OUTPUT_PATH}")
 
-results_df.to_csv(output_path, index=False)
 
-print("\nCross-instrument returns-based experiment completed.")
-print(f"Results saved to: {output_path}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Study Instruments
+
+Instrument sets and return loading shared by the returns-based ARIMA
+experiments (cross_instrument_arima.py, walk_forward_arima.py). Kept
+free of model and metric imports so that importing it stays cheap.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dse_eod.store import load_ticker  # noqa: E402
+from dse_eod.features import shared_features  # noqa: E402
+
+
+# ==================================================
+# Configuration
+# ==================================================
+
+INSTRUMENTS = {
+    "SQURPHARMA": "Equity",
+    "BATBC": "Equity",
+    "GP": "Equity",
+    "TB20Y0744": "TreasuryBill",
+    "1JANATAMF": "MutualFund"
+}
+
+# Instrument types evaluated with --all
+STUDY_TYPES = ["Equity", "MutualFund", "TreasuryBill"]
+
+COMPANY_METADATA_PATH = "metadata/company_metadata.csv"
+DATA_DIR = "data_sample/Unadjusted"  # change if needed
+
+
+def load_log_returns(ticker):
+    """Log returns of ``ticker`` between its observed rows, or None if it has no data."""
+    # Feature cache when built (scripts/build_features.py)
+    features = shared_features()
+    if features is not None and ticker in features:
+        return features.series(ticker, "log_return")
+
+    # Columnar store when built, otherwise DATA_DIR/<TICKER>.csv
+    try:
+        data = load_ticker(ticker, csv_dir=DATA_DIR)
+    except KeyError:
+        return None
+
+    prices = data["Close"].astype(float).dropna()
+    return np.log(prices).diff().dropna()
+
+
+def study_instruments(all_tickers):
+    """(ticker, type) jobs: the reference set or the metadata universe."""
+    if not all_tickers:
+        return list(INSTRUMENTS.items())
+
+    meta = pd.read_csv(COMPANY_METADATA_PATH)
+    meta = meta[meta["Instrument_Type"].isin(STUDY_TYPES)]
+    return list(zip(meta["Ticker"], meta["Instrument_Type"]))
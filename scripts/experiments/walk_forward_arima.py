@@ -0,0 +1,189 @@
+"""
+Walk-Forward ARIMA Backtest (Returns-Based)
+
+Re-evaluates the ARIMA(1,0,1) returns model of the cross-instrument
+study over many forecast origins instead of one 80/20 split, using
+dse_eod.walkforward:
+
+- each ticker's log returns are taken from its longest trading segment
+  in metadata/trading_segments.csv (coverage-aware; gaps of up to
+  --max-gap sessions are bridged, --full-history uses every row)
+- expanding (default) or sliding training windows, the model refitted
+  every --step returns and forecasting the next --horizon
+- one-step-ahead forecasts with the fold's parameters held fixed, or
+  multi-step forecasts from each origin (--mode)
+
+Fits run concurrently across worker processes (or in one batched
+ARMA(1,1) estimation with --backend numpy) and are cached in
+.cache/fits; log returns come from the feature cache when one is built
+(scripts/build_features.py). One row per fold is written to
+results/tables/walk_forward_folds.csv and the per-ticker summary to
+results/tables/walk_forward_summary.csv.
+"""
+
+import argparse
+import os
+import sys
+import warnings
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dse_eod.models import BACKENDS  # noqa: E402
+from dse_eod.fit_cache import FitCache  # noqa: E402
+from dse_eod.profiling import stage  # noqa: E402
+from dse_eod.segments import load_segments, longest_segment  # noqa: E402
+from dse_eod.features import shared_features  # noqa: E402
+from dse_eod.walkforward import MODES, WINDOWS, summarize, walk_forward  # noqa: E402
+
+from experiments.instruments import (  # noqa: E402
+    INSTRUMENTS,
+    load_log_returns,
+    study_instruments,
+)
+
+warnings.filterwarnings("ignore")
+
+# ==================================================
+# Configuration
+# ==================================================
+
+RESULT_DIR = "results/tables"
+FOLDS_PATH = os.path.join(RESULT_DIR, "walk_forward_folds.csv")
+SUMMARY_PATH = os.path.join(RESULT_DIR, "walk_forward_summary.csv")
+
+ARIMA_ORDER = (1, 0, 1)
+
+INITIAL = 250      # returns in the first training window
+HORIZON = 20       # test returns per fold
+MAX_FOLDS = 25     # most recent folds kept per ticker
+MAX_GAP = 3        # missed sessions bridged within a segment
+
+
+def segment_returns(ticker, segments, max_gap):
+    """
+    Log returns of ``ticker``, restricted to its longest trading
+    segment unless ``segments`` is None. None if the ticker has no data.
+    """
+    returns = load_log_returns(ticker)
+    if returns is None:
+        return None
+
+    if segments is not None:
+        try:
+            start, end = longest_segment(segments, ticker, max_gap=max_gap)
+        except KeyError:
+            return None
+        # Segments start on an observed session; its return spans the
+        # gap before the segment
+        returns = returns.loc[start:end]
+        returns = returns[returns.index > start]
+
+    return returns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Walk-forward ARIMA backtest on log returns."
+    )
+    parser.add_argument("--all", action="store_true",
+                        help="Every Equity/MutualFund/TreasuryBill ticker in "
+                             "the company metadata (default: the "
+                             f"{len(INSTRUMENTS)} reference instruments).")
+    parser.add_argument("--window", choices=WINDOWS, default="expanding")
+    parser.add_argument("--window-size", type=int, default=None,
+                        help="Training returns per sliding window "
+                             "(default: --initial).")
+    parser.add_argument("--initial", type=int, default=INITIAL,
+                        help="Training returns before the first origin.")
+    parser.add_argument("--horizon", type=int, default=HORIZON,
+                        help="Test returns per fold.")
+    parser.add_argument("--step", type=int, default=None,
+                        help="Returns between refits (default: --horizon).")
+    parser.add_argument("--max-folds", type=int, default=MAX_FOLDS,
+                        help="Most recent folds kept per ticker (0: all).")
+    parser.add_argument("--mode", choices=MODES, default="one-step")
+    parser.add_argument("--max-gap", type=int, default=MAX_GAP,
+                        help="Missed sessions bridged within a segment.")
+    parser.add_argument("--full-history", action="store_true",
+                        help="Use every observed return, not the longest "
+                             "trading segment.")
+    parser.add_argument("--backend", choices=BACKENDS, default="statsmodels",
+                        help="numpy: fit all folds in one batched "
+                             "ARMA(1,1) estimation.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count - 1).")
+    parser.add_argument("--threads-per-worker", type=int, default=1,
+                        help="BLAS threads per worker.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Refit every fold instead of using the fit cache.")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else FitCache()
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+
+    # ==================================================
+    # Coverage-Aware Returns
+    # ==================================================
+    try:
+        segments = None if args.full_history else load_segments()
+    except FileNotFoundError as exc:
+        raise SystemExit(exc)
+    shared_features(refresh=True)
+
+    series = {}
+    with stage("load") as record:
+        for ticker, _ in study_instruments(args.all):
+            returns = segment_returns(ticker, segments, args.max_gap)
+            if returns is None:
+                print(f"Skipping: {ticker} - no data.")
+                continue
+            series[ticker] = returns
+        record.rows = sum(map(len, series.values()))
+
+    # ==================================================
+    # Walk-Forward Evaluation
+    # ==================================================
+    folds = walk_forward(
+        series,
+        ARIMA_ORDER,
+        initial=args.initial,
+        horizon=args.horizon,
+        step=args.step,
+        window=args.window,
+        window_size=args.window_size,
+        max_folds=args.max_folds or None,
+        mode=args.mode,
+        backend=args.backend,
+        cache=cache,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+    )
+    summary = summarize(folds)
+
+    evaluated = set(summary["Ticker"])
+    for ticker in series:
+        if ticker not in evaluated:
+            print(f"Skipping: {ticker} - too short for one fold "
+                  f"({len(series[ticker])} returns).")
+
+    # ==================================================
+    # Save Results
+    # ==================================================
+    with stage("save", rows=len(folds)):
+        folds.to_csv(FOLDS_PATH, index=False)
+        summary.to_csv(SUMMARY_PATH, index=False)
+
+    if cache is not None:
+        cache.evict()
+
+    with pd.option_context("display.width", 120):
+        print(summary.to_string(index=False))
+    print(f"\nFolds: {len(folds)} (one fit each)")
+    print(f"Results saved to: {FOLDS_PATH}, {SUMMARY_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,43 @@
-import pandas as pd
+import argparse
 import os
 
-def infer_instrument_type(ticker: str) -> str:
-    t = ticker.upper()
+from dse_eod.availability import load_availability
+from dse_eod.company import company_metadata
+from dse_eod.profiling import stage
 
-    if t.startswith("00"):
-        return "Index"
-    if t.startswith("TB"):
-        return "TreasuryBill"
-    if "SUKUK" in t:
-        return "Sukuk"
-    if "BOND" in t:
-        return "Bond"
-    if "MF" in t:
-        return "MutualFund"
-    return "Equity"
 
-
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate per-ticker (company) metadata."
+    )
+    parser.add_argument("--matrix", default=None,
+                        help="Availability store or CSV export.")
+    args = parser.parse_args(argv)
 
     # -----------------------------
     # Load availability matrix
     # -----------------------------
-    df = pd.read_csv("metadata/availability_matrix.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-
-    tickers = df.columns[1:]  # exclude Date
-
-    records = []
-
-    for ticker in tickers:
-        series = df[["Date", ticker]].copy()
-        present = series[series[ticker] > 0]
-
-        if present.empty:
-            continue
-
-        first_date = present["Date"].min()
-        last_date  = present["Date"].max()
-        calendar_days = (last_date - first_date).days + 1
-
-        days_adjusted   = (present[ticker].isin([1, 3])).sum()
-        days_unadjusted = (present[ticker].isin([2, 3])).sum()
-        days_both       = (present[ticker] == 3).sum()
+    # Compact store if present, dense CSV export otherwise
+    # (CSV dates may be day-first with mixed year width)
+    try:
+        matrix = load_availability(args.matrix)
+    except FileNotFoundError as exc:
+        raise SystemExit(exc)
 
-        coverage_ratio = days_both / calendar_days if calendar_days > 0 else 0
-
-        records.append({
-            "Ticker": ticker,
-            "Instrument_Type": infer_instrument_type(ticker),
-            "First_Date": first_date.date(),
-            "Last_Date": last_date.date(),
-            "Calendar_Days": calendar_days,
-            "Days_Adjusted": days_adjusted,
-            "Days_Unadjusted": days_unadjusted,
-            "Days_Both": days_both,
-            "Coverage_Ratio": round(coverage_ratio, 4)
-        })
-
-    company_meta = pd.DataFrame(records)
+    # -----------------------------
+    # All tickers in one pass
+    # -----------------------------
+    with stage("reduce", output="company_metadata", rows=matrix.nnz):
+        company_meta = company_metadata(matrix)
 
     os.makedirs("metadata", exist_ok=True)
-    company_meta.to_csv("metadata/company_metadata.csv", index=False)
+    with stage("save", output="metadata/company_metadata.csv",
+               rows=len(company_meta)):
+        company_meta.to_csv("metadata/company_metadata.csv", index=False)
 
     print("Company metadata generated.")
     print("Number of instruments:", len(company_meta))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,69 @@
-import pandas as pd
+import argparse
 import os
 
-if __name__ == "__main__":
+from dse_eod.availability import load_availability
+from dse_eod import coverage
+from dse_eod.profiling import stage
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate per-date coverage metadata."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["columnar", "rowwise"],
+        default="columnar",
+        help="columnar: all dates at once (default); "
+             "rowwise: original per-row loop."
+    )
+    parser.add_argument("--matrix", default=None,
+                        help="Availability store or CSV export.")
+    args = parser.parse_args(argv)
 
     # -----------------------------
     # Load availability matrix
     # -----------------------------
-    df = pd.read_csv("metadata/availability_matrix.csv")
-
-    # IMPORTANT:
-    # Dates are day-first and may have mixed year width (DD-MM-YYYY / DD-MM-YY)
-    df["Date"] = pd.to_datetime(
-        df["Date"],
-        dayfirst=True,
-        format="mixed"
-    )
-
-    tickers = df.columns[1:]  # exclude Date
-    total_instruments = len(tickers)  # full dataset universe (constant)
-
-    records = []
-
-    for _, row in df.iterrows():
-        values = row[tickers]
-
-        available_any = (values > 0).sum()
-        available_unadjusted = values.isin([2, 3]).sum()
-        available_adjusted = values.isin([1, 3]).sum()
-        available_both = (values == 3).sum()
+    # Compact store if present, dense CSV export otherwise
+    # (CSV dates may be day-first with mixed year width)
+    try:
+        matrix = load_availability(args.matrix)
+    except FileNotFoundError as exc:
+        raise SystemExit(exc)
 
-        coverage_ratio_full = (
-            available_both / total_instruments
-            if total_instruments > 0 else 0
-        )
-
-        day_name = row["Date"].strftime("%A")
-        is_weekend = day_name in ["Friday", "Saturday"]  # DSE weekend
-
-        records.append({
-            "Date": row["Date"].date(),
-            "DayOfWeek": day_name,
-            "IsWeekend": is_weekend,
-            "Available_Any": int(available_any),
-            "Available_Unadjusted": int(available_unadjusted),
-            "Available_Adjusted": int(available_adjusted),
-            "Available_Both": int(available_both),
-            "Coverage_Ratio_Full": round(coverage_ratio_full, 4)
-        })
+    total_instruments = matrix.n_tickers  # full dataset universe (constant)
 
-    date_coverage = pd.DataFrame(records)
+    # -----------------------------
+    # Per-date coverage
+    # -----------------------------
+    with stage("reduce", output="date_coverage", mode=args.mode,
+               rows=matrix.nnz):
+        if args.mode == "columnar":
+            date_coverage, cubes = coverage.coverage_tables(matrix)
+        else:
+            date_coverage = coverage.date_coverage_rowwise(matrix.to_frame())
+            cubes = {}
 
     os.makedirs("metadata", exist_ok=True)
-    date_coverage.to_csv(
-        "metadata/date_coverage_summary.csv",
-        index=False
-    )
+    with stage("save", output="metadata/date_coverage_summary.csv",
+               rows=len(date_coverage)):
+        date_coverage.to_csv(
+            "metadata/date_coverage_summary.csv",
+            index=False
+        )
+    for resolution, cube in cubes.items():
+        path = coverage.CUBE_PATH.format(resolution)
+        with stage("save", output=path, rows=len(cube)):
+            cube.to_csv(path, index=False)
 
     print("Per-date coverage metadata generated.")
     print("Number of dates:", len(date_coverage))
     print("Total dataset instruments:", total_instruments)
+    if cubes:
+        print("Coverage cubes:", ", ".join(
+            f"{resolution} ({len(cube)} rows)" for resolution, cube in cubes.items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
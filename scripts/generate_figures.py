@@ -11,11 +11,36 @@ C2 - Coverage Ratio Over Time
 All figures are saved as:
 - PNG (300 DPI)
 - PDF (vector format)
+
+Daily time series (C1, C2) are drawn min/max-decimated to one bin per
+PDF point of axes width (see dse_eod.plotting), which keeps every
+extreme while keeping the PDFs small.
+
+Each figure is a build task with declared inputs (its metadata CSVs
+and this script). Figures whose inputs are unchanged since the last
+build are skipped; stale ones are rendered in parallel processes.
+
+Usage:
+    python scripts/generate_figures.py            # stale figures only
+    python scripts/generate_figures.py C1 C2      # a subset
+    python scripts/generate_figures.py --force    # everything
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
 import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from dse_eod.build import Task, is_stale, read_state, record, write_state  # noqa: E402
+from dse_eod.plotting import plot_series  # noqa: E402
+from dse_eod.profiling import stage  # noqa: E402
+from dse_eod.runner import run_parallel  # noqa: E402
 
 
 # ==================================================
@@ -24,122 +49,212 @@ import os
 FIGURE_DIR = "figures"
 COMPANY_METADATA_PATH = "metadata/company_metadata.csv"
 COVERAGE_PATH = "metadata/date_coverage_summary.csv"
+BUILD_STATE_PATH = ".cache/figure_state.json"
 
-os.makedirs(FIGURE_DIR, exist_ok=True)
+DPI = 300
+DECIMATION = "minmax"  # "lttb", or None for every point
+SCRIPT_PATH = os.path.abspath(__file__)
 
 
 # ==================================================
 # Load Data
 # ==================================================
-company_metadata = pd.read_csv(COMPANY_METADATA_PATH)
-coverage = pd.read_csv(COVERAGE_PATH)
+def load_company_metadata():
+    return pd.read_csv(COMPANY_METADATA_PATH)
+
 
-coverage["Date"] = pd.to_datetime(coverage["Date"])
-coverage = coverage.sort_values("Date")
+def load_coverage():
+    coverage = pd.read_csv(COVERAGE_PATH)
 
-print(f"Total instruments: {len(company_metadata)}")
-print(f"Date range: {coverage['Date'].min()} to {coverage['Date'].max()}")
+    coverage["Date"] = pd.to_datetime(coverage["Date"])
+    return coverage.sort_values("Date")
+
+
+def save(fig, name):
+    fig.savefig(f"{FIGURE_DIR}/{name}.png", dpi=DPI)
+    fig.savefig(f"{FIGURE_DIR}/{name}.pdf")
+
+    plt.close(fig)
 
 
 # ==================================================
 # D1 — Instrument Composition
 # ==================================================
-counts = (
-    company_metadata["Instrument_Type"]
-    .value_counts()
-    .sort_values(ascending=False)
-)
-
-fig, ax = plt.subplots(figsize=(8, 5))
+def plot_instrument_composition(name):
+    company_metadata = load_company_metadata()
 
-counts.plot(kind="bar", ax=ax)
+    counts = (
+        company_metadata["Instrument_Type"]
+        .value_counts()
+        .sort_values(ascending=False)
+    )
 
-for i, v in enumerate(counts):
-    ax.text(i, v + 2, str(v), ha="center")
+    fig, ax = plt.subplots(figsize=(8, 5))
 
-ax.set_xlabel("Instrument Type")
-ax.set_ylabel("Number of Instruments")
-ax.set_title("Instrument Composition in DSE EoD Dataset")
+    counts.plot(kind="bar", ax=ax)
 
-fig.tight_layout()
+    for i, v in enumerate(counts):
+        ax.text(i, v + 2, str(v), ha="center")
 
-fig.savefig(f"{FIGURE_DIR}/D1_instrument_composition.png", dpi=300)
-fig.savefig(f"{FIGURE_DIR}/D1_instrument_composition.pdf")
+    ax.set_xlabel("Instrument Type")
+    ax.set_ylabel("Number of Instruments")
+    ax.set_title("Instrument Composition in DSE EoD Dataset")
 
-plt.close(fig)
+    fig.tight_layout()
 
-print("D1 generated.")
+    save(fig, name)
 
 
 # ==================================================
 # D2 — Lifespan Distribution
 # ==================================================
-lifespans = company_metadata["Calendar_Days"]
+def plot_lifespan_distribution(name):
+    lifespans = load_company_metadata()["Calendar_Days"]
 
-fig, ax = plt.subplots(figsize=(8, 5))
+    fig, ax = plt.subplots(figsize=(8, 5))
 
-ax.hist(lifespans, bins=50)
+    ax.hist(lifespans, bins=50)
 
-ax.set_xlabel("Instrument Lifespan (Calendar Days)")
-ax.set_ylabel("Number of Instruments")
-ax.set_title("Distribution of Instrument Lifespans")
+    ax.set_xlabel("Instrument Lifespan (Calendar Days)")
+    ax.set_ylabel("Number of Instruments")
+    ax.set_title("Distribution of Instrument Lifespans")
 
-fig.tight_layout()
+    fig.tight_layout()
 
-fig.savefig(f"{FIGURE_DIR}/D2_lifespan_distribution.png", dpi=300)
-fig.savefig(f"{FIGURE_DIR}/D2_lifespan_distribution.pdf")
-
-plt.close(fig)
-
-print("D2 generated.")
+    save(fig, name)
 
 
 # ==================================================
 # C1 — Available Instruments Over Time
 # ==================================================
-fig, ax = plt.subplots(figsize=(10, 5))
+def plot_available_instruments(name):
+    coverage = load_coverage()
 
-ax.plot(coverage["Date"], coverage["Available_Any"], linewidth=1)
-ax.plot(coverage["Date"], coverage["Available_Both"], linewidth=1)
+    fig, ax = plt.subplots(figsize=(10, 5))
 
-ax.set_xlabel("Date")
-ax.set_ylabel("Number of Available Instruments")
-ax.set_title("Available Instruments Over Time")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Number of Available Instruments")
+    ax.set_title("Available Instruments Over Time")
 
-ax.legend([
-    "Available (Adjusted OR Unadjusted)",
-    "Available (Both Versions)"
-])
+    # Lay out first: decimation bins follow the final axes width
+    fig.tight_layout()
 
-fig.tight_layout()
+    plot_series(ax, coverage["Date"], coverage["Available_Any"],
+                method=DECIMATION, linewidth=1)
+    plot_series(ax, coverage["Date"], coverage["Available_Both"],
+                method=DECIMATION, linewidth=1)
 
-fig.savefig(f"{FIGURE_DIR}/C1_available_instruments_over_time.png", dpi=300)
-fig.savefig(f"{FIGURE_DIR}/C1_available_instruments_over_time.pdf")
+    ax.legend([
+        "Available (Adjusted OR Unadjusted)",
+        "Available (Both Versions)"
+    ])
 
-plt.close(fig)
+    fig.tight_layout()
 
-print("C1 generated.")
+    save(fig, name)
 
 
 # ==================================================
 # C2 — Coverage Ratio Over Time
 # ==================================================
-fig, ax = plt.subplots(figsize=(10, 5))
+def plot_coverage_ratio(name):
+    coverage = load_coverage()
 
-ax.plot(coverage["Date"], coverage["Coverage_Ratio_Full"], linewidth=1)
+    fig, ax = plt.subplots(figsize=(10, 5))
 
-ax.set_xlabel("Date")
-ax.set_ylabel("Coverage Ratio")
-ax.set_title("Coverage Ratio Over Time")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Coverage Ratio")
+    ax.set_title("Coverage Ratio Over Time")
 
-fig.tight_layout()
+    fig.tight_layout()
 
-fig.savefig(f"{FIGURE_DIR}/C2_coverage_ratio_over_time.png", dpi=300)
-fig.savefig(f"{FIGURE_DIR}/C2_coverage_ratio_over_time.pdf")
+    plot_series(ax, coverage["Date"], coverage["Coverage_Ratio_Full"],
+                method=DECIMATION, linewidth=1)
 
-plt.close(fig)
+    fig.tight_layout()
 
-print("C2 generated.")
+    save(fig, name)
 
 
-print("All figures successfully generated.")
+# ==================================================
+# Figure Tasks
+# ==================================================
+# ID -> (output name, inputs, plotting function)
+FIGURES = {
+    "D1": ("D1_instrument_composition",
+           [COMPANY_METADATA_PATH], plot_instrument_composition),
+    "D2": ("D2_lifespan_distribution",
+           [COMPANY_METADATA_PATH], plot_lifespan_distribution),
+    "C1": ("C1_available_instruments_over_time",
+           [COVERAGE_PATH], plot_available_instruments),
+    "C2": ("C2_coverage_ratio_over_time",
+           [COVERAGE_PATH], plot_coverage_ratio),
+}
+
+
+def figure_task(fig_id) -> Task:
+    name, inputs, _ = FIGURES[fig_id]
+    return Task(
+        name=fig_id,
+        inputs=inputs + [SCRIPT_PATH],
+        outputs=[f"{FIGURE_DIR}/{name}.png", f"{FIGURE_DIR}/{name}.pdf"],
+        params={"dpi": DPI, "decimation": DECIMATION}
+    )
+
+
+def render(fig_id):
+    """Worker entry point: draw and save one figure."""
+    name, _, plot = FIGURES[fig_id]
+    with stage("render", figure=fig_id):
+        plot(name)
+    return fig_id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render the descriptive and coverage figures."
+    )
+    parser.add_argument("figures", nargs="*", metavar="ID",
+                        help=f"Figure IDs to build ({', '.join(FIGURES)}; "
+                             "default: all).")
+    parser.add_argument("--force", action="store_true",
+                        help="Render even if the inputs are unchanged.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count - 1).")
+    args = parser.parse_args(argv)
+
+    unknown = [f for f in args.figures if f not in FIGURES]
+    if unknown:
+        sys.exit(f"Unknown figure IDs: {', '.join(unknown)} "
+                 f"(choose from {', '.join(FIGURES)}).")
+
+    os.makedirs(FIGURE_DIR, exist_ok=True)
+
+    coverage = load_coverage()
+    print(f"Total instruments: {len(load_company_metadata())}")
+    print(f"Date range: {coverage['Date'].min()} to {coverage['Date'].max()}")
+
+    state = read_state(BUILD_STATE_PATH)
+    tasks = {fig_id: figure_task(fig_id) for fig_id in args.figures or FIGURES}
+
+    stale = [
+        fig_id for fig_id, task in tasks.items()
+        if args.force or is_stale(task, state)
+    ]
+    for fig_id in tasks:
+        if fig_id not in stale:
+            print(f"{fig_id} up to date.")
+
+    # ==================================================
+    # Render Stale Figures
+    # ==================================================
+    for fig_id, _ in run_parallel(render, stale, workers=args.workers):
+        record(tasks[fig_id], state)
+        write_state(state, BUILD_STATE_PATH)
+        print(f"{fig_id} generated.")
+
+    print("All figures successfully generated.")
+
+
+if __name__ == "__main__":
+    main()
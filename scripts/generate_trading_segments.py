@@ -0,0 +1,48 @@
+import argparse
+import os
+
+from dse_eod.availability import load_availability
+from dse_eod.profiling import stage
+from dse_eod.query import VERSIONS
+from dse_eod.segments import SEGMENTS_PATH, gap_statistics, trading_segments
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Detect per-ticker trading segments and gaps."
+    )
+    parser.add_argument("--matrix", default=None,
+                        help="Availability store or CSV export.")
+    parser.add_argument("--version", choices=VERSIONS, default="any",
+                        help="Which availability counts as traded.")
+    parser.add_argument("--output", default=SEGMENTS_PATH)
+    args = parser.parse_args(argv)
+
+    # -----------------------------
+    # Load availability matrix
+    # -----------------------------
+    try:
+        matrix = load_availability(args.matrix)
+    except FileNotFoundError as exc:
+        raise SystemExit(exc)
+
+    # -----------------------------
+    # Segments over DSE sessions (see dse_eod/calendar.py)
+    # -----------------------------
+    with stage("reduce", output="trading_segments", rows=matrix.nnz):
+        segments = trading_segments(matrix, version=args.version)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with stage("save", output=args.output, rows=len(segments)):
+        segments.to_csv(args.output, index=False)
+
+    stats = gap_statistics(segments)
+
+    print("Trading segments generated.")
+    print("Number of instruments:", len(stats))
+    print("Number of segments:", len(segments))
+    print("Instruments without gaps:", int((stats["Segments"] == 1).sum()))
+
+
+if __name__ == "__main__":
+    main()
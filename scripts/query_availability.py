@@ -0,0 +1,86 @@
+"""
+Availability Queries
+
+Looks up the availability index (metadata/availability_index.npz,
+rebuilt from the compact store when stale) instead of rescanning the
+dense matrix.
+
+Examples:
+    python scripts/query_availability.py on 2019-03-12 --version both
+    python scripts/query_availability.py days GP --start 2020-01-01
+    python scripts/query_availability.py gaps GP
+    python scripts/query_availability.py has GP 2019-03-12
+    python scripts/query_availability.py common GP BATBC SQURPHARMA
+"""
+
+import argparse
+
+from dse_eod.query import INDEX_PATH, VERSIONS, open_index
+
+
+def print_dates(dates):
+    for date in dates:
+        print(date)
+    print(f"({len(dates)} dates)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query instrument availability.")
+    parser.add_argument("--matrix", default=None,
+                        help="Availability store or dense CSV "
+                             "(default: compact store, CSV fallback).")
+    parser.add_argument("--index", default=INDEX_PATH)
+    parser.add_argument("--version", choices=VERSIONS, default="any")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    on = commands.add_parser("on", help="Tickers available on a date.")
+    on.add_argument("date")
+
+    has = commands.add_parser("has", help="Availability of a ticker on a date.")
+    has.add_argument("ticker")
+    has.add_argument("date")
+
+    for name, text in (("days", "Dates a ticker is available."),
+                       ("gaps", "Sessions a ticker missed while listed.")):
+        sub = commands.add_parser(name, help=text)
+        sub.add_argument("ticker")
+        sub.add_argument("--start", default=None)
+        sub.add_argument("--end", default=None)
+
+    common = commands.add_parser("common", help="Dates all tickers share.")
+    common.add_argument("tickers", nargs="+")
+    common.add_argument("--start", default=None)
+    common.add_argument("--end", default=None)
+
+    args = parser.parse_args(argv)
+
+    try:
+        index = open_index(args.matrix, args.index)
+    except FileNotFoundError as exc:
+        raise SystemExit(exc)
+
+    if args.command == "on":
+        tickers = index.tickers_on(args.date, args.version)
+        print("\n".join(tickers))
+        print(f"({len(tickers)} tickers)")
+
+    elif args.command == "has":
+        available = index.has(args.ticker, args.date, args.version)
+        print(f"{args.ticker} on {args.date} ({args.version}): "
+              f"{'yes' if available else 'no'} "
+              f"(code {index.code(args.ticker, args.date)})")
+
+    elif args.command == "days":
+        print_dates(index.days(args.ticker, args.start, args.end, args.version))
+
+    elif args.command == "gaps":
+        print_dates(index.gaps(args.ticker, args.start, args.end))
+
+    elif args.command == "common":
+        print_dates(index.common_days(args.tickers, args.start, args.end,
+                                      args.version))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+
+from dse_eod.ingest import CHUNK_SIZE, read_closes
+from dse_eod.pipeline import ADJUSTED_SOURCE, UNADJUSTED_SOURCE
+from dse_eod.profiling import stage
+from dse_eod.reconcile import (
+    EVENTS_PATH,
+    KINDS,
+    PRICE_TICK,
+    TOLERANCE,
+    adjustment_events,
+    align,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Reconcile Adjusted and Unadjusted prices and detect "
+                    "corporate-action events."
+    )
+    parser.add_argument("--adjusted", default=ADJUSTED_SOURCE)
+    parser.add_argument("--unadjusted", default=UNADJUSTED_SOURCE)
+    parser.add_argument("--output", default=EVENTS_PATH)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="Smallest log adjustment-factor step reported.")
+    parser.add_argument("--tick", type=float, default=PRICE_TICK,
+                        help="Rounding of the stored closes.")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    # -----------------------------
+    # Close prices of both versions (one pass over each dump)
+    # -----------------------------
+    adjusted = read_closes(args.adjusted, args.chunksize)
+    unadjusted = read_closes(args.unadjusted, args.chunksize)
+
+    # -----------------------------
+    # Align on (ticker, date) and scan the adjustment factors
+    # -----------------------------
+    with stage("reduce", output="adjustment_events") as record:
+        rec = align(adjusted, unadjusted)
+        events = adjustment_events(rec, args.tolerance, args.tick)
+        record.rows = len(rec.days)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with stage("save", output=args.output, rows=len(events)):
+        events.to_csv(args.output, index=False)
+
+    counts = events["Kind"].value_counts()
+
+    print("Adjustment events generated.")
+    print("Rows in both versions:", len(rec.days))
+    print("Rows in Adjusted only:", rec.only_adjusted)
+    print("Rows in Unadjusted only:", rec.only_unadjusted)
+    print("Duplicate rows dropped:", adjusted.duplicates + unadjusted.duplicates)
+    print("Rows without Ticker or Date dropped:",
+          adjusted.incomplete + unadjusted.incomplete)
+    for kind in KINDS:
+        print(f"{kind.capitalize()} rows:", int(counts.get(kind, 0)))
+    print("Instruments with events:",
+          events.loc[events["Kind"] != "mismatch", "Ticker"].nunique())
+
+
+if __name__ == "__main__":
+    main()
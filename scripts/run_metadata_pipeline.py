@@ -0,0 +1,61 @@
+"""
+Metadata Pipeline (single run)
+
+Reads UnAdjusted-AmarStock.csv and Adjusted-AmarStock.csv once and
+writes the availability store, company metadata and per-date coverage
+without going through the dense availability_matrix.csv.
+
+It is expected that the source CSV files are in the folder this code
+is running from (override with --unadjusted / --adjusted).
+"""
+
+import argparse
+
+from dse_eod.availability import (
+    DATASET_START,
+    DATASET_END,
+    MATRIX_PATH,
+    MATRIX_CSV_PATH,
+)
+from dse_eod import pipeline
+from dse_eod.ingest import CHUNK_SIZE, DATE_FORMAT
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build all metadata artifacts in one pass."
+    )
+    parser.add_argument("--unadjusted", default=pipeline.UNADJUSTED_SOURCE)
+    parser.add_argument("--adjusted", default=pipeline.ADJUSTED_SOURCE)
+    parser.add_argument("--start-date", default=DATASET_START)
+    parser.add_argument("--end-date", default=DATASET_END)
+    parser.add_argument("--no-store", action="store_true",
+                        help=f"Do not write {MATRIX_PATH}.")
+    parser.add_argument("--write-matrix-csv", nargs="?",
+                        const=MATRIX_CSV_PATH, default=None, metavar="PATH",
+                        help="Also write the dense 0/1/2/3 CSV "
+                             f"(default path: {MATRIX_CSV_PATH}).")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE,
+                        help="Source rows read per chunk.")
+    parser.add_argument("--date-format", default=DATE_FORMAT,
+                        help="Date format of the source CSVs.")
+    args = parser.parse_args(argv)
+
+    result = pipeline.run_pipeline(
+        unadjusted_path=args.unadjusted,
+        adjusted_path=args.adjusted,
+        start=args.start_date,
+        end=args.end_date,
+        chunksize=args.chunksize,
+        date_format=args.date_format,
+        matrix_path=None if args.no_store else MATRIX_PATH,
+        matrix_csv_path=args.write_matrix_csv
+    )
+
+    print("Metadata pipeline completed.")
+    print("Number of instruments:", len(result.company_metadata))
+    print("Number of dates:", len(result.date_coverage))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Incremental Metadata Update
+
+Appends new trading days (one day or a range) to the artifacts written
+by run_metadata_pipeline.py, using the watermark stored in
+metadata/pipeline_state.json. Only the new rows are processed.
+
+The input files use the AmarStock layout (Date, Ticker, ...) and may
+contain just the new rows; rows on or before the watermark are ignored.
+"""
+
+import argparse
+
+from dse_eod import incremental
+from dse_eod.ingest import CHUNK_SIZE, DATE_FORMAT
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Append new trading days to the metadata artifacts."
+    )
+    parser.add_argument("--unadjusted", required=True,
+                        help="New Unadjusted rows (AmarStock layout).")
+    parser.add_argument("--adjusted", required=True,
+                        help="New Adjusted rows (AmarStock layout).")
+    parser.add_argument("--end-date", default=None,
+                        help="Extend the calendar to this date "
+                             "(default: last new date).")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE,
+                        help="Source rows read per chunk.")
+    parser.add_argument("--date-format", default=DATE_FORMAT,
+                        help="Date format of the source CSVs.")
+    args = parser.parse_args(argv)
+
+    summary = incremental.update(
+        unadjusted_path=args.unadjusted,
+        adjusted_path=args.adjusted,
+        end=args.end_date,
+        chunksize=args.chunksize,
+        date_format=args.date_format
+    )
+
+    print("Incremental metadata update completed.")
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
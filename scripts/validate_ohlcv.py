@@ -0,0 +1,70 @@
+import argparse
+import os
+
+import pandas as pd
+
+from dse_eod.pipeline import ADJUSTED_SOURCE, UNADJUSTED_SOURCE
+from dse_eod.profiling import stage
+from dse_eod.validation import (
+    CHECKS,
+    CHUNK_SIZE,
+    DETAIL_COLUMNS,
+    REPORT_PATH,
+    report,
+    validate_csv_dir,
+    validate_dump,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check OHLCV rows for integrity violations."
+    )
+    parser.add_argument("--dump", nargs="+", default=None,
+                        help="AmarStock dumps (default: both versions).")
+    parser.add_argument("--csv-dir", nargs="+", default=[],
+                        help="Per-ticker CSV folders to check as well.")
+    parser.add_argument("--output", default=REPORT_PATH,
+                        help="Per-ticker, per-check summary.")
+    parser.add_argument("--details", default=None,
+                        help="Also write one row per violation here.")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit with status 1 when anything is flagged.")
+    args = parser.parse_args(argv)
+
+    dumps = args.dump
+    if dumps is None:
+        dumps = [] if args.csv_dir else [UNADJUSTED_SOURCE, ADJUSTED_SOURCE]
+
+    # -----------------------------
+    # One chunked pass over each source
+    # -----------------------------
+    found = [validate_dump(path, args.chunksize) for path in dumps]
+    found += [validate_csv_dir(path) for path in args.csv_dir]
+    violations = (pd.concat(found, ignore_index=True) if found
+                  else pd.DataFrame(columns=DETAIL_COLUMNS))
+    summary = report(violations)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with stage("save", output=args.output, rows=len(summary)):
+        summary.to_csv(args.output, index=False)
+    if args.details:
+        os.makedirs(os.path.dirname(args.details) or ".", exist_ok=True)
+        with stage("save", output=args.details, rows=len(violations)):
+            violations.to_csv(args.details, index=False)
+
+    counts = violations["Check"].value_counts()
+
+    print("OHLCV validation complete.")
+    print("Sources checked:", len(dumps) + len(args.csv_dir))
+    for check in CHECKS:
+        print(f"{check}:", int(counts.get(check, 0)))
+    print("Tickers flagged:", summary["Ticker"].nunique())
+
+    if args.strict and len(violations):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "scripts"))
+
+from dse_eod.availability import ONE_DAY, AvailabilityMatrix  # noqa: E402
+from dse_eod.coverage import date_coverage, date_coverage_rowwise  # noqa: E402
+
+
+START = np.datetime64("2020-02-25")
+N_DAYS = 60
+TICKERS = np.array(["00DSEX", "AAA", "BBB", "GP", "TB5Y", "ZBOND"])
+
+
+def random_dense(seed) -> np.ndarray:
+    """Days x tickers codes 0-3, with one empty day and one empty ticker."""
+    rng = np.random.default_rng(seed)
+    dense = rng.choice(4, size=(N_DAYS, len(TICKERS)), p=[0.4, 0.1, 0.1, 0.4])
+    dense[17] = 0
+    dense[:, 2] = 0
+    return dense.astype(np.uint8)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_csr_matches_dense(seed):
+    dense = random_dense(seed)
+    dates = START + np.arange(N_DAYS) * ONE_DAY
+    matrix = AvailabilityMatrix.from_dense(dates, TICKERS, dense)
+
+    np.testing.assert_array_equal(matrix.to_dense(), dense)
+    assert matrix.nnz == np.count_nonzero(dense)
+    assert matrix.start == START and matrix.n_days == N_DAYS
+
+    # Observations split into one flag per row, repeated and shuffled
+    day_idx, ticker_idx = np.nonzero(dense)
+    codes = dense[day_idx, ticker_idx]
+    flags = np.concatenate([codes & 1, codes & 2, codes & 1])
+    ticker_idx = np.tile(ticker_idx, 3)
+    day_idx = np.tile(day_idx, 3)
+    keep = flags > 0
+    order = np.random.default_rng(seed).permutation(int(keep.sum()))
+
+    rebuilt = AvailabilityMatrix.from_codes(
+        ticker_idx[keep][order], day_idx[keep][order], flags[keep][order],
+        TICKERS, START, N_DAYS
+    )
+    for name in ("indptr", "days", "codes"):
+        np.testing.assert_array_equal(getattr(rebuilt, name), getattr(matrix, name))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_columnar_coverage_matches_rowwise(seed):
+    dates = START + np.arange(N_DAYS) * ONE_DAY
+    matrix = AvailabilityMatrix.from_dense(dates, TICKERS, random_dense(seed))
+
+    expected = date_coverage_rowwise(matrix.to_frame())
+    expected["Date"] = expected["Date"].astype(str)
+
+    pd.testing.assert_frame_equal(date_coverage(matrix), expected)
+    assert (date_coverage(matrix).to_csv(index=False)
+            == expected.to_csv(index=False))
@@ -0,0 +1,88 @@
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "scripts"))
+
+from dse_eod.availability import ONE_DAY, AvailabilityMatrix  # noqa: E402
+from dse_eod.calendar import is_weekend  # noqa: E402
+from dse_eod.coverage import append_cubes, coverage_cubes  # noqa: E402
+from dse_eod.query import AvailabilityIndex  # noqa: E402
+from dse_eod.segments import append_segments, trading_segments  # noqa: E402
+
+
+START = np.datetime64("2019-12-20")
+N_DAYS = 150
+TICKERS = ["00DSEX", "AAA", "BBB", "CCCMF", "GP", "TB5Y", "XSUKUK", "ZBOND"]
+LATE = {"XSUKUK": 120, "ZBOND": 101}  # first listed day (new tickers)
+
+
+def random_matrix(seed=7) -> AvailabilityMatrix:
+    rng = np.random.default_rng(seed)
+    trading = ~is_weekend(START + np.arange(N_DAYS) * ONE_DAY)
+
+    ticker_idx, days = [], []
+    for i, ticker in enumerate(TICKERS):
+        lo = LATE.get(ticker, int(rng.integers(0, 30)))
+        hi = int(rng.integers(lo + 10, N_DAYS + 5))
+        day = np.arange(lo, min(hi, N_DAYS))
+        day = day[trading[day] & (rng.random(len(day)) > 0.15)]
+        ticker_idx.append(np.full(len(day), i))
+        days.append(day)
+
+    days = np.concatenate(days)
+    return AvailabilityMatrix.from_codes(
+        np.concatenate(ticker_idx), days, rng.integers(1, 4, len(days)),
+        np.array(TICKERS), START, N_DAYS
+    )
+
+
+def split(matrix, cut):
+    """Entries before calendar offset ``cut``, and from it on."""
+    ticker_idx = matrix.ticker_index()
+    parts = []
+    for keep, start, n_days in ((matrix.days < cut, 0, cut),
+                                (matrix.days >= cut, cut, N_DAYS - cut)):
+        tickers, idx = np.unique(matrix.tickers[ticker_idx[keep]],
+                                 return_inverse=True)
+        parts.append(AvailabilityMatrix.from_codes(
+            idx, matrix.days[keep] - start, matrix.codes[keep],
+            tickers, matrix.start + start * ONE_DAY, n_days
+        ))
+    return parts
+
+
+def csv_round_trip(frame) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(frame.to_csv(index=False)))
+
+
+@pytest.mark.parametrize("cut", [5, 40, 100, 121, 149])
+def test_appended_artifacts_match_a_rebuild(cut):
+    full = random_matrix()
+    old, delta = split(full, cut)
+    merged = old.append(delta)
+
+    for name in ("tickers", "indptr", "days", "codes"):
+        np.testing.assert_array_equal(getattr(merged, name), getattr(full, name))
+
+    index = AvailabilityIndex.from_matrix(old).append(delta, merged)
+    rebuilt = AvailabilityIndex.from_matrix(full)
+    for name in ("date_indptr", "date_tickers", "date_codes"):
+        np.testing.assert_array_equal(getattr(index, name), getattr(rebuilt, name))
+
+    segments = append_segments(
+        csv_round_trip(trading_segments(old)), delta, index.calendar
+    )
+    pd.testing.assert_frame_equal(
+        csv_round_trip(segments), csv_round_trip(trading_segments(full))
+    )
+
+    stored = {r: csv_round_trip(c) for r, c in coverage_cubes(old).items()}
+    cubes = append_cubes(stored, merged, delta.start)
+    for resolution, cube in coverage_cubes(full).items():
+        assert cubes[resolution].to_csv(index=False) == cube.to_csv(index=False)
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "scripts"))
+
+from dse_eod.ingest import read_closes  # noqa: E402
+
+
+ROWS = """Date,Ticker,Close
+2020-01-01,AAA,1
+2020-01-02,,2
+,AAA,3
+2020-01-02,ZZZ,4
+2020-01-03,AAA,
+"""
+
+
+def test_closes_drop_rows_without_ticker_or_date(tmp_path):
+    path = tmp_path / "dump.csv"
+    path.write_text(ROWS)
+
+    for chunksize in (100, 2, 1):
+        closes = read_closes(str(path), chunksize=chunksize)
+        pairs = list(zip(closes.tickers[closes.ticker_idx],
+                         closes.days.astype(str)))
+
+        assert closes.incomplete == 2
+        assert pairs == [("AAA", "2020-01-01"), ("AAA", "2020-01-03"),
+                         ("ZZZ", "2020-01-02")]
+        np.testing.assert_array_equal(closes.close, [1, np.nan, 4])
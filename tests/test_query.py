@@ -0,0 +1,170 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "scripts"))
+
+from dse_eod.availability import ONE_DAY, AvailabilityMatrix  # noqa: E402
+from dse_eod.calendar import is_weekend  # noqa: E402
+from dse_eod import query  # noqa: E402
+from dse_eod.query import VERSIONS, AvailabilityIndex, open_index  # noqa: E402
+
+
+START = np.datetime64("2021-03-01")
+N_DAYS = 90
+TICKERS = np.array(["00DSEX", "AAA", "BBB", "CCCMF", "GP", "TB5Y", "ZBOND"])
+HOLIDAYS = [23, 24, 58]  # weekdays without any data
+
+MASKS = {
+    "any": lambda codes: codes > 0,
+    "adjusted": lambda codes: np.isin(codes, [1, 3]),
+    "unadjusted": lambda codes: np.isin(codes, [2, 3]),
+    "both": lambda codes: codes == 3,
+}
+
+
+def random_dense(seed=3) -> np.ndarray:
+    """Days x tickers codes with listing windows, holes, weekends and holidays."""
+    rng = np.random.default_rng(seed)
+    dense = rng.choice(4, size=(N_DAYS, len(TICKERS)), p=[0.2, 0.1, 0.1, 0.6])
+    for t in range(len(TICKERS)):
+        lo, hi = np.sort(rng.integers(0, N_DAYS, 2))
+        dense[:lo, t] = 0
+        dense[hi + 1:, t] = 0
+    dense[is_weekend(START + np.arange(N_DAYS) * ONE_DAY)] = 0
+    dense[HOLIDAYS] = 0
+    return dense.astype(np.uint8)
+
+
+@pytest.fixture(scope="module")
+def dense():
+    return random_dense()
+
+
+@pytest.fixture(scope="module")
+def index(dense):
+    dates = START + np.arange(N_DAYS) * ONE_DAY
+    return AvailabilityIndex.from_matrix(
+        AvailabilityMatrix.from_dense(dates, TICKERS, dense)
+    )
+
+
+def date(offset):
+    return START + offset * ONE_DAY
+
+
+RANGES = [(None, None), (10, 50), (-5, 20), (70, 120), (40, 39)]
+
+
+def offset_range(lo, hi):
+    lo = 0 if lo is None else max(lo, 0)
+    hi = N_DAYS if hi is None else min(hi + 1, N_DAYS)
+    return lo, max(lo, hi)
+
+
+def bounds(lo, hi):
+    return (None if lo is None else date(lo)), (None if hi is None else date(hi))
+
+
+def test_point_lookups_match_dense_scan(dense, index):
+    for d in range(N_DAYS):
+        for t, ticker in enumerate(TICKERS):
+            assert index.code(ticker, date(d)) == dense[d, t]
+            for version in VERSIONS:
+                assert index.has(ticker, date(d), version) == MASKS[version](dense[d, t])
+    assert index.code("GP", date(-1)) == 0
+    assert index.code("GP", date(N_DAYS)) == 0
+    with pytest.raises(KeyError):
+        index.code("NOPE", date(0))
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_range_queries_match_dense_scan(dense, index, version):
+    mask = MASKS[version](dense)
+
+    np.testing.assert_array_equal(index.counts_by_date(version), mask.sum(axis=1))
+
+    for d in range(-2, N_DAYS + 2):
+        expected = TICKERS[mask[d]] if 0 <= d < N_DAYS else TICKERS[:0]
+        np.testing.assert_array_equal(index.tickers_on(date(d), version), expected)
+
+    for lo, hi in RANGES:
+        a, b = offset_range(lo, hi)
+        for t, ticker in enumerate(TICKERS):
+            expected = date(a + np.flatnonzero(mask[a:b, t]))
+            np.testing.assert_array_equal(
+                index.days(ticker, *bounds(lo, hi), version=version), expected
+            )
+
+        picked = [TICKERS[1], TICKERS[3], TICKERS[4]]
+        cols = np.searchsorted(TICKERS, picked)
+        np.testing.assert_array_equal(
+            index.common_days(picked, *bounds(lo, hi), version=version),
+            date(a + np.flatnonzero(mask[a:b][:, cols].all(axis=1)))
+        )
+
+    for days in ([5, 8, 9], [30], [2, 3, 4, 5, 6]):
+        np.testing.assert_array_equal(
+            index.common_tickers(date(np.array(days)), version),
+            TICKERS[mask[days].all(axis=0)]
+        )
+
+
+def test_active_tickers_and_gaps_match_dense_scan(dense, index):
+    sessions = np.flatnonzero(dense.any(axis=1))
+    np.testing.assert_array_equal(index.sessions(), date(sessions))
+
+    for lo, hi in RANGES:
+        a, b = offset_range(lo, hi)
+        np.testing.assert_array_equal(
+            index.active_tickers(*bounds(lo, hi)),
+            TICKERS[dense[a:b].any(axis=0)]
+        )
+
+        for t, ticker in enumerate(TICKERS):
+            listed = np.flatnonzero(dense[:, t])
+            expected = [] if not len(listed) else [
+                s for s in sessions
+                if max(a, listed[0]) <= s < min(b, listed[-1] + 1)
+                and not dense[s, t]
+            ]
+            np.testing.assert_array_equal(
+                index.gaps(ticker, *bounds(lo, hi)),
+                date(np.array(expected, dtype=np.int64))
+            )
+
+
+def test_open_index_reuses_the_saved_index(dense, tmp_path, monkeypatch):
+    dates = START + np.arange(N_DAYS) * ONE_DAY
+    matrix = AvailabilityMatrix.from_dense(dates, TICKERS, dense)
+    matrix_path = str(tmp_path / "availability.npz")
+    index_path = str(tmp_path / "availability_index.npz")
+    matrix.save(matrix_path)
+
+    built = open_index(matrix_path, index_path)
+    assert os.path.exists(index_path)
+
+    def rebuild(*args, **kwargs):
+        raise AssertionError("index rebuilt although the matrix is unchanged")
+
+    monkeypatch.setattr(query, "build_index", rebuild)
+    opened = open_index(matrix_path, index_path)
+    for name in ("date_indptr", "date_tickers", "date_codes"):
+        np.testing.assert_array_equal(getattr(opened, name), getattr(built, name))
+
+    # The stored fingerprint is the content hash of the loaded arrays
+    loaded = AvailabilityMatrix.load(matrix_path)
+    stored = loaded.fingerprint
+    loaded._fingerprint = None
+    assert loaded.fingerprint == stored == matrix.fingerprint
+
+    changed = dense.copy()
+    changed[0, 0] = 2 if changed[0, 0] == 3 else 3
+    AvailabilityMatrix.from_dense(dates, TICKERS, changed).save(matrix_path)
+    with pytest.raises(ValueError):
+        AvailabilityIndex.load(AvailabilityMatrix.load(matrix_path), index_path)
+    monkeypatch.undo()
+    assert open_index(matrix_path, index_path).code(TICKERS[0], dates[0]) == changed[0, 0]
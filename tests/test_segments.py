@@ -0,0 +1,118 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "scripts"))
+
+from dse_eod.availability import ONE_DAY, AvailabilityMatrix  # noqa: E402
+from dse_eod.calendar import is_weekend  # noqa: E402
+from dse_eod.query import VERSIONS, version_mask  # noqa: E402
+from dse_eod.segments import (  # noqa: E402
+    COLUMNS,
+    longest_segment,
+    trading_segments,
+)
+
+
+START = np.datetime64("2022-06-01")
+N_DAYS = 120
+TICKERS = np.array(["00DSEX", "AAA", "BBB", "CCCMF", "GP", "TB5Y", "ZBOND"])
+HOLIDAYS = [19, 20, 75]  # weekdays without any data
+
+
+def random_matrix(seed) -> AvailabilityMatrix:
+    """Listing windows with holes, weekends and market-wide holidays."""
+    rng = np.random.default_rng(seed)
+    dense = rng.choice(4, size=(N_DAYS, len(TICKERS)), p=[0.25, 0.1, 0.1, 0.55])
+    for t in range(len(TICKERS)):
+        lo, hi = np.sort(rng.integers(0, N_DAYS, 2))
+        dense[:lo, t] = 0
+        dense[hi + 1:, t] = 0
+    dense[:, 5] = 0  # never listed
+    dates = START + np.arange(N_DAYS) * ONE_DAY
+    dense[is_weekend(dates)] = 0
+    dense[HOLIDAYS] = 0
+    return AvailabilityMatrix.from_dense(dates, TICKERS, dense)
+
+
+def segments_by_scan(matrix, version) -> pd.DataFrame:
+    """Reference: walk the sessions (days with any data) one by one."""
+    dense = matrix.to_dense()
+    sessions = np.flatnonzero(dense.any(axis=1))
+    available = version_mask(dense, version)
+
+    rows = []
+    for t, ticker in enumerate(matrix.tickers):
+        segment, missed, open_run = 0, 0, None
+        for day in sessions:
+            if available[day, t]:
+                if open_run is None:
+                    segment += 1
+                    open_run = [day, day, 0, missed if segment > 1 else 0]
+                    missed = 0
+                open_run[1] = day
+                open_run[2] += 1
+                continue
+            if open_run is not None:
+                rows.append((ticker, segment, *open_run))
+                open_run = None
+            if segment:
+                missed += 1
+        if open_run is not None:
+            rows.append((ticker, segment, *open_run))
+
+    return pd.DataFrame([{
+        "Ticker": ticker,
+        "Segment": segment,
+        "Start_Date": str(matrix.start + first * ONE_DAY),
+        "End_Date": str(matrix.start + last * ONE_DAY),
+        "Sessions": sessions_traded,
+        "Calendar_Days": int(last - first) + 1,
+        "Gap_Before": gap,
+    } for ticker, segment, first, last, sessions_traded, gap in rows],
+        columns=COLUMNS)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("version", VERSIONS)
+def test_segments_match_a_per_day_scan(seed, version):
+    matrix = random_matrix(seed)
+
+    segments = trading_segments(matrix, version)
+    expected = segments_by_scan(matrix, version)
+
+    assert segments.to_csv(index=False) == expected.to_csv(index=False)
+
+
+@pytest.mark.parametrize("max_gap", [0, 1, 3])
+def test_longest_segment_matches_a_per_day_scan(max_gap):
+    matrix = random_matrix(0)
+    dense = matrix.to_dense()
+    sessions = np.flatnonzero(dense.any(axis=1))
+    segments = trading_segments(matrix)
+
+    for t, ticker in enumerate(matrix.tickers):
+        traded = sessions[dense[sessions, t] > 0]
+        if not len(traded):
+            with pytest.raises(KeyError):
+                longest_segment(segments, ticker, max_gap)
+            continue
+
+        # Missed sessions between consecutive traded ones
+        missed = np.diff(np.searchsorted(sessions, traded)) - 1
+        best, run_start, count = None, 0, 0
+        for i in range(len(traded)):
+            if i and missed[i - 1] > max_gap:
+                run_start, count = i, 0
+            count += 1
+            if best is None or count > best[2]:
+                best = (traded[run_start], traded[i], count)
+
+        assert longest_segment(segments, ticker, max_gap) == (
+            pd.Timestamp(matrix.start + best[0] * ONE_DAY),
+            pd.Timestamp(matrix.start + best[1] * ONE_DAY),
+        )
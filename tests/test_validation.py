@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "scripts"))
+
+from dse_eod.validation import validate_dump  # noqa: E402
+
+
+ROWS = """Date,Ticker,Open,High,Low,Close,Volume
+2020-01-05,GP,1,2,1,1,10
+,GP,1,2,1,1,10
+2020-01-06,GP,1,2,1,1,10
+2020-01-07,,1,2,1,1,10
+2020-01-08,GP,1,2,1,1,10
+2020-01-06,GP,1,2,1,1,10
+2020-01-09,GP,1,2,1,1,10
+2020-01-09,GP,1,2,1,1,10
+"""
+
+EXPECTED = [
+    (3, "invalid_date"),
+    (5, "missing_ticker"),
+    (7, "duplicate_date"),
+    (7, "unsorted_date"),
+    (9, "duplicate_date"),
+]
+
+
+def test_empty_cells_and_repeated_dates(tmp_path):
+    path = tmp_path / "dump.csv"
+    path.write_text(ROWS)
+
+    for chunksize in (100, 2, 1):
+        violations = validate_dump(str(path), chunksize=chunksize)
+        assert list(zip(violations["Line"], violations["Check"])) == EXPECTED